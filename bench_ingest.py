@@ -0,0 +1,158 @@
+"""
+시트 데이터 처리 파이프라인 벤치마크 (Google 인증 없이 실행 가능)
+values().get 응답을 합성하거나 녹화된 파일에서 읽어
+파싱/상태 판정/매물 딕셔너리 생성 → JSON 직렬화 → gzip 압축 단계별 처리량과 메모리를 측정합니다.
+JSON 직렬화는 서버가 스냅샷 응답에 쓰는 property_encoding.encode_json()과 같은 함수입니다.
+
+사용 예:
+    python bench_ingest.py                               # 1k ~ 100k 행 합성 데이터
+    python bench_ingest.py --rows 1000 20000             # 행 수 지정
+    python bench_ingest.py --fixture recorded.json       # 녹화된 응답 재생
+    python bench_ingest.py --format columnar             # ?format=columnar 응답 형식으로 직렬화
+    python bench_ingest.py --record 강남월세 recorded.json # 실제 시트 응답 녹화 (인증 필요)
+    python bench_ingest.py --save base.json              # 결과 저장
+    python bench_ingest.py --compare base.json           # 저장된 결과 대비 처리량 20% 이상 하락 시 종료 코드 1
+"""
+
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+# 운영 환경과 같은 경로를 측정 (행마다 남기는 상태 판정 로그 제외)
+os.environ.setdefault('RENDER', 'true')
+
+from fake_services import synthetic_values  # noqa: E402
+from property_encoding import COLUMNAR_FORMAT, encode_json, to_columnar  # noqa: E402
+from sheets_service import parse_property_rows  # noqa: E402
+
+DEFAULT_ROWS = [1000, 10000, 50000, 100000]
+SHEET_TYPE = '강남월세'
+
+
+def load_fixture(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('values', []) if isinstance(data, dict) else data
+
+
+def record_fixture(sheet_type, path):
+    """실제 시트 응답을 그대로 파일로 저장 (이후 인증 없이 재생)"""
+    from config import SHEET_RANGES, SPREADSHEET_ID
+    from sheets_service import get_sheets_service
+
+    result = get_sheets_service().spreadsheets().values().get(
+        spreadsheetId=SPREADSHEET_ID,
+        range=SHEET_RANGES[sheet_type],
+        valueRenderOption='UNFORMATTED_VALUE'
+    ).execute()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False)
+    print(f"{sheet_type}: {len(result.get('values', []))}개 행을 {path}에 저장했습니다.")
+
+
+def run_pipeline(values, fmt='rows'):
+    """한 번 실행하여 단계별 소요 시간과 결과 크기 반환"""
+    started = time.perf_counter()
+    properties = parse_property_rows(values, SHEET_TYPE)
+    parsed = time.perf_counter()
+    # /api/properties 스냅샷 응답과 같은 직렬화 (UTF-8 그대로, 공백 없음)
+    body = encode_json(to_columnar(properties) if fmt == COLUMNAR_FORMAT else properties)
+    encoded = time.perf_counter()
+    compressed = gzip.compress(body)
+    finished = time.perf_counter()
+    return {
+        'parse': parsed - started,
+        'json': encoded - parsed,
+        'gzip': finished - encoded,
+        'records': len(properties),
+        'json_bytes': len(body),
+        'gzip_bytes': len(compressed),
+    }
+
+
+def measure_memory(values, fmt='rows'):
+    """파이프라인 한 번 실행 중 최대 추가 메모리 (tracemalloc, 시간 측정과 분리)"""
+    tracemalloc.start()
+    try:
+        run_pipeline(values, fmt)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark(values, repeat, fmt='rows'):
+    runs = [run_pipeline(values, fmt) for _ in range(repeat)]
+    result = {stage: statistics.median(run[stage] for run in runs) for stage in ('parse', 'json', 'gzip')}
+    result.update({key: runs[0][key] for key in ('records', 'json_bytes', 'gzip_bytes')})
+    result['rows'] = len(values)
+    result['total'] = result['parse'] + result['json'] + result['gzip']
+    result['rows_per_sec'] = len(values) / result['total'] if result['total'] else 0
+    result['peak_bytes'] = measure_memory(values, fmt)
+    return result
+
+
+def print_report(results):
+    print(f"{'행 수':>8} {'매물':>8} {'파싱ms':>9} {'JSONms':>9} {'gzipms':>9} {'행/초':>10} "
+          f"{'JSON KB':>9} {'gzip KB':>9} {'최대 메모리MB':>13}")
+    for r in results:
+        print(f"{r['rows']:>8} {r['records']:>8} {r['parse'] * 1000:>9.1f} {r['json'] * 1000:>9.1f} "
+              f"{r['gzip'] * 1000:>9.1f} {r['rows_per_sec']:>10.0f} {r['json_bytes'] / 1024:>9.0f} "
+              f"{r['gzip_bytes'] / 1024:>9.0f} {r['peak_bytes'] / 1024 / 1024:>13.1f}")
+
+
+def compare(results, baseline_path, tolerance):
+    """저장된 결과와 행 수별 처리량 비교 - 허용치 이상 느려진 항목이 있으면 False"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {r['rows']: r for r in json.load(f)}
+    ok = True
+    for r in results:
+        base = baseline.get(r['rows'])
+        if base is None or not base['rows_per_sec']:
+            continue
+        change = r['rows_per_sec'] / base['rows_per_sec'] - 1
+        marker = '느려짐' if change < -tolerance else 'OK'
+        print(f"{r['rows']:>8}행: 처리량 {change * 100:+.1f}% ({marker})")
+        if change < -tolerance:
+            ok = False
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='시트 데이터 처리 파이프라인 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS, help='합성 데이터 행 수')
+    parser.add_argument('--fixture', nargs='+', help='녹화된 values().get 응답 JSON 파일')
+    parser.add_argument('--record', nargs=2, metavar=('SHEET_TYPE', 'PATH'), help='실제 시트 응답 녹화')
+    parser.add_argument('--repeat', type=int, default=5, help='크기별 반복 횟수 (중앙값 사용)')
+    parser.add_argument('--format', choices=('rows', COLUMNAR_FORMAT), default='rows', help='응답 직렬화 형식')
+    parser.add_argument('--save', help='결과를 JSON으로 저장')
+    parser.add_argument('--compare', help='저장된 결과와 처리량 비교')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='허용 처리량 하락 비율')
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixture(*args.record)
+        return 0
+
+    if args.fixture:
+        datasets = [load_fixture(path) for path in args.fixture]
+    else:
+        datasets = [synthetic_values(rows) for rows in args.rows]
+
+    results = [benchmark(values, args.repeat, args.format) for values in datasets]
+    print_report(results)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.compare and not compare(results, args.compare, args.tolerance):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,340 @@
+"""
+정적 파일 빌드 - JS/CSS 압축(minify), 내용 해시 파일명, gzip/brotli 사전 압축, 아이콘 크기별 변환
+결과는 static/dist/ 에 저장하고 static/dist/manifest.json 에 원래 경로 → 빌드 파일 경로를 기록합니다.
+템플릿은 asset_url('js/map.js') 로 해시 경로를 참조하며, /static/dist/ 파일은 내용이 바뀌면 이름도 바뀌므로
+1년 + immutable 로 캐시되고 미리 압축한 .br/.gz 파일로 응답합니다. (map.js 안의 filter_worker.js 경로는 빌드 시 해시 경로로 바뀜)
+빌드하지 않았거나 빌드 뒤에 원본을 수정한 경우(개발 환경)에는 asset_url()이 원본 경로를 돌려줍니다.
+
+사용 예:
+    python build_assets.py          # 배포 빌드 단계에서 실행 (pip install 다음)
+
+JS는 내장 압축기로 압축하고, rcssmin / brotli 가 설치되어 있으면 사용합니다. (없으면 내장 CSS 압축기와 gzip만 사용)
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+from io import BytesIO
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(ROOT, 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_PATH = os.path.join(DIST_DIR, 'manifest.json')
+
+# 다른 파일이 참조하는 파일을 먼저 빌드 (map.js는 filter_worker.js 경로를 참조)
+ASSETS = ['js/filter_worker.js', 'css/style.css', 'js/map.js']
+ICON_SOURCE = os.path.join(ROOT, 'generated-icon.png')
+ICON_SIZES = [32, 180, 192, 512]  # favicon, apple-touch-icon, 웹 앱 아이콘
+HASH_LENGTH = 10
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(path, data):
+    """js/map.js → dist/js/map.<해시>.js (static 폴더 기준 경로)"""
+    base, ext = os.path.splitext(path)
+    return f"dist/{base}.{content_hash(data)}{ext}"
+
+
+# ---------------------------------------------------------------------------
+# JS 압축
+# 줄바꿈은 유지하여 자동 세미콜론 삽입(ASI)에 의존하는 코드도 그대로 동작하게 하고,
+# 주석 / 들여쓰기 / 빈 줄 / 줄 안의 연속 공백만 제거합니다.
+# 문자열, 정규식, 템플릿 리터럴 내용은 한 글자도 바꾸지 않습니다.
+# ')' 뒤의 '/'는 괄호가 if/while/for/with 조건이면 정규식, 아니면 나눗셈이고,
+# 그 밖에 앞 토큰만으로 정할 수 없으면 ('}' '++' '--' 뒤) 파일 전체를 압축하지 않습니다.
+# (rjsmin은 중첩된 템플릿 리터럴 안의 /* */ 를 주석으로 지우므로 사용하지 않음)
+
+# 이 문자/키워드 뒤의 '/'는 항상 정규식 시작
+_REGEX_PRECEDERS = set('(,=:[!&|?{;+-*%<>~^') | {''}
+_REGEX_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                   'throw', 'case', 'do', 'else', 'yield', 'await'}
+# 조건 괄호가 이 키워드 뒤에 오면 닫는 ')' 뒤는 문장 시작 (정규식)
+_CONTROL_KEYWORDS = {'if', 'while', 'for', 'with'}
+# 이 토큰 뒤의 '/'는 문맥에 따라 정규식일 수도, 나눗셈일 수도 있음
+_AMBIGUOUS_PRECEDERS = {'}', '++', '--'}
+
+
+class AmbiguousSlash(Exception):
+    """정규식/나눗셈을 확실히 구분할 수 없는 '/' (해당 파일은 압축하지 않음)"""
+
+
+def _skip_whitespace_and_comments(source, i):
+    """공백/주석을 건너뛴 위치와 그 사이에 줄바꿈이 있었는지 반환"""
+    n = len(source)
+    newline = False
+    while i < n:
+        if source[i] in ' \t\r\n':
+            newline = newline or source[i] == '\n'
+            i += 1
+        elif source.startswith('//', i):
+            while i < n and source[i] != '\n':
+                i += 1
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            end = n if end < 0 else end + 2
+            newline = newline or '\n' in source[i:end]
+            i = end
+        else:
+            break
+    return i, newline
+
+
+def _last_word(out):
+    """출력에서 공백을 건너뛴 마지막 조각 ('(' 앞의 키워드 확인용)"""
+    for piece in reversed(out):
+        if piece not in (' ', '\n'):
+            return piece
+    return ''
+
+
+def _minify_js_builtin(source):
+    out = []
+    i = 0
+    n = len(source)
+    stack = [0]  # 코드 구간: 중괄호 깊이(int), 템플릿 리터럴 구간: 'template'
+    last_token = ''  # 정규식/나눗셈 구분용 직전 토큰 (구두점, 키워드, 식별자/숫자는 'a')
+    parens = []  # 열린 괄호별로 제어문 조건 괄호인지 여부
+
+    while i < n:
+        mode = stack[-1]
+        ch = source[i]
+
+        if mode == 'template':
+            # 템플릿 리터럴 내용은 그대로 복사 (줄바꿈/들여쓰기도 문자열의 일부)
+            j = i
+            while j < n and source[j] != '`' and not source.startswith('${', j):
+                j += 2 if source[j] == '\\' else 1
+            out.append(source[i:j])
+            if source.startswith('${', j):
+                out.append('${')
+                stack.append(0)
+                last_token = '{'
+                i = j + 2
+            else:
+                out.append('`')
+                stack.pop()
+                last_token = '`'
+                i = j + 1
+            continue
+
+        # 코드 구간
+        if ch in ' \t\r\n' or source.startswith('//', i) or source.startswith('/*', i):
+            i, newline = _skip_whitespace_and_comments(source, i)
+            if out and i < n:
+                out.append('\n' if newline else ' ')
+        elif ch in '"\'':
+            j = i + 1
+            while j < n and source[j] != ch:
+                j += 2 if source[j] == '\\' else 1
+            out.append(source[i:j + 1])
+            last_token = ch
+            i = j + 1
+        elif ch == '`':
+            out.append(ch)
+            stack.append('template')
+            i += 1
+        elif ch == '/':
+            if last_token in _AMBIGUOUS_PRECEDERS:
+                line = source.count('\n', 0, i) + 1
+                raise AmbiguousSlash(f"{line}번째 줄: '{last_token}' 뒤의 '/'")
+            if last_token in _REGEX_PRECEDERS or last_token in _REGEX_KEYWORDS:
+                # 정규식 리터럴 (문자 클래스 안의 / 는 끝이 아님)
+                j = i + 1
+                in_class = False
+                while j < n and source[j] != '\n':
+                    c = source[j]
+                    if c == '\\':
+                        j += 2
+                        continue
+                    if c == '[':
+                        in_class = True
+                    elif c == ']':
+                        in_class = False
+                    elif c == '/' and not in_class:
+                        break
+                    j += 1
+                j += 1
+                while j < n and (source[j].isalpha()):
+                    j += 1  # 플래그
+                out.append(source[i:j])
+                last_token = 'a'
+                i = j
+            else:
+                out.append(ch)
+                last_token = ch
+                i += 1
+        elif ch.isalnum() or ch in '_$':
+            j = i
+            while j < n and (source[j].isalnum() or source[j] in '_$'):
+                j += 1
+            word = source[i:j]
+            out.append(word)
+            # 프로퍼티 이름(obj.return 등)은 키워드가 아님
+            is_keyword = word in _REGEX_KEYWORDS or word in _CONTROL_KEYWORDS
+            last_token = word if is_keyword and last_token != '.' else 'a'
+            i = j
+        else:
+            if ch == '{':
+                stack[-1] += 1
+            elif ch == '}':
+                if mode == 0 and len(stack) > 1:
+                    stack.pop()  # 템플릿 리터럴의 ${ } 끝
+                else:
+                    stack[-1] -= 1
+            last_token = ch * 2 if ch in '+-' and out and out[-1] == ch else ch
+            if ch == '(':
+                parens.append(_last_word(out) in _CONTROL_KEYWORDS)
+            elif ch == ')':
+                # 조건 괄호 뒤는 문장 시작이므로 '(' 와 같이 취급
+                if parens and parens.pop():
+                    last_token = '('
+            out.append(ch)
+            i += 1
+
+    return ''.join(out) + '\n'
+
+
+def minify_js(source, name='<js>'):
+    """압축한 JS (정규식/나눗셈을 구분할 수 없으면 원본 그대로)"""
+    try:
+        return _minify_js_builtin(source)
+    except AmbiguousSlash as e:
+        print(f"{name}: 정규식/나눗셈을 구분할 수 없어 압축하지 않습니다 ({e})")
+        return source
+
+
+# ---------------------------------------------------------------------------
+# CSS 압축 (문자열 안은 그대로: 예) div[style*="overflow-y: auto"])
+
+_CSS_STRING = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')')
+
+
+def _minify_css_builtin(source):
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    parts = _CSS_STRING.split(source)
+    for index in range(0, len(parts), 2):  # 짝수 번째는 문자열 밖
+        part = re.sub(r'\s+', ' ', parts[index])
+        part = re.sub(r'\s*([{};,>])\s*', r'\1', part)
+        part = re.sub(r':\s+', ':', part)
+        part = part.replace(';}', '}')
+        parts[index] = part
+    return ''.join(parts).strip() + '\n'
+
+
+def minify_css(source):
+    try:
+        import rcssmin
+        return rcssmin.cssmin(source)
+    except ImportError:
+        return _minify_css_builtin(source)
+
+
+# ---------------------------------------------------------------------------
+
+def write_file(relative_path, data):
+    path = os.path.join(STATIC_DIR, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def precompress(path, data):
+    """.gz (항상), .br (brotli 설치 시) 파일 생성 → 생성된 (확장자, 크기) 목록"""
+    results = []
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    with open(path + '.gz', 'wb') as f:
+        f.write(gz)
+    results.append(('gz', len(gz)))
+    try:
+        import brotli
+    except ImportError:
+        return results
+    br = brotli.compress(data, quality=11)
+    with open(path + '.br', 'wb') as f:
+        f.write(br)
+    results.append(('br', len(br)))
+    return results
+
+
+def build_code_assets(manifest, report):
+    for asset in ASSETS:
+        with open(os.path.join(STATIC_DIR, asset), 'r', encoding='utf-8') as f:
+            source = f.read()
+        # 먼저 빌드한 파일을 참조하는 경로를 해시 경로로 교체
+        for original, built in manifest.items():
+            source = source.replace(f"/static/{original}", f"/static/{built}")
+        minified = minify_js(source, asset) if asset.endswith('.js') else minify_css(source)
+        data = minified.encode('utf-8')
+        built = hashed_name(asset, data)
+        path = write_file(built, data)
+        manifest[asset] = built
+        report.append((asset, built, len(source.encode('utf-8')), len(data), precompress(path, data)))
+
+
+def build_icons(manifest, report):
+    """generated-icon.png → 크기별 PNG (Pillow가 없으면 건너뜀)"""
+    try:
+        from PIL import Image
+    except ImportError:
+        print("Pillow가 없어 아이콘 변환을 건너뜁니다.")
+        return
+    if not os.path.exists(ICON_SOURCE):
+        return
+    source_size = os.path.getsize(ICON_SOURCE)
+    with Image.open(ICON_SOURCE) as image:
+        image = image.convert('RGBA') if image.mode not in ('RGB', 'RGBA') else image
+        for size in ICON_SIZES:
+            resized = image.resize((size, size), Image.LANCZOS)
+            buffer = BytesIO()
+            resized.save(buffer, format='PNG', optimize=True)
+            data = buffer.getvalue()
+            logical = f"icons/icon-{size}.png"
+            built = hashed_name(logical, data)
+            write_file(built, data)
+            manifest[logical] = built
+            report.append((logical, built, source_size, len(data), []))
+
+
+def print_report(report):
+    print(f"{'파일':<24} {'원본':>10} {'압축':>10} {'gzip':>10} {'brotli':>10}  빌드 경로")
+    for logical, built, original, size, compressed in report:
+        sizes = dict(compressed)
+        gz = f"{sizes['gz']:,}" if 'gz' in sizes else '-'
+        br = f"{sizes['br']:,}" if 'br' in sizes else '-'
+        print(f"{logical:<24} {original:>10,} {size:>10,} {gz:>10} {br:>10}  {built}")
+
+
+def build():
+    # 이전 빌드 결과는 모두 지우고 새로 생성
+    shutil.rmtree(DIST_DIR, ignore_errors=True)
+    os.makedirs(DIST_DIR)
+    manifest = {}
+    report = []
+    build_code_assets(manifest, report)
+    build_icons(manifest, report)
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    return manifest, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='정적 파일 빌드 (압축, 해시 파일명, 사전 압축)')
+    parser.parse_args()
+
+    manifest, report = build()
+    print_report(report)
+    print(f"{len(manifest)}개 파일 빌드 완료 → {os.path.relpath(MANIFEST_PATH, ROOT)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,18 +8,23 @@ SHEET_RANGES = {
     '송파월세': "'[송파월세]'!A5:T",
     '송파전세': "'[송파전세]'!A5:T"
 }
+# 매물 상세 페이지 주소 (매물번호를 뒤에 붙임)
+PROPERTY_LINK_PREFIX = "https://new.land.naver.com/houses?articleNo="
+# Sheets API 엔드포인트 변경 (부하 테스트용 로컬 가짜 서버 등, 설정 시 익명 인증 사용)
+SHEETS_API_ENDPOINT = os.environ.get("SHEETS_API_ENDPOINT", "")
 
 # Naver Cloud Platform Maps API Configuration
 NAVER_CLIENT_ID = os.environ.get("NAVER_CLIENT_ID", "mxmsrqimlj")
 NAVER_CLIENT_SECRET = os.environ.get("NAVER_CLIENT_SECRET", "PzStOTvfyk0zJ73XnglaVkA2VFcTV65mSZmzeqQG")
 
-# Naver Cloud Platform Maps API URLs
+# Naver Cloud Platform Maps API URLs (NCP_MAPS_BASE_URL로 로컬 가짜 서버 등으로 변경 가능)
+NCP_MAPS_BASE_URL = os.environ.get("NCP_MAPS_BASE_URL", "https://maps.apigw.ntruss.com").rstrip('/')
 NCP_MAPS_URLS = {
-    'static_map': 'https://maps.apigw.ntruss.com/map-static/v2/raster',
-    'directions_5': 'https://maps.apigw.ntruss.com/map-direction/v1/driving',
-    'directions_15': 'https://maps.apigw.ntruss.com/map-direction-15/v1/driving',
-    'geocoding': 'https://maps.apigw.ntruss.com/map-geocode/v2/geocode',
-    'reverse_geocoding': 'https://maps.apigw.ntruss.com/map-reversegeocode/v2/gc'
+    'static_map': f'{NCP_MAPS_BASE_URL}/map-static/v2/raster',
+    'directions_5': f'{NCP_MAPS_BASE_URL}/map-direction/v1/driving',
+    'directions_15': f'{NCP_MAPS_BASE_URL}/map-direction-15/v1/driving',
+    'geocoding': f'{NCP_MAPS_BASE_URL}/map-geocode/v2/geocode',
+    'reverse_geocoding': f'{NCP_MAPS_BASE_URL}/map-reversegeocode/v2/gc'
 }
 
 # NCP Maps API Headers
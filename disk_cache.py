@@ -0,0 +1,149 @@
+"""
+용량 제한이 있는 디스크 LRU 캐시
+렌더링된 지도 이미지처럼 다시 만들기 비싼 바이트 데이터를 저장합니다.
+파일 수정 시간(mtime)을 최근 사용 시각으로 사용하므로 재시작 후에도 LRU 순서가 유지됩니다.
+여러 워커 프로세스가 같은 디렉터리를 공유하므로, 저장할 때마다 파일 잠금을 잡고
+디렉터리를 다시 읽어 모든 워커의 파일을 합친 용량으로 max_bytes를 지킵니다.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows - 프로세스 간 잠금 없이 동작
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class DiskLRUCache:
+    """총 용량(max_bytes)을 넘으면 가장 오래 사용하지 않은 파일부터 삭제하는 캐시"""
+
+    def __init__(self, directory, max_bytes, suffix=''):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> (size, last_access)
+        self._total_bytes = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    @contextmanager
+    def _directory_lock(self):
+        """같은 디렉터리를 쓰는 다른 프로세스와의 인덱스 재구성/삭제 직렬화"""
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.directory, '.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_index(self):
+        """디렉터리의 캐시 파일 목록을 (다른 워커가 저장한 파일 포함) 다시 읽어 용량/사용 시각 인덱스 구성"""
+        self._entries = {}
+        self._total_bytes = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith('.') or not name.endswith(self.suffix) or name.endswith('.tmp'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                key = name[:len(name) - len(self.suffix)] if self.suffix else name
+                self._entries[key] = (stat.st_size, stat.st_mtime)
+                self._total_bytes += stat.st_size
+
+    def get(self, key):
+        """캐시된 바이트 반환 (없으면 None)"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+                self._forget(key)
+            return None
+
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+            self._entries[key] = (len(data), now)
+        return data
+
+    def set(self, key, data):
+        """바이트 저장 후 용량 초과 시 오래된 항목 삭제"""
+        if len(data) > self.max_bytes:
+            return False
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"디스크 캐시 저장 실패: {str(e)}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+
+        with self._lock, self._directory_lock():
+            self._load_index()
+            self._evict()
+        return True
+
+    def _forget(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[0]
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            oldest_key = min(self._entries, key=lambda k: self._entries[k][1])
+            self._forget(oldest_key)
+            try:
+                os.remove(self._path(oldest_key))
+            except OSError:
+                pass
+
+    def clear(self):
+        """모든 캐시 파일 삭제"""
+        with self._lock, self._directory_lock():
+            self._load_index()
+            for key in list(self._entries):
+                self._forget(key)
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
@@ -0,0 +1,196 @@
+"""
+부하 테스트용 로컬 가짜 외부 API 서버 (Google Sheets values API + NCP Geocoding / Static Map)
+지연 시간과 실패율을 조절할 수 있으며, 앱은 다음 환경 변수로 이 서버를 바라보게 합니다.
+
+    SHEETS_API_ENDPOINT=http://127.0.0.1:8089/   (익명 인증으로 접속)
+    NCP_MAPS_BASE_URL=http://127.0.0.1:8089
+
+사용 예:
+    python fake_services.py --port 8089 --rows 500 --sheets-latency 300 --ncp-latency 80 --failure-rate 0.02
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+LOCATIONS = ['서울 강남구 역삼동', '서울 강남구 논현동', '서울 강남구 삼성동', '서울 서초구 서초동', '서울 강남구 대치동']
+# (R열 온하/공클 표시, S열, T열 갠매 표시) - 실제 시트처럼 빈 값과 'o' 표시가 섞임
+STATUS_MARKS = [('', '', 'o'), ('', '공클', ''), ('온하', '', ''), ('', '', '갠매'), ('', '', '')]
+SEOUL_CENTER = (37.4979, 127.0276)
+
+VALUES_PATH = re.compile(r'^/v4/spreadsheets/([^/]+)/values/(.+)$')
+SPREADSHEET_PATH = re.compile(r'^/v4/spreadsheets/([^/]+)$')
+
+
+def synthetic_values(rows, seed=42):
+    """values().get 응답과 같은 모양의 행 목록 생성 (일부는 열 부족/상태 없음으로 제외되는 행)"""
+    rng = random.Random(seed)
+    values = []
+    for i in range(rows):
+        if rng.random() < 0.03:
+            values.append([f"메모 {i}"])  # 열이 부족한 행
+            continue
+        row = [''] * 20
+        row[0] = 2400000000 + i
+        row[1] = f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        row[10] = rng.choice([500, 1000, 2000, 3000, 5000])
+        row[11] = rng.randint(40, 250)
+        row[16] = f"{rng.choice(LOCATIONS)} {rng.randint(1, 999)}-{rng.randint(1, 50)}"
+        row[17], row[18], row[19] = rng.choice(STATUS_MARKS)
+        values.append(row)
+    return values
+
+
+def fake_coordinates(address):
+    """주소마다 항상 같은 좌표 (서울 강남 일대)"""
+    digest = hashlib.sha1(address.encode('utf-8')).digest()
+    lat = SEOUL_CENTER[0] + (digest[0] - 128) / 128 * 0.03
+    lng = SEOUL_CENTER[1] + (digest[1] - 128) / 128 * 0.04
+    return round(lat, 7), round(lng, 7)
+
+
+def solid_png(width, height, rgb=(229, 232, 235)):
+    """이미지 라이브러리 없이 단색 PNG 생성"""
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body) & 0xffffffff)
+
+    raw = (b'\x00' + bytes(rgb) * width) * height
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(raw)) + chunk(b'IEND', b'')
+
+
+class FakeServiceConfig:
+    """실행 중에도 바꿀 수 있는 가짜 서버 설정"""
+
+    def __init__(self, rows=300, sheets_latency=0.3, ncp_latency=0.08, jitter=0.3, failure_rate=0.0, seed=42):
+        self.rows = rows
+        self.sheets_latency = sheets_latency  # 초
+        self.ncp_latency = ncp_latency  # 초
+        self.jitter = jitter  # 지연 시간 대비 ± 비율
+        self.failure_rate = failure_rate
+        self.seed = seed
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def values_for(self, range_name):
+        # 시트마다 다른 데이터 (범위 문자열 기반 시드)
+        if range_name not in self._values:
+            seed = self.seed + zlib.crc32(range_name.encode('utf-8'))
+            self._values[range_name] = synthetic_values(self.rows, seed)
+        return self._values[range_name]
+
+    def delay(self, base):
+        if base > 0:
+            time.sleep(max(0.0, base * (1 + random.uniform(-self.jitter, self.jitter))))
+
+    def should_fail(self):
+        failed = random.random() < self.failure_rate
+        with self._lock:
+            self.requests += 1
+            if failed:
+                self.failures += 1
+        return failed
+
+
+class FakeServiceHandler(BaseHTTPRequestHandler):
+    config = None  # make_server()에서 설정
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 로그를 남기지 않음
+
+    def _send(self, status, body, content_type='application/json; charset=UTF-8'):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        is_sheets = url.path.startswith('/v4/')
+
+        self.config.delay(self.config.sheets_latency if is_sheets else self.config.ncp_latency)
+        if self.config.should_fail():
+            return self._send(500, {'error': {'code': 500, 'message': 'injected failure'}})
+
+        match = VALUES_PATH.match(url.path)
+        if match:
+            range_name = unquote(match.group(2))
+            return self._send(200, {'range': range_name, 'majorDimension': 'ROWS',
+                                    'values': self.config.values_for(range_name)})
+        if SPREADSHEET_PATH.match(url.path):
+            return self._send(200, {'spreadsheetId': unquote(SPREADSHEET_PATH.match(url.path).group(1)),
+                                    'properties': {'title': 'Fake spreadsheet'}})
+        if url.path == '/map-geocode/v2/geocode':
+            address = query.get('query', '')
+            lat, lng = fake_coordinates(address)
+            return self._send(200, {'status': 'OK', 'addresses': [
+                {'roadAddress': address, 'jibunAddress': address, 'x': str(lng), 'y': str(lat)}]})
+        if url.path == '/map-reversegeocode/v2/gc':
+            return self._send(200, {'status': {'code': 0}, 'results': [{'region': {
+                'area1': {'name': '서울특별시'}, 'area2': {'name': '강남구'}, 'area3': {'name': '역삼동'}}}]})
+        if url.path == '/map-static/v2/raster':
+            scale = int(query.get('scale', 1))
+            width = min(int(query.get('w', 400)) * scale, 2048)
+            height = min(int(query.get('h', 400)) * scale, 2048)
+            return self._send(200, solid_png(width, height), 'image/png')
+        return self._send(404, {'error': 'not found'})
+
+
+class FakeServer(ThreadingHTTPServer):
+    request_queue_size = 256  # 부하 테스트 중 연결 거부 방지 (기본값 5)
+    daemon_threads = True
+
+
+def make_server(config, host='127.0.0.1', port=8089):
+    handler = type('ConfiguredHandler', (FakeServiceHandler,), {'config': config})
+    return FakeServer((host, port), handler)
+
+
+def start_in_background(config, host='127.0.0.1', port=0):
+    """백그라운드 스레드에서 서버 실행 후 (서버, 기본 URL) 반환 (port=0이면 빈 포트 자동 선택)"""
+    server = make_server(config, host, port)
+    thread = threading.Thread(target=server.serve_forever, name='fake-services', daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='부하 테스트용 가짜 Google Sheets / NCP Maps 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--rows', type=int, default=300, help='시트별 행 수')
+    parser.add_argument('--sheets-latency', type=float, default=300, help='Sheets 응답 지연 (ms)')
+    parser.add_argument('--ncp-latency', type=float, default=80, help='NCP 응답 지연 (ms)')
+    parser.add_argument('--jitter', type=float, default=0.3, help='지연 시간 변동 비율')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='500 응답 비율 (0~1)')
+    args = parser.parse_args()
+
+    config = FakeServiceConfig(args.rows, args.sheets_latency / 1000, args.ncp_latency / 1000,
+                               args.jitter, args.failure_rate)
+    server = make_server(config, args.host, args.port)
+    print(f"가짜 외부 API 서버 실행 중: http://{args.host}:{args.port}")
+    print(f"  SHEETS_API_ENDPOINT=http://{args.host}:{args.port}/")
+    print(f"  NCP_MAPS_BASE_URL=http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n종료 - 요청 {config.requests}건, 주입된 실패 {config.failures}건")
+
+
+if __name__ == '__main__':
+    main()
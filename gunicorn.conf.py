@@ -1,12 +1,20 @@
+import gc
 import multiprocessing
 import os
 
+# preload/워밍업 중에는 마스터의 GC를 끄고 fork 직전에 freeze, 워커는 fork 후 다시 켬 (gc_policy.py)
+gc.disable()
+
 # Worker Options
 workers = 2  # 리소스 사용량 최적화를 위해 worker 수 감소
-worker_class = 'sync'
-worker_connections = 1000
+# 요청 시간 대부분이 Sheets/NCP 응답 대기이므로 스레드 워커 사용
+# (sync 워커에서는 느린 외부 호출 2건이 서버 전체를 막음, GUNICORN_WORKER_CLASS=sync로 되돌릴 수 있음)
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+# 워커당 동시 처리 요청 수 (sync 워커에 threads > 1 을 주면 gunicorn이 gthread로 바꾸므로 1로 고정)
+threads = int(os.environ.get('GUNICORN_THREADS', '8')) if worker_class != 'sync' else 1
+worker_connections = 1000  # 비동기(gevent/eventlet) 워커에서만 사용됨
 timeout = 30
-keepalive = 2
+keepalive = 5  # gthread 워커는 keep-alive 연결을 유지하므로 조금 늘림
 
 # Logging
 accesslog = '-'
@@ -45,6 +53,12 @@ keyfile = None
 certfile = None
 
 def when_ready(server):
+    # preload_app=True 이므로 앱은 이미 마스터에 로드됨 - fork 전에 캐시를 채워 워커가 물려받도록 함
+    from startup import warm_up
+    warm_up()
+    # 워밍업까지 만든 객체를 GC 대상에서 제외하여 워커가 copy-on-write 페이지를 계속 공유하도록 함
+    from gc_policy import freeze_startup_objects
+    freeze_startup_objects()
     server.log.info("Server is ready. Spawning workers")
 
 def on_starting(server):
@@ -54,4 +68,18 @@ def on_reload(server):
     server.log.info("Reloading Server")
 
 def post_fork(server, worker):
-    server.log.info(f"Worker spawned (pid: {worker.pid})")
\ No newline at end of file
+    server.log.info(f"Worker spawned (pid: {worker.pid})")
+    gc.enable()
+    # 마스터에서 열렸을 수 있는 Sheets keep-alive 연결은 워커에서 새로 맺음
+    from sheets_service import reset_sheets_connections
+    reset_sheets_connections()
+    # 스레드는 fork 후 복제되지 않으므로 워커마다 스케줄러와 캐시 예산 모니터 시작
+    # (갱신은 스냅샷 잠금을 얻은 워커 하나만 실행하고, 나머지는 저장된 스냅샷을 다시 읽음)
+    from scheduler import start_scheduler
+    start_scheduler()
+    from performance_config import performance_manager
+    performance_manager.start_memory_monitor()
+    # 연결 테스트는 첫 번째 워커에서만 백그라운드로 실행
+    if worker.age == 1:
+        from startup import run_connection_tests_async
+        run_connection_tests_async()
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+시작 시간 프로파일
+새 파이썬 프로세스에서 `import main`을 실행하여 (python -X importtime)
+모듈별 import 시간과 프로세스 시작부터 첫 /health 응답까지의 시간을 측정합니다.
+
+사용 예:
+    python import_profile.py            # 누적 시간 상위 20개 모듈
+    python import_profile.py --top 40
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+HEALTH_PROBE = """
+import json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+response = main.app.test_client().get('/health')
+answered = time.perf_counter()
+print(json.dumps({'import_ms': (imported - started) * 1000, 'health_ms': (answered - imported) * 1000,
+                  'status': response.status_code}))
+"""
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력 → [(모듈, 자체 시간 us, 누적 시간 us, 깊이), ...]"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+            entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+        except ValueError:
+            continue
+    return entries
+
+
+def run_probe(env):
+    """프로세스 시작 → import main → 첫 /health 응답 (부모에서 잰 전체 시간 포함)"""
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', HEALTH_PROBE],
+                            capture_output=True, text=True, env=env)
+    wall_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        raise SystemExit("import main 실패")
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    probe['wall_ms'] = wall_ms
+    return probe, parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='import 시간 / 첫 health check 응답 시간 측정')
+    parser.add_argument('--top', type=int, default=20, help='출력할 모듈 수')
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault('RENDER', 'true')  # 운영 환경과 같은 로깅 설정
+    env['SHEETS_REFRESH_ENABLED'] = '0'
+    probe, entries = run_probe(env)
+
+    print(f"프로세스 시작 → 첫 /health 응답: {probe['wall_ms']:.0f}ms "
+          f"(import main {probe['import_ms']:.0f}ms, /health {probe['health_ms']:.1f}ms, 상태 {probe['status']})")
+
+    print(f"\n누적 import 시간 상위 {args.top}개 (최상위 모듈)")
+    top_level = sorted((e for e in entries if e[3] <= 1), key=lambda e: e[2], reverse=True)
+    for name, _, cumulative_us, _ in top_level[:args.top]:
+        print(f"{cumulative_us / 1000:>9.1f}ms  {name}")
+
+    print(f"\n자체 import 시간 상위 {args.top}개")
+    for name, self_us, _, _ in sorted(entries, key=lambda e: e[1], reverse=True)[:args.top]:
+        print(f"{self_us / 1000:>9.1f}ms  {name}")
+
+    # 지연 import 대상이 시작 시 다시 로드되지 않았는지 확인
+    lazy = ('googleapiclient', 'google.oauth2', 'httpx', 'PIL')
+    loaded = sorted({e[0].split('.')[0] for e in entries if e[0].startswith(lazy)})
+    if loaded:
+        print(f"\n⚠️ 시작 시 로드된 지연 import 대상: {', '.join(loaded)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+부하 테스트 - 브라우저 세션을 재현하여 엔드포인트별 p50/p95/p99 지연 시간과 처리량을 측정합니다.
+
+세션 흐름 (static/js/map.js와 같은 순서):
+    정적 파일 → 매물 요약 목록 로드 → 좌표가 없는 주소 중 캐시에 없는 주소를 20개씩 동시에 지오코딩
+    → 필터 변경 (브라우저에서만 처리, 대기 시간만 반영) → 다른 매물 유형으로 변경 후 다시 로드/지오코딩
+
+사용 예:
+    # 앱(main.app)과 가짜 외부 API 서버를 이 프로세스 안에서 실행
+    python load_test.py --users 10 --sessions 50
+
+    # 실행 중인 gunicorn 서버 대상 (fake_services.py를 따로 띄우고 환경 변수로 연결)
+    python load_test.py --url http://127.0.0.1:5000 --users 20 --sessions 200
+"""
+
+import argparse
+import gzip
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+STATIC_ASSETS = ['/static/js/map.js', '/static/js/filter_worker.js', '/static/css/style.css']
+SHEET_TYPES = ['강남월세', '강남전세', '송파월세', '송파전세']
+GEOCODE_BATCH_SIZE = 20  # map.js의 batchGeocode와 같은 배치 크기
+
+
+class HttpTarget:
+    """실행 중인 서버에 HTTP로 요청 (스레드마다 keep-alive 세션 사용)"""
+
+    def __init__(self, base_url, connections):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.base_url = base_url.rstrip('/')
+        self._requests = requests
+        self._adapter = lambda: HTTPAdapter(pool_connections=1, pool_maxsize=connections)
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._requests.Session()
+            session.mount('http://', self._adapter())
+            session.mount('https://', self._adapter())
+        return session
+
+    def get(self, path, headers=None):
+        response = self._session().get(self.base_url + path, headers=headers, timeout=60)
+        return response.status_code, response.content
+
+
+class AppTarget:
+    """main.app을 Flask 테스트 클라이언트로 직접 호출 (스레드마다 클라이언트 사용)"""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def get(self, path, headers=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.get(path, headers=headers)
+        body = response.get_data()
+        if response.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        return response.status_code, body
+
+
+class Recorder:
+    """요청별 (구분, 지연 시간, 성공 여부) 기록"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+
+    def record(self, label, duration, ok):
+        with self._lock:
+            self.samples.setdefault(label, []).append(duration)
+            if not ok:
+                self.errors[label] = self.errors.get(label, 0) + 1
+
+
+def timed_get(target, recorder, label, path, headers=None):
+    started = time.perf_counter()
+    try:
+        status, body = target.get(path, headers)
+    except Exception:
+        status, body = 0, b''
+    recorder.record(label, time.perf_counter() - started, 200 <= status < 400)
+    return status, body
+
+
+def locations_to_geocode(data):
+    """매물 API 응답(배열 또는 columnar 형식)에서 좌표가 없어 브라우저가 지오코딩해야 하는 주소 목록"""
+    if isinstance(data, dict) and data.get('format') == 'columnar':
+        resolved = {entry[0] for entry in data.get('coordinates', [])}
+        return [data['strings'][i].strip() for i in data['columns']['location'] if i not in resolved]
+    return [p.get('location') for p in data if p.get('lat') is None]
+
+
+class BrowserSession:
+    """사용자 한 명의 세션 (브라우저별 지오코딩 캐시와 동시 연결 수 제한을 흉내냄)"""
+
+    def __init__(self, target, recorder, connections, cached_ratio, think_time, rng):
+        self.target = target
+        self.recorder = recorder
+        self.connections = connections
+        self.cached_ratio = cached_ratio
+        self.think_time = think_time
+        self.rng = rng
+
+    def think(self):
+        if self.think_time > 0:
+            time.sleep(self.rng.uniform(0.5, 1.5) * self.think_time)
+
+    def load_sheet(self, sheet_type):
+        status, body = timed_get(self.target, self.recorder, 'properties',
+                                 f"/api/properties/{quote(sheet_type)}?format=columnar&view=summary",
+                                 {'Accept-Encoding': 'gzip'})
+        if status != 200:
+            return
+        try:
+            locations = locations_to_geocode(json.loads(body))
+        except (ValueError, KeyError, TypeError):
+            return
+        # 재방문 사용자는 localStorage 캐시에 있는 주소를 다시 요청하지 않음
+        addresses = list(dict.fromkeys(location for location in locations if location))
+        uncached = [a for a in addresses if self.rng.random() >= self.cached_ratio]
+
+        with ThreadPoolExecutor(max_workers=self.connections) as executor:
+            for i in range(0, len(uncached), GEOCODE_BATCH_SIZE):
+                batch = uncached[i:i + GEOCODE_BATCH_SIZE]
+                list(executor.map(
+                    lambda address: timed_get(self.target, self.recorder, 'geocode',
+                                              f"/api/geocode?address={quote(address)}"),
+                    batch))
+
+    def run(self):
+        for path in STATIC_ASSETS:
+            timed_get(self.target, self.recorder, 'static', path)
+        first, second = self.rng.sample(SHEET_TYPES, 2)
+        self.load_sheet(first)
+        self.think()  # 상태/가격 필터 변경은 브라우저에서만 처리됨
+        self.think()
+        self.load_sheet(second)
+
+
+def percentile(sorted_values, pct):
+    """최근접 순위 방식 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+def build_report(recorder, elapsed, sessions):
+    report = {'elapsed_sec': round(elapsed, 3), 'sessions': sessions, 'endpoints': {}}
+    total = 0
+    for label, samples in sorted(recorder.samples.items()):
+        samples = sorted(samples)
+        total += len(samples)
+        report['endpoints'][label] = {
+            'requests': len(samples),
+            'errors': recorder.errors.get(label, 0),
+            'p50_ms': round(percentile(samples, 50) * 1000, 2),
+            'p95_ms': round(percentile(samples, 95) * 1000, 2),
+            'p99_ms': round(percentile(samples, 99) * 1000, 2),
+            'max_ms': round(samples[-1] * 1000, 2),
+            'rps': round(len(samples) / elapsed, 2) if elapsed else 0,
+        }
+    report['requests'] = total
+    report['rps'] = round(total / elapsed, 2) if elapsed else 0
+    report['sessions_per_sec'] = round(sessions / elapsed, 3) if elapsed else 0
+    return report
+
+
+def print_report(report):
+    print(f"\n총 {report['sessions']}개 세션, {report['requests']}개 요청, {report['elapsed_sec']}초 "
+          f"→ {report['rps']} req/s, {report['sessions_per_sec']} 세션/s")
+    print(f"{'구분':<12} {'요청':>7} {'오류':>6} {'p50ms':>9} {'p95ms':>9} {'p99ms':>9} {'maxms':>9} {'req/s':>8}")
+    for label, r in report['endpoints'].items():
+        print(f"{label:<12} {r['requests']:>7} {r['errors']:>6} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} "
+              f"{r['p99_ms']:>9.1f} {r['max_ms']:>9.1f} {r['rps']:>8.1f}")
+
+
+def start_local_app(args):
+    """가짜 외부 API 서버를 띄우고 그 서버를 바라보도록 설정한 main.app 준비"""
+    from fake_services import FakeServiceConfig, start_in_background
+
+    config = FakeServiceConfig(args.rows, args.sheets_latency / 1000, args.ncp_latency / 1000,
+                               failure_rate=args.failure_rate)
+    _, base_url = start_in_background(config)
+    os.environ['SHEETS_API_ENDPOINT'] = base_url + '/'
+    os.environ['NCP_MAPS_BASE_URL'] = base_url
+    os.environ.setdefault('RENDER', 'true')  # 요청마다 남기는 개발용 로그 제외
+    # 실제 서비스의 디스크 스냅샷을 읽거나 덮어쓰지 않도록 임시 경로 사용
+    os.environ['SNAPSHOT_PATH'] = os.path.join(tempfile.mkdtemp(prefix='load_test_'), 'snapshot.json.gz')
+    if args.cold:
+        os.environ['SHEETS_REFRESH_ENABLED'] = '0'
+
+    import main
+    from scheduler import scheduler, start_scheduler
+    from startup import warm_up
+
+    if not args.cold:
+        # 운영 환경처럼 스냅샷(시트 + 지오코딩)이 준비된 상태에서 측정
+        warm_up()
+        scheduler.run_once()
+        start_scheduler()
+    print(f"가짜 외부 API 서버: {base_url}")
+    return AppTarget(main.app)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='브라우저 세션 재현 부하 테스트')
+    parser.add_argument('--url', help='대상 서버 주소 (없으면 이 프로세스에서 main.app과 가짜 API 서버 실행)')
+    parser.add_argument('--users', type=int, default=10, help='동시 사용자 수')
+    parser.add_argument('--sessions', type=int, default=50, help='전체 세션 수')
+    parser.add_argument('--connections', type=int, default=6, help='브라우저당 동시 연결 수')
+    parser.add_argument('--cached-ratio', type=float, default=0.5, help='브라우저에 이미 캐시된 주소 비율')
+    parser.add_argument('--think-time', type=float, default=0.2, help='필터 조작 사이 대기 시간 (초)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='결과를 JSON 파일로 저장')
+    # 로컬 실행(--url 없음)일 때 가짜 외부 API 설정
+    parser.add_argument('--rows', type=int, default=300, help='가짜 시트 행 수')
+    parser.add_argument('--sheets-latency', type=float, default=300, help='가짜 Sheets 지연 (ms)')
+    parser.add_argument('--ncp-latency', type=float, default=80, help='가짜 NCP 지연 (ms)')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='가짜 API 실패 비율')
+    parser.add_argument('--cold', action='store_true', help='워밍업/백그라운드 갱신 없이 요청 경로에서 외부 API 호출')
+    args = parser.parse_args()
+
+    target = HttpTarget(args.url, args.connections) if args.url else start_local_app(args)
+    recorder = Recorder()
+    rng = random.Random(args.seed)
+    seeds = [rng.random() for _ in range(args.sessions)]
+
+    def run_session(seed):
+        BrowserSession(target, recorder, args.connections, args.cached_ratio,
+                       args.think_time, random.Random(seed)).run()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as executor:
+        list(executor.map(run_session, seeds))
+    report = build_report(recorder, time.perf_counter() - started, args.sessions)
+
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
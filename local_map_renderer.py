@@ -0,0 +1,199 @@
+"""
+로컬 지도 이미지 합성기 (NCP Static Map API 대체용)
+NCP 정적 지도 호출이 실패하거나 한도를 넘었을 때, 디스크에 캐시된 베이스 타일 위에
+상태별 색상 마커를 직접 그려 PNG를 만듭니다.
+베이스 타일은 LOCAL_MAP_TILE_URL을 설정한 경우에만 받아오며, 없으면 배경색 위에 마커만 그립니다.
+좌표 투영(Web Mercator)은 직접 계산하고, 이미지 합성은 프로세스 풀에서 실행합니다.
+Pillow는 시작 시간을 줄이기 위해 실제로 이미지를 합성할 때 import 합니다.
+"""
+
+import importlib.util
+import io
+import logging
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import requests
+
+from disk_cache import DiskLRUCache
+from performance_config import (
+    API_TIMEOUT,
+    LOCAL_MAP_TILE_CACHE_DIR,
+    LOCAL_MAP_TILE_ATTRIBUTION,
+    LOCAL_MAP_TILE_CACHE_MAX_BYTES,
+    LOCAL_MAP_TILE_URL,
+    LOCAL_MAP_TILE_USER_AGENT,
+    LOCAL_RENDER_PROCESSES,
+)
+
+logger = logging.getLogger(__name__)
+
+TILE_SIZE = 256
+BACKGROUND_COLOR = '#E5E8EB'
+# 프론트엔드(map.js)와 같은 상태별 마커 색상 (NCP 정적 지도, 대체 지도 페이지도 같은 색 사용)
+STATUS_COLORS = {'갠매': '#3182F6', '공클': '#10B981', '온하': '#F59E0B'}
+DEFAULT_MARKER_COLOR = '#8B95A1'
+
+_tile_cache = None
+_tile_session = requests.Session()
+_tile_session.headers['User-Agent'] = LOCAL_MAP_TILE_USER_AGENT
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def marker_color(status):
+    """매물 상태별 마커 색상 (#RRGGBB)"""
+    return STATUS_COLORS.get(status, DEFAULT_MARKER_COLOR)
+
+
+def is_available():
+    """이미지 라이브러리(Pillow)가 설치되어 있는지 여부"""
+    return importlib.util.find_spec('PIL') is not None
+
+
+def project(lat, lng, zoom):
+    """위도/경도를 해당 줌 레벨의 전역 픽셀 좌표로 변환 (Web Mercator)"""
+    siny = math.sin(math.radians(lat))
+    siny = min(max(siny, -0.9999), 0.9999)
+    world_size = TILE_SIZE * (2 ** zoom)
+    x = (lng + 180.0) / 360.0 * world_size
+    y = (0.5 - math.log((1 + siny) / (1 - siny)) / (4 * math.pi)) * world_size
+    return x, y
+
+
+def _get_tile_cache():
+    global _tile_cache
+    if _tile_cache is None:
+        _tile_cache = DiskLRUCache(LOCAL_MAP_TILE_CACHE_DIR, LOCAL_MAP_TILE_CACHE_MAX_BYTES, suffix='.png')
+    return _tile_cache
+
+
+def _load_tile(zoom, x, y):
+    """베이스 타일 PNG 바이트 (디스크 캐시 우선, 가져올 수 없으면 None)"""
+    cache = _get_tile_cache()
+    key = f"{zoom}_{x}_{y}"
+    data = cache.get(key)
+    if data is not None:
+        return data
+    if not LOCAL_MAP_TILE_URL:
+        return None
+    try:
+        response = _tile_session.get(LOCAL_MAP_TILE_URL.format(z=zoom, x=x, y=y), timeout=API_TIMEOUT)
+        if response.status_code != 200:
+            return None
+        cache.set(key, response.content)
+        return response.content
+    except requests.exceptions.RequestException:
+        return None
+
+
+def compose_map_png(width, height, tiles, markers, scale=1, attribution=''):
+    """
+    타일과 마커를 합성하여 PNG 바이트 반환 (프로세스 풀에서 실행되는 CPU 작업)
+    tiles: [(좌상단 x, 좌상단 y, PNG 바이트), ...]
+    markers: [(x, y, 색상, 라벨), ...]
+    attribution: 타일이 있을 때 오른쪽 아래에 표시할 저작권 문구
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    image = Image.new('RGB', (width, height), BACKGROUND_COLOR)
+    for left, top, data in tiles:
+        try:
+            tile = Image.open(io.BytesIO(data)).convert('RGB')
+            image.paste(tile, (left, top))
+        except Exception:
+            continue  # 손상된 타일은 배경색으로 남김
+
+    draw = ImageDraw.Draw(image)
+    radius = 11 * scale
+    try:
+        font = ImageFont.load_default(size=11 * scale)
+    except TypeError:
+        font = ImageFont.load_default()
+
+    for x, y, color, label in markers:
+        draw.ellipse((x - radius, y - radius, x + radius, y + radius),
+                     fill=color, outline='white', width=2 * scale)
+        if label:
+            draw.text((x, y), str(label), fill='white', font=font, anchor='mm')
+
+    if tiles and attribution:
+        margin = 4 * scale
+        left, top, right, bottom = draw.textbbox((width - margin, height - margin), attribution,
+                                                 font=font, anchor='rb')
+        draw.rectangle((left - margin, top - margin, width, height), fill='white')
+        draw.text((width - margin, height - margin), attribution, fill='#4E5968', font=font, anchor='rb')
+
+    output = io.BytesIO()
+    image.save(output, format='PNG', optimize=True)
+    return output.getvalue()
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # 멀티스레드 워커에서 fork 하지 않도록 spawn 방식 사용
+                _pool = ProcessPoolExecutor(max_workers=LOCAL_RENDER_PROCESSES,
+                                            mp_context=multiprocessing.get_context('spawn'))
+    return _pool
+
+
+def _run_compose(*args):
+    global _pool
+    if LOCAL_RENDER_PROCESSES <= 0:
+        return compose_map_png(*args)
+    try:
+        return _get_pool().submit(compose_map_png, *args).result(timeout=API_TIMEOUT)
+    except BrokenProcessPool:
+        with _pool_lock:
+            _pool = None
+        return compose_map_png(*args)
+
+
+def render_local_map(spec, scale=2):
+    """
+    prepare_static_map()으로 만든 지도 사양을 로컬에서 렌더링 (실패 시 None)
+    NCP의 scale=2 고해상도 이미지와 맞추기 위해 크기는 scale배, 줌은 그만큼 올려서 그림
+    """
+    if not is_available():
+        logger.warning("Pillow가 설치되지 않아 로컬 지도 렌더링을 사용할 수 없습니다.")
+        return None
+
+    try:
+        zoom = spec['zoom'] + int(math.log2(scale))
+        width, height = spec['width'] * scale, spec['height'] * scale
+        center_x, center_y = project(spec['center'][0], spec['center'][1], zoom)
+        origin_x, origin_y = center_x - width / 2, center_y - height / 2
+
+        tile_count = 2 ** zoom
+        tile_coords = [
+            (tx, ty)
+            for ty in range(int(origin_y // TILE_SIZE), int((origin_y + height - 1) // TILE_SIZE) + 1)
+            for tx in range(int(origin_x // TILE_SIZE), int((origin_x + width - 1) // TILE_SIZE) + 1)
+            if 0 <= ty < tile_count
+        ]
+
+        # 타일 다운로드/디스크 읽기는 I/O 작업이므로 스레드로 동시 처리
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            tile_data = list(executor.map(lambda c: _load_tile(zoom, c[0] % tile_count, c[1]), tile_coords))
+
+        tiles = [
+            (int(tx * TILE_SIZE - origin_x), int(ty * TILE_SIZE - origin_y), data)
+            for (tx, ty), data in zip(tile_coords, tile_data) if data is not None
+        ]
+
+        markers = []
+        for marker in spec['markers']:
+            x, y = project(marker['lat'], marker['lng'], zoom)
+            markers.append((int(x - origin_x), int(y - origin_y), marker['color'], marker.get('label')))
+
+        return _run_compose(width, height, tiles, markers, scale, LOCAL_MAP_TILE_ATTRIBUTION)
+
+    except Exception as e:
+        logger.error(f"로컬 지도 렌더링 실패: {str(e)}")
+        return None
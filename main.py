@@ -1,16 +1,29 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, g, send_from_directory, url_for
 import os
 import logging
 import threading
 import time
 import requests
-from sheets_service import get_property_data, test_sheets_connection
-from config import NAVER_CLIENT_ID, NAVER_CLIENT_SECRET
-from ncp_maps_utils import geocode_address, test_ncp_maps_connection
+from sheets_service import get_property_data
+from config import NAVER_CLIENT_ID, NAVER_CLIENT_SECRET, SHEET_RANGES
+from ncp_maps_utils import geocode_address
+from scheduler import scheduler, start_scheduler, get_snapshot, get_snapshot_properties, get_snapshot_geocode
+from static_map_renderer import prepare_static_map, render_static_map, get_cached_map_page
+from startup import warm_up_async, run_connection_tests_async
+from gc_policy import freeze_startup_objects
+from memory_cache import SizedLRUCache
+from property_encoding import (COLUMNAR_FORMAT, FULL_FIELDS, SUMMARY_COLUMNS, SUMMARY_VIEW, encode_json,
+                               requested_format, requested_view, summarize, to_columnar)
+from metrics import CACHE_EVENTS, REQUEST_LATENCY, render_metrics
+from profiling import init_profiling, profile_stage
+from performance_config import SHEETS_REFRESH_INTERVAL, performance_manager
 import socket
 from flask import make_response
 import gzip
-from functools import wraps
+from functools import lru_cache, wraps
+import hashlib
+import json
+import mimetypes
 
 # Render 최적화 import
 try:
@@ -30,6 +43,9 @@ logging.basicConfig(
     ]
 )
 
+# 프로세스 시작 시각 (health check의 uptime 계산용)
+START_TIME = time.time()
+
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "default-secret-key")
 
@@ -37,31 +53,84 @@ app.secret_key = os.environ.get("SESSION_SECRET", "default-secret-key")
 app.config['JSON_SORT_KEYS'] = False  # 정렬 비활성화로 성능 향상
 app.config['JSONIFY_PRETTYPRINT_REGULAR'] = False  # Pretty print 비활성화
 
+# 스냅샷 버전별로 직렬화/압축해 둔 매물 API 응답 ((sheet_type, 형식, 보기) -> (버전, JSON 바이트, gzip 바이트))
+_encoded_properties = SizedLRUCache('encoded_properties')
+# 매물 상세 일괄 조회 한 번에 받을 최대 id 수
+MAX_DETAIL_IDS = 200
+# 서비스 워커가 미리 캐시하는 앱 셸 (index 페이지 + 페이지가 실제로 요청하는 정적 파일, build_assets.py의 원래 경로)
+SHELL_PAGE_ASSETS = ('js/map.js', 'css/style.css')  # 템플릿이 asset_url()로 불러옴
+SHELL_WORKER_ASSETS = ('js/filter_worker.js',)  # map.js가 불러오며, 빌드하면 map.js 안의 경로가 해시 경로로 바뀜
+# build_assets.py가 만든 해시 파일명 정적 파일 (내용이 바뀌면 이름이 바뀌므로 영구 캐시)
+DIST_MAX_AGE = 31536000  # 1년
+
+def accepts_gzip():
+    return 'gzip' in request.headers.get('Accept-Encoding', '').lower()
+
 # 성능 개선을 위한 응답 압축 데코레이터
 def gzip_response(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         response = make_response(f(*args, **kwargs))
-        
+
+        # JSON/HTML 응답만 압축 (정적 파일은 웹서버에서 처리, 이미 압축된 응답은 제외)
+        if 'Content-Encoding' in response.headers or not response.content_type.startswith(('application/json', 'text/html')):
+            return response
+        # Accept-Encoding에 따라 본문이 달라지므로 공유 캐시가 구분해서 저장하도록 표시
+        response.vary.add('Accept-Encoding')
+
         # Accept-Encoding 헤더 확인
-        accept_encoding = request.headers.get('Accept-Encoding', '')
-        if 'gzip' not in accept_encoding.lower():
+        if not accepts_gzip():
             return response
-            
-        # JSON 응답만 압축 (정적 파일은 웹서버에서 처리)
-        if response.content_type.startswith('application/json'):
-            response.data = gzip.compress(response.data)
+
+        if response.status_code == 200:
+            with profile_stage('gzip'):
+                response.data = gzip.compress(response.data)
             response.headers['Content-Encoding'] = 'gzip'
             response.headers['Content-Length'] = len(response.data)
             
         return response
     return decorated_function
 
+def unknown_sheet_type(sheet_type):
+    """SHEET_RANGES에 없는 매물 유형에 대한 404 응답 (URL 값으로 캐시/잠금이 늘어나지 않도록 먼저 거름)"""
+    return jsonify({'error': f'알 수 없는 매물 유형입니다: {sheet_type}'}), 404
+
+def known_sheet_type(f):
+    """<sheet_type> 경로 변수가 SHEET_RANGES에 있는 경우에만 라우트 실행"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if kwargs.get('sheet_type') not in SHEET_RANGES:
+            return unknown_sheet_type(kwargs.get('sheet_type'))
+        return f(*args, **kwargs)
+    return decorated_function
+
+# 라우트별 요청 처리 시간 측정
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        # 경로 변수 대신 라우트 규칙으로 집계하여 라벨 수 제한
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_LATENCY.observe(time.perf_counter() - started,
+                                route=route, method=request.method, status=response.status_code)
+    return response
+
 # 정적 파일 캐시 헤더 추가
 @app.after_request
 def add_cache_headers(response):
+    # 빌드된 정적 파일은 이름에 내용 해시가 있으므로 재검증 없이 영구 캐시
+    if request.endpoint == 'dist_asset':
+        if response.status_code == 200:
+            response.cache_control.max_age = DIST_MAX_AGE
+            response.cache_control.public = True
+            response.cache_control.immutable = True
+    
     # 정적 파일에 대한 캐시 헤더 설정
-    if request.endpoint == 'static':
+    elif request.endpoint == 'static':
         # CSS, JS 파일은 24시간 캐시
         if request.path.endswith(('.css', '.js')):
             response.cache_control.max_age = 86400  # 24시간
@@ -71,6 +140,10 @@ def add_cache_headers(response):
             response.cache_control.max_age = 604800  # 7일
             response.cache_control.public = True
     
+    # 매물 목록은 ETag로 매번 재검증 (스냅샷이 같으면 304)
+    elif request.endpoint == 'get_properties':
+        response.cache_control.no_cache = True
+    
     # API 응답에 대한 캐시 헤더
     elif request.path.startswith('/api/properties/'):
         response.cache_control.max_age = 3600  # 1시간
@@ -83,6 +156,9 @@ def add_cache_headers(response):
         
     return response
 
+# 선택적 요청 프로파일링 (PROFILE_SAMPLE_RATE 또는 PROFILE_TOKEN 설정 시에만 활성화)
+init_profiling(app)
+
 def auto_restart(port):
     """자동 재시작 함수: 10분마다 서버 상태를 확인하고 필요시 재시작"""
     consecutive_failures = 0
@@ -119,30 +195,269 @@ def index():
         logging.error(f"Error rendering index page: {str(e)}")
         return str(e), 500
 
+# 마지막으로 읽은 매니페스트 (파일 수정 시각, 내용) - 다시 빌드하면 새로 읽음
+_asset_manifest = (None, {})
+
+def load_asset_manifest():
+    """
+    build_assets.py 빌드 결과 (원래 경로 → dist 경로)
+    빌드하지 않았거나, 빌드 뒤에 원본 파일이 하나라도 수정되었으면 빈 딕셔너리
+    (남아 있는 static/dist가 static/js, static/css 수정을 가리지 않도록 빌드 전체를 쓰거나 쓰지 않음)
+    """
+    global _asset_manifest
+    path = os.path.join(app.static_folder, 'dist', 'manifest.json')
+    try:
+        built_at = os.path.getmtime(path)
+        if _asset_manifest[0] != built_at:
+            with open(path, 'r', encoding='utf-8') as f:
+                _asset_manifest = (built_at, json.load(f))
+        manifest = _asset_manifest[1]
+        for source in manifest:
+            source_path = os.path.join(app.static_folder, source)
+            if os.path.exists(source_path) and os.path.getmtime(source_path) > built_at:
+                return {}
+        return manifest
+    except (OSError, ValueError):
+        return {}
+
+def asset_path(path):
+    """static 폴더 기준 실제 파일 경로 (빌드된 파일이 있으면 해시 파일명)"""
+    return load_asset_manifest().get(path, path)
+
+def asset_url(path):
+    """
+    템플릿용 정적 파일 URL - {{ asset_url('js/map.js') }}
+    최신 빌드가 있으면 영구 캐시되는 해시 경로(/static/dist/...), 없으면 원본 경로(/static/...)
+    """
+    return url_for('static', filename=asset_path(path))
+
+@app.context_processor
+def inject_asset_url():
+    return {'asset_url': asset_url}
+
+def send_built_asset(path, max_age):
+    """static 폴더의 빌드된 파일 - 브라우저가 받을 수 있으면 미리 압축해 둔 .br / .gz 파일로 응답"""
+    mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    accepted = request.headers.get('Accept-Encoding', '').lower()
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if encoding in accepted and os.path.isfile(os.path.join(app.static_folder, path + suffix)):
+            response = send_from_directory(app.static_folder, path + suffix, mimetype=mimetype, max_age=max_age)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(app.static_folder, path, mimetype=mimetype, max_age=max_age)
+    response.vary.add('Accept-Encoding')
+    return response
+
+@app.route('/static/dist/<path:filename>')
+def dist_asset(filename):
+    """해시 파일명으로 빌드된 정적 파일 (내용이 바뀌면 이름이 바뀌므로 영구 캐시)"""
+    return send_built_asset(f"dist/{filename}", DIST_MAX_AGE)
+
+def build_service_worker():
+    """static/js/sw.js 앞에 앱 셸 버전과 URL 목록을 붙인 스크립트 (셸 파일이 바뀌면 버전이 바뀜)"""
+    # index 템플릿이 없으면 '/'가 오류를 응답하므로 셸에서 제외 (버전 계산에서도 제외)
+    index_template = os.path.join(app.root_path, app.template_folder, 'index.html')
+    has_index = os.path.isfile(index_template)
+    files = [index_template] if has_index else []
+    # 템플릿/map.js가 실제로 불러오는 파일 (최신 빌드가 있으면 빌드 파일, 없으면 원본)
+    assets = tuple(asset_path(path) for path in SHELL_PAGE_ASSETS + SHELL_WORKER_ASSETS)
+    files += [os.path.join(app.static_folder, path) for path in assets]
+    sources = tuple((path, os.path.getmtime(path)) for path in files)
+    return _build_service_worker(sources, has_index, assets)
+
+@lru_cache(maxsize=4)
+def _build_service_worker(sources, has_index, assets):
+    """셸 파일 (경로, 수정 시각)이 같으면 다시 만들지 않음"""
+    digest = hashlib.sha1()
+    for path, _ in sources:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    with open(os.path.join(app.static_folder, 'js', 'sw.js'), 'r', encoding='utf-8') as f:
+        source = f.read()
+    version = digest.hexdigest()[:12]
+    # 페이지가 실제로 요청하는 URL만 캐시 (템플릿의 asset_url()과 빌드된 map.js 안의 워커 경로와 같음)
+    shell_urls = (['/'] if has_index else []) + [url_for('static', filename=path) for path in assets]
+    header = (f"const SHELL_VERSION = '{version}';\n"
+              f"const SHELL_URLS = {app.json.dumps(shell_urls)};\n")
+    return version, (header + source).encode('utf-8')
+
+@app.route('/sw.js')
+def service_worker():
+    """서비스 워커 스크립트 - 사이트 전체(/)를 범위로 등록할 수 있도록 루트 경로에서 제공"""
+    version, body = build_service_worker()
+    response = make_response(body)
+    response.content_type = 'application/javascript; charset=utf-8'
+    response.headers['Service-Worker-Allowed'] = '/'
+    response.cache_control.no_cache = True  # 브라우저가 새 배포를 바로 감지하도록 매번 재검증
+    response.set_etag(version)
+    return response.make_conditional(request)
+
 @app.route('/alternative')
+@gzip_response
 def alternative_map():
-    """네이버 지도 API 인증 문제 시 사용할 수 있는 대체 지도 페이지"""
+    """네이버 지도 API 인증 문제 시 사용할 수 있는 대체 지도 페이지 (스냅샷 버전별로 캐시)"""
     try:
-        return render_template('map_alternative.html')
+        sheet_type = request.args.get('sheet_type', '강남월세')
+        if sheet_type not in SHEET_RANGES:
+            return unknown_sheet_type(sheet_type)
+
+        snapshot = get_snapshot()
+        if snapshot is not None and sheet_type in snapshot.properties:
+            # 이 시트의 매물과 좌표가 그대로면 같은 버전
+            version = snapshot.map_version(sheet_type)
+            page = get_cached_map_page(sheet_type, version, snapshot.properties[sheet_type], snapshot.geocodes)
+        else:
+            version = None
+            page = get_cached_map_page(sheet_type, None, get_property_data(sheet_type))
+
+        response = make_response(page)
+        response.content_type = 'text/html; charset=utf-8'
+        if version is not None:
+            # gzip_response가 압축한 본문과 원본은 서로 다른 표현이므로 ETag도 인코딩별로 구분
+            response.set_etag(version + ('-gzip' if accepts_gzip() else ''))
+            response.cache_control.no_cache = True  # 매번 ETag로 재검증
+            return response.make_conditional(request)
+        return response
     except Exception as e:
         logging.error(f"Error rendering alternative map page: {str(e)}")
         return str(e), 500
 
+def load_properties(sheet_type):
+    """백그라운드 스케줄러가 발행한 스냅샷 우선 사용, 없으면 기존 캐시 경로"""
+    # URL에서 온 값이므로 알 수 없는 시트는 하나의 라벨로 묶어 메트릭 시계열이 늘어나지 않게 함
+    label = sheet_type if sheet_type in SHEET_RANGES else 'other'
+    with profile_stage('cache_lookup'):
+        properties = get_snapshot_properties(sheet_type)
+        if properties is None:
+            CACHE_EVENTS.inc(sheet_type=label, result='miss')
+            return get_property_data(sheet_type)
+    # 갱신 주기 두 번 이상 지난 스냅샷은 만료된 데이터로 집계
+    stale = get_snapshot().age() > SHEETS_REFRESH_INTERVAL * 2
+    CACHE_EVENTS.inc(sheet_type=label, result='stale' if stale else 'hit')
+    return properties
+
+def encode_properties_payload(sheet_type, properties, fmt, view, geocode=get_snapshot_geocode):
+    """
+    응답 형식/보기에 맞는 JSON 직렬화 대상
+    (기본: 매물 배열, columnar: 열 단위 압축 형식, summary: 마커용 필드와 좌표만)
+    """
+    fields = FULL_FIELDS
+    if view == SUMMARY_VIEW:
+        properties = summarize(properties, sheet_type, geocode)
+        fields = SUMMARY_COLUMNS
+    return to_columnar(properties, fields) if fmt == COLUMNAR_FORMAT else properties
+
+def encode_snapshot_properties(sheet_type, properties, fmt='rows', view='full'):
+    """
+    스냅샷에서 읽은 매물 목록이면 버전/형식/보기별로 한 번만 JSON 직렬화/gzip 압축하여 재사용
+    (버전, JSON 바이트, gzip 바이트) 반환, 스냅샷 밖의 데이터(기존 캐시 경로)는 None 반환
+    """
+    snapshot = get_snapshot()
+    if snapshot is None or snapshot.properties.get(sheet_type) is not properties:
+        return None
+    version = snapshot.sheet_versions[sheet_type]
+    if view == SUMMARY_VIEW:
+        # 요약에는 좌표가 들어가므로 이 시트 주소의 좌표가 바뀌면 다시 생성
+        version = snapshot.map_version(sheet_type)
+    cache_key = (sheet_type, fmt, view)
+    cached = _encoded_properties.get(cache_key)
+    if cached is not None and cached[0] == version:
+        return cached
+
+    with profile_stage('serialize'):
+        payload = encode_properties_payload(sheet_type, properties, fmt, view,
+                                            lambda address: snapshot.geocodes.get(address.strip()))
+        body = encode_json(payload)
+    with profile_stage('gzip'):
+        compressed = gzip.compress(body)
+    _encoded_properties.set(cache_key, (version, body, compressed), size=len(body) + len(compressed))
+    return version, body, compressed
+
+def find_properties(sheet_type, property_ids):
+    """스냅샷의 id 색인으로 매물 상세 조회 (스냅샷이 없으면 기존 캐시 경로의 목록에서 검색)"""
+    properties = load_properties(sheet_type)
+    snapshot = get_snapshot()
+    if snapshot is not None and snapshot.properties.get(sheet_type) is properties:
+        return snapshot.find(sheet_type, property_ids)
+    index = {prop['id']: prop for prop in properties}
+    return [index[property_id] for property_id in property_ids if property_id in index]
+
 @app.route('/api/properties/<sheet_type>')
 @gzip_response
+@known_sheet_type
 def get_properties(sheet_type):
     try:
-        properties = get_property_data(sheet_type)
+        properties = load_properties(sheet_type)
         
         # 성능 개선: 프로덕션에서는 간단한 로깅만
         if not os.environ.get("RENDER"):
             logging.info(f"API 응답 - {sheet_type}: {len(properties)}개 매물")
         
-        return jsonify(properties)
+        # ?format=columnar 또는 Accept 헤더로 열 단위 압축 형식, ?view=summary로 마커용 요약만 요청 가능
+        fmt = requested_format(request)
+        view = requested_view(request)
+        encoded = encode_snapshot_properties(sheet_type, properties, fmt, view)
+        if encoded is None:
+            with profile_stage('serialize'):
+                response = jsonify(encode_properties_payload(sheet_type, properties, fmt, view))
+            response.vary.add('Accept')
+            return response
+        
+        version, body, compressed = encoded
+        use_gzip = accepts_gzip()
+        if use_gzip:
+            response = make_response(compressed)
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = make_response(body)
+        response.content_type = 'application/json'
+        response.vary.add('Accept-Encoding')
+        response.vary.add('Accept')
+        # 서비스 워커/브라우저가 If-None-Match로 재검증 (스냅샷이 그대로면 304)
+        response.headers['X-Snapshot-Version'] = version
+        response.set_etag(f"{version}-{fmt}-{view}" + ('-gzip' if use_gzip else ''))
+        return response.make_conditional(request)
     except Exception as e:
         logging.error(f"Error fetching properties: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/properties/<sheet_type>/details')
+@gzip_response
+@known_sheet_type
+def get_property_details(sheet_type):
+    """매물 상세 일괄 조회 (?ids=1,2,3) - 요약 목록으로 그린 마커의 InfoWindow를 열 때 사용"""
+    try:
+        property_ids = [i.strip() for i in request.args.get('ids', '').split(',') if i.strip()]
+        if not property_ids:
+            return jsonify({'error': 'ids가 필요합니다.'}), 400
+        if len(property_ids) > MAX_DETAIL_IDS:
+            return jsonify({'error': f'ids는 한 번에 {MAX_DETAIL_IDS}개까지 조회할 수 있습니다.'}), 400
+        
+        found = find_properties(sheet_type, property_ids)
+        found_ids = {prop['id'] for prop in found}
+        return jsonify({
+            'properties': found,
+            'missing': [i for i in property_ids if i not in found_ids]
+        })
+    except Exception as e:
+        logging.error(f"Error fetching property details: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/properties/<sheet_type>/<property_id>')
+@gzip_response
+@known_sheet_type
+def get_property_detail(sheet_type, property_id):
+    """매물 한 개 상세 조회"""
+    try:
+        found = find_properties(sheet_type, [property_id])
+        if not found:
+            return jsonify({'error': '매물을 찾을 수 없습니다.'}), 404
+        return jsonify(found[0])
+    except Exception as e:
+        logging.error(f"Error fetching property detail: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/geocode')
 @gzip_response
 def geocode():
@@ -152,7 +467,7 @@ def geocode():
         if not address:
             return jsonify({'error': '주소가 필요합니다.'}), 400
         
-        result = geocode_address(address)
+        result = get_snapshot_geocode(address) or geocode_address(address)
         if result:
             return jsonify({
                 'status': 'OK',
@@ -168,15 +483,63 @@ def geocode():
         logging.error(f"Geocoding API error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/static-map')
+def static_map():
+    """매물 마커가 표시된 정적 지도 PNG - (마커, 중심, 줌, 크기)별로 한 번만 렌더링하여 디스크 캐시에서 제공"""
+    try:
+        sheet_type = request.args.get('sheet_type', '강남월세')
+        if sheet_type not in SHEET_RANGES:
+            return unknown_sheet_type(sheet_type)
+        status = request.args.get('status')
+        zoom = min(max(request.args.get('zoom', 13, type=int), 1), 20)
+        width = min(max(request.args.get('w', 800, type=int), 1), 1024)
+        height = min(max(request.args.get('h', 600, type=int), 1), 1024)
+        lat = request.args.get('lat', type=float)
+        lng = request.args.get('lng', type=float)
+        center = (lat, lng) if lat is not None and lng is not None else None
+
+        properties = load_properties(sheet_type)
+        if status:
+            properties = [p for p in properties if p.get('status') == status]
+
+        snapshot = get_snapshot()
+        spec = prepare_static_map(properties, width, height, zoom, center,
+                                  geocodes=snapshot.geocodes if snapshot else None)
+
+        # 같은 지도를 이미 가진 클라이언트에는 본문 없이 응답
+        etag = spec['key']
+        if request.if_none_match.contains(etag):
+            response = make_response('', 304)
+        else:
+            rendered = render_static_map(spec)
+            if rendered is None:
+                return jsonify({'error': '정적 지도를 생성할 수 없습니다.'}), 502
+            png, etag = rendered
+            if request.if_none_match.contains(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(png)
+                response.content_type = 'image/png'
+
+        response.set_etag(etag)
+        response.cache_control.max_age = 3600  # 1시간
+        response.cache_control.public = True
+        return response
+    except Exception as e:
+        logging.error(f"Static map API error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 # Health check endpoint
 @app.route('/health')
 def health_check():
     """상세한 서버 상태 확인을 위한 health check 엔드포인트"""
     try:
+        snapshot = get_snapshot()
         return jsonify({
             "status": "healthy",
             "timestamp": time.strftime('%Y-%m-%d %H:%M:%S'),
-            "uptime": "running",
+            "uptime": round(time.time() - START_TIME, 1),
+            "snapshot_age": round(snapshot.age(), 1) if snapshot else None,
             "version": "1.0"
         }), 200
     except Exception as e:
@@ -186,6 +549,13 @@ def health_check():
             "error": str(e)
         }), 500
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus 형식 메트릭 (워커 프로세스별 값)"""
+    response = make_response(render_metrics())
+    response.content_type = 'text/plain; version=0.0.4; charset=utf-8'
+    return response
+
 @app.route('/api/cache/clear', methods=['POST'])
 def clear_cache():
     """캐시를 수동으로 클리어하는 API"""
@@ -193,6 +563,8 @@ def clear_cache():
         from sheets_service import get_property_data
         # 캐시 클리어
         get_property_data.clear_cache()
+        # 스냅샷은 유지한 채 백그라운드 갱신을 즉시 요청
+        scheduler.trigger()
         logging.info("캐시가 성공적으로 클리어되었습니다.")
         return jsonify({
             "status": "success",
@@ -206,62 +578,30 @@ def clear_cache():
             "error": str(e)
         }), 500
 
+@app.route('/api/scheduler/status')
+def scheduler_status():
+    """백그라운드 갱신 스케줄러 상태 및 마지막 실행 시간 정보"""
+    return jsonify(scheduler.status()), 200
+
 if __name__ == '__main__':
     is_production = os.environ.get("RENDER")
     
     if not is_production:
         logging.info("Starting Flask application...")
 
-    # Google Sheets API 연결 테스트
-    if not is_production:
-        logging.info("=== Google Sheets API 연결 테스트 ===")
-    try:
-        sheets_test_result = test_sheets_connection()
-        if sheets_test_result:
-            if not is_production:
-                logging.info("Google Sheets API 연결이 정상적으로 작동합니다.")
-            
-            # 성능 최적화: 주요 데이터 사전 로딩
-            if not is_production:
-                logging.info("=== 주요 데이터 사전 로딩 ===")
-            try:
-                # 가장 많이 사용되는 강남월세 데이터 사전 로딩
-                preload_data = get_property_data('강남월세')
-                if not is_production:
-                    logging.info(f"강남월세 {len(preload_data)}개 매물 사전 로딩 완료")
-                
-                # 강남전세 데이터도 사전 로딩
-                preload_data = get_property_data('강남전세')
-                if not is_production:
-                    logging.info(f"강남전세 {len(preload_data)}개 매물 사전 로딩 완료")
-                    logging.info("✅ 데이터 사전 로딩 완료 - 첫 번째 검색이 더 빨라집니다!")
-                
-            except Exception as e:
-                if not is_production:
-                    logging.warning(f"데이터 사전 로딩 실패 (계속 진행): {str(e)}")
-        else:
-            logging.error("Google Sheets API 연결 실패")
-    except Exception as e:
-        logging.error(f"Google Sheets API 연결 테스트 실패: {str(e)}")
+    # 시작 시 만든 객체(모듈 등)를 GC 대상에서 제외
+    freeze_startup_objects()
 
-    # 네이버 클라우드 플랫폼 Maps API 연결 테스트
-    if not is_production:
-        logging.info("=== 네이버 클라우드 플랫폼 Maps API 연결 테스트 ===")
-    try:
-        maps_test_result = test_ncp_maps_connection()
-        if maps_test_result and not is_production:
-            logging.info("네이버 클라우드 플랫폼 Maps API 연결이 정상적으로 작동합니다.")
-        elif not maps_test_result:
-            logging.error("네이버 클라우드 플랫폼 Maps API 연결 실패")
-    except Exception as e:
-        logging.error(f"네이버 클라우드 플랫폼 Maps API 연결 테스트 실패: {str(e)}")
+    # 인증/클라이언트/스냅샷 워밍업은 백그라운드에서 실행하여 바로 요청을 받음
+    # (gunicorn에서는 gunicorn.conf.py의 when_ready에서 fork 전에 실행)
+    warm_up_async()
 
-    # 성능 통계 출력
-    if not is_production:
-        try:
-            log_performance_stats()
-        except Exception as e:
-            logging.warning(f"성능 통계 출력 실패: {str(e)}")
+    # 연결 테스트는 백그라운드에서 실행하여 서버 시작을 막지 않음
+    run_connection_tests_async()
+
+    # 백그라운드 갱신 스케줄러와 캐시 예산 모니터 시작
+    start_scheduler()
+    performance_manager.start_memory_monitor()
 
     # 포트 설정
     port = int(os.environ.get("PORT", 5050))
@@ -0,0 +1,111 @@
+"""
+메모리 캐시 용량 관리
+각 캐시는 항목별 대략적인 바이트 크기를 기록하고 performance_manager에 등록되어,
+전체 합계가 MAX_CACHE_SIZE를 넘으면 모든 캐시를 통틀어 가장 오래 사용하지 않은 항목부터 제거됩니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from performance_config import estimate_size, performance_manager
+
+
+class SizedLRUCache:
+    """항목별 크기를 기록하는 스레드 안전 LRU 캐시 (전체 예산은 performance_manager가 관리)"""
+
+    def __init__(self, name, max_entries=None):
+        self.name = name
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, size, last_access) - 오래 사용하지 않은 순
+        self._total_bytes = 0
+        performance_manager.register_cache(name, self)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, size, _ = entry
+            self._entries[key] = (value, size, time.time())
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, size=None):
+        """값 저장 (size를 주지 않으면 estimate_size로 계산) 후 전체 예산 확인"""
+        if size is None:
+            size = estimate_size(value)
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (value, size, time.time())
+            self._total_bytes += size
+            while self.max_entries is not None and len(self._entries) > self.max_entries:
+                self._pop(next(iter(self._entries)))
+        performance_manager.enforce_budget()
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._pop(key)
+        return default if entry is None else entry[0]
+
+    def discard(self, key, value):
+        """key의 값이 아직 value일 때만 제거 (그 사이 다른 스레드가 새로 저장한 값은 유지)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is value:
+                self._pop(key)
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    # performance_manager 예산 관리용 인터페이스
+    def byte_size(self):
+        return self._total_bytes
+
+    def oldest_access(self):
+        with self._lock:
+            if not self._entries:
+                return None
+            return next(iter(self._entries.values()))[2]
+
+    def evict_oldest(self):
+        with self._lock:
+            if not self._entries:
+                return 0
+            return self._pop(next(iter(self._entries)))[1]
+
+
+class PinnedSize:
+    """
+    제거할 수 없는 데이터(발행된 스냅샷 등)의 크기를 예산 합계에만 반영하는 항목
+    이 크기만큼 다른 캐시가 쓸 수 있는 예산이 줄어듭니다.
+    """
+
+    def __init__(self, name):
+        self._size = 0
+        performance_manager.register_cache(name, self)
+
+    def update(self, size):
+        self._size = size
+        performance_manager.enforce_budget()
+
+    def byte_size(self):
+        return self._size
+
+    def oldest_access(self):
+        return None
+
+    def evict_oldest(self):
+        return 0
@@ -0,0 +1,196 @@
+"""
+Prometheus 텍스트 형식 메트릭
+라우트별 지연 시간, 시트별 캐시 적중/미스/만료, Google Sheets / NCP 호출 수·지연·오류,
+단일 실행(single-flight) 대기 수, 스냅샷 나이, GC 일시정지 시간을 /metrics 로 노출합니다.
+값은 프로세스(워커)별로 집계되며 모든 시계열에 worker 라벨(pid)이 붙습니다.
+gunicorn 워커가 여러 개면 한 번의 수집은 요청을 받은 워커의 값만 보여주므로
+워커 재시작/교대를 카운터 초기화로 오해하지 않도록 worker 라벨별로 보거나 sum without (worker) 로 합산합니다.
+"""
+
+import gc
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+GC_PAUSE_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=None):
+    # fork 이후에도 맞는 값이 되도록 출력할 때마다 pid 확인
+    pairs = list(zip(names, values)) + [('worker', os.getpid())]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        return tuple(labels.get(name, '') for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        super().__init__(name, documentation, labelnames)
+        self._callback = callback  # 출력 시점에 값을 계산하는 함수 (라벨 없는 게이지용)
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def _samples(self):
+        if self._callback is not None:
+            value = self._callback()
+            return [] if value is None else [f"{self.name}{_format_labels((), ())} {value}"]
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def _samples(self):
+        with self._lock:
+            items = [(key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items()]
+        lines = []
+        for key, (counts, total, count) in items:
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', bound))} {bucket_count}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', '+Inf'))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 모음 - 등록 순서대로 출력"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collect_hooks = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collect_hook(self, hook):
+        """출력 직전에 호출할 함수 등록 (버퍼에 모아 둔 값을 메트릭으로 옮기는 용도, 중복 등록 무시)"""
+        if hook not in self._collect_hooks:
+            self._collect_hooks.append(hook)
+
+    def render(self):
+        for hook in self._collect_hooks:
+            hook()
+        return '\n'.join(metric.render() for metric in self._metrics) + '\n'
+
+
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.register(Histogram(
+    'http_request_duration_seconds', '라우트별 요청 처리 시간', ('route', 'method', 'status')))
+CACHE_EVENTS = registry.register(Counter(
+    'property_cache_events_total', '시트별 매물 캐시 결과 (hit/miss/stale)', ('sheet_type', 'result')))
+UPSTREAM_REQUESTS = registry.register(Counter(
+    'upstream_requests_total', '외부 API 호출 수', ('service', 'operation', 'outcome')))
+UPSTREAM_LATENCY = registry.register(Histogram(
+    'upstream_request_duration_seconds', '외부 API 호출 시간', ('service', 'operation')))
+SINGLE_FLIGHT_WAITERS = registry.register(Gauge(
+    'single_flight_waiters', '같은 키의 데이터 로딩을 기다리는 스레드 수', ('cache',)))
+SINGLE_FLIGHT_COALESCED = registry.register(Counter(
+    'single_flight_coalesced_total', '다른 스레드의 로딩 결과를 재사용한 요청 수', ('cache',)))
+
+
+def _snapshot_age():
+    from scheduler import get_snapshot
+    snapshot = get_snapshot()
+    return round(snapshot.age(), 3) if snapshot is not None else None
+
+
+SNAPSHOT_AGE = registry.register(Gauge(
+    'property_snapshot_age_seconds', '현재 발행된 매물 스냅샷의 나이', callback=_snapshot_age))
+GC_PAUSE = registry.register(Histogram(
+    'gc_pause_seconds', '세대별 가비지 컬렉션 일시정지 시간', ('generation',), buckets=GC_PAUSE_BUCKETS))
+GC_COLLECTED = registry.register(Counter(
+    'gc_collected_objects_total', '세대별 가비지 컬렉션으로 정리된 객체 수', ('generation',)))
+GC_FROZEN = registry.register(Gauge(
+    'gc_frozen_objects', 'gc.freeze()로 GC 대상에서 제외된 객체 수', callback=gc.get_freeze_count))
+
+
+@contextmanager
+def track_upstream(service, operation):
+    """외부 API 호출 수/지연/오류를 기록 (블록에서 예외가 나면 error로 집계)"""
+    started = time.perf_counter()
+    outcome = 'ok'
+    try:
+        yield
+    except BaseException:
+        outcome = 'error'
+        raise
+    finally:
+        UPSTREAM_LATENCY.observe(time.perf_counter() - started, service=service, operation=operation)
+        UPSTREAM_REQUESTS.inc(service=service, operation=operation, outcome=outcome)
+
+
+def render_metrics():
+    """/metrics 응답 본문"""
+    return registry.render()
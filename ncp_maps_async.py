@@ -0,0 +1,159 @@
+"""
+네이버 클라우드 플랫폼 Maps API 비동기 클라이언트
+여러 주소를 세마포어로 동시 호출 수를 제한하며 한꺼번에 지오코딩하여
+N개 주소를 순차 호출 N번이 아닌 왕복 한 번 수준의 시간에 처리합니다.
+
+httpx는 필수 의존성(pyproject.toml, requirements.txt)이며 커넥션 풀을 공유하는
+httpx.AsyncClient로 호출합니다. 의존성을 다시 설치하지 않은 개발 환경처럼 httpx가 없을 때만
+동기 클라이언트(ncp_maps_utils)를 스레드에서 실행하는 방식으로 대체됩니다.
+httpx는 시작 시간을 줄이기 위해 클라이언트를 처음 만들 때 import 합니다.
+
+클라이언트(커넥션 풀)는 이벤트 루프마다 하나만 만들어 재사용합니다.
+동기 코드의 geocode_addresses()는 워커 프로세스마다 하나인 백그라운드 이벤트 루프에서 실행되므로
+일괄 요청이 여러 번 와도 NCP와 맺은 keep-alive 연결을 계속 사용합니다.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+import threading
+import weakref
+
+from config import NCP_MAPS_URLS, NCP_HEADERS
+from metrics import track_upstream
+from ncp_maps_utils import (
+    geocode_address,
+    parse_geocode_response,
+    parse_reverse_geocode_response,
+    reverse_geocode,
+    reverse_geocode_params,
+    static_map_params,
+)
+from performance_config import API_TIMEOUT, MAX_CONCURRENT_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+# 이벤트 루프 → 공유 클라이언트 (루프가 사라지면 항목도 사라짐)
+_loop_clients = weakref.WeakKeyDictionary()
+# 동기 코드용 백그라운드 이벤트 루프 (fork 후에는 워커에서 새로 만듦)
+_runner_loop = None
+_runner_pid = None
+_runner_lock = threading.Lock()
+
+
+def create_client(concurrency=MAX_CONCURRENT_REQUESTS):
+    """NCP 헤더와 커넥션 풀이 설정된 비동기 HTTP 클라이언트 생성 (httpx 없으면 None)"""
+    if importlib.util.find_spec('httpx') is None:
+        return None
+    import httpx
+    return httpx.AsyncClient(
+        headers=NCP_HEADERS,
+        timeout=API_TIMEOUT,
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+    )
+
+
+def shared_client():
+    """실행 중인 이벤트 루프에서 재사용하는 클라이언트 (처음 호출 시 생성, httpx 없으면 None)"""
+    loop = asyncio.get_running_loop()
+    if loop not in _loop_clients:
+        _loop_clients[loop] = create_client()
+    return _loop_clients[loop]
+
+
+def _get_runner_loop():
+    """이 프로세스의 백그라운드 이벤트 루프 (없거나 fork 전에 만든 루프면 새로 시작)"""
+    global _runner_loop, _runner_pid
+    with _runner_lock:
+        if _runner_loop is None or _runner_pid != os.getpid():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='ncp-async', daemon=True).start()
+            _runner_loop, _runner_pid = loop, os.getpid()
+        return _runner_loop
+
+
+async def geocode_address_async(address, client=None):
+    """주소를 위도/경도로 변환 (비동기)"""
+    if client is None:
+        return await asyncio.to_thread(geocode_address, address)
+    import httpx
+    try:
+        with track_upstream('ncp', 'geocode'):
+            response = await client.get(NCP_MAPS_URLS['geocoding'], params={'query': address})
+            response.raise_for_status()
+        return parse_geocode_response(response.json(), address)
+    except httpx.HTTPError as e:
+        logger.error(f"Geocoding API request failed: {str(e)}")
+        return None
+    except (KeyError, ValueError) as e:
+        logger.error(f"Geocoding response parsing failed: {str(e)}")
+        return None
+
+
+async def reverse_geocode_async(lat, lng, client=None):
+    """위도/경도를 주소로 변환 (비동기)"""
+    if client is None:
+        return await asyncio.to_thread(reverse_geocode, lat, lng)
+    import httpx
+    try:
+        with track_upstream('ncp', 'reverse_geocode'):
+            response = await client.get(NCP_MAPS_URLS['reverse_geocoding'], params=reverse_geocode_params(lat, lng))
+            response.raise_for_status()
+        return parse_reverse_geocode_response(response.json(), lat, lng)
+    except httpx.HTTPError as e:
+        logger.error(f"Reverse geocoding API request failed: {str(e)}")
+        return None
+    except (KeyError, ValueError) as e:
+        logger.error(f"Reverse geocoding response parsing failed: {str(e)}")
+        return None
+
+
+async def fetch_static_map_async(lat, lng, width=400, height=400, zoom=15, markers=None, client=None, **extra_params):
+    """정적 지도 PNG 바이트를 가져옴 (실패 시 None)"""
+    params = static_map_params(lat, lng, width, height, zoom, markers)
+    params.update(extra_params)
+    if client is None:
+        client = shared_client()
+    if client is None:
+        logger.error("정적 지도 비동기 요청에는 httpx가 필요합니다.")
+        return None
+    import httpx
+    try:
+        with track_upstream('ncp', 'static_map'):
+            response = await client.get(NCP_MAPS_URLS['static_map'], params=params)
+            response.raise_for_status()
+        return response.content
+    except httpx.HTTPStatusError as e:
+        logger.error(f"정적 지도 생성 실패: {e.response.status_code}")
+        return None
+    except httpx.HTTPError as e:
+        logger.error(f"Static map API request failed: {str(e)}")
+        return None
+
+
+async def geocode_addresses_async(addresses, concurrency=MAX_CONCURRENT_REQUESTS):
+    """
+    여러 주소를 동시에 지오코딩 (세마포어로 동시 호출 수 제한)
+    반환값: {주소: 결과} - 실패한 주소는 포함되지 않음
+    """
+    unique_addresses = list(dict.fromkeys(a for a in addresses if a))
+    if not unique_addresses:
+        return {}
+
+    semaphore = asyncio.Semaphore(concurrency)
+    client = shared_client()
+
+    async def resolve(address):
+        async with semaphore:
+            return address, await geocode_address_async(address, client)
+
+    results = await asyncio.gather(*(resolve(address) for address in unique_addresses))
+    return {address: result for address, result in results if result}
+
+
+def geocode_addresses(addresses, concurrency=MAX_CONCURRENT_REQUESTS):
+    """동기 코드(Flask 핸들러, 스케줄러 스레드)에서 사용하는 일괄 지오코딩 (워커의 공유 이벤트 루프/클라이언트 사용)"""
+    future = asyncio.run_coroutine_threadsafe(geocode_addresses_async(addresses, concurrency), _get_runner_loop())
+    return future.result()
@@ -1,10 +1,61 @@
 import requests
 import json
 import logging
+from requests.adapters import HTTPAdapter
 from config import NCP_MAPS_URLS, NCP_HEADERS
+from metrics import track_upstream
+from performance_config import API_TIMEOUT, MAX_CONCURRENT_REQUESTS
 
 logger = logging.getLogger(__name__)
 
+# 성능 개선: keep-alive 연결을 재사용하는 공유 세션 (워커 스레드 수만큼 연결 풀 유지)
+_session = requests.Session()
+_session.headers.update(NCP_HEADERS)
+_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENT_REQUESTS))
+
+def parse_geocode_response(data, address):
+    """Geocoding API 응답에서 첫 번째 결과를 추출 (동기/비동기 클라이언트 공용)"""
+    if data['status'] == 'OK' and len(data['addresses']) > 0:
+        address_info = data['addresses'][0]
+        return {
+            'lat': float(address_info['y']),
+            'lng': float(address_info['x']),
+            'formatted_address': address_info['roadAddress'] or address_info['jibunAddress']
+        }
+    logger.warning(f"Geocoding failed for address: {address}")
+    logger.warning(f"API response: {data}")
+    return None
+
+def reverse_geocode_params(lat, lng):
+    """Reverse Geocoding API 요청 파라미터"""
+    return {
+        'coords': f"{lng},{lat}",
+        'sourcecrs': 'epsg:4326',
+        'targetcrs': 'epsg:4326',
+        'orders': 'roadaddr,admcode,legalcode'
+    }
+
+def parse_reverse_geocode_response(data, lat, lng):
+    """Reverse Geocoding API 응답에서 행정구역 주소를 구성 (동기/비동기 클라이언트 공용)"""
+    if data['status']['code'] == 0 and len(data['results']) > 0:
+        result = data['results'][0]
+        if 'region' in result:
+            region = result['region']
+            address_parts = []
+            
+            # 주소 구성
+            if 'area1' in region and region['area1']['name']:
+                address_parts.append(region['area1']['name'])
+            if 'area2' in region and region['area2']['name']:
+                address_parts.append(region['area2']['name'])
+            if 'area3' in region and region['area3']['name']:
+                address_parts.append(region['area3']['name'])
+                
+            return ' '.join(address_parts)
+        
+    logger.warning(f"Reverse geocoding failed for coordinates: {lat}, {lng}")
+    return None
+
 def geocode_address(address):
     """
     주소를 위도/경도로 변환하는 함수
@@ -21,27 +72,16 @@ def geocode_address(address):
         logger.info(f"Geocoding request params: {params}")
         logger.info(f"Geocoding request headers: {NCP_HEADERS}")
         
-        response = requests.get(url, headers=NCP_HEADERS, params=params)
-        
-        # 응답 상태 코드와 내용 로그
-        logger.info(f"Response status code: {response.status_code}")
-        logger.info(f"Response text: {response.text}")
-        
-        response.raise_for_status()
-        
-        data = response.json()
+        with track_upstream('ncp', 'geocode'):
+            response = _session.get(url, params=params, timeout=API_TIMEOUT)
+            
+            # 응답 상태 코드와 내용 로그
+            logger.info(f"Response status code: {response.status_code}")
+            logger.info(f"Response text: {response.text}")
+            
+            response.raise_for_status()
         
-        if data['status'] == 'OK' and len(data['addresses']) > 0:
-            address_info = data['addresses'][0]
-            return {
-                'lat': float(address_info['y']),
-                'lng': float(address_info['x']),
-                'formatted_address': address_info['roadAddress'] or address_info['jibunAddress']
-            }
-        else:
-            logger.warning(f"Geocoding failed for address: {address}")
-            logger.warning(f"API response: {data}")
-            return None
+        return parse_geocode_response(response.json(), address)
             
     except requests.exceptions.RequestException as e:
         logger.error(f"Geocoding API request failed: {str(e)}")
@@ -57,36 +97,13 @@ def reverse_geocode(lat, lng):
     """
     try:
         url = NCP_MAPS_URLS['reverse_geocoding']
-        params = {
-            'coords': f"{lng},{lat}",
-            'sourcecrs': 'epsg:4326',
-            'targetcrs': 'epsg:4326',
-            'orders': 'roadaddr,admcode,legalcode'
-        }
-        
-        response = requests.get(url, headers=NCP_HEADERS, params=params)
-        response.raise_for_status()
+        params = reverse_geocode_params(lat, lng)
         
-        data = response.json()
+        with track_upstream('ncp', 'reverse_geocode'):
+            response = _session.get(url, params=params, timeout=API_TIMEOUT)
+            response.raise_for_status()
         
-        if data['status']['code'] == 0 and len(data['results']) > 0:
-            result = data['results'][0]
-            if 'region' in result:
-                region = result['region']
-                address_parts = []
-                
-                # 주소 구성
-                if 'area1' in region and region['area1']['name']:
-                    address_parts.append(region['area1']['name'])
-                if 'area2' in region and region['area2']['name']:
-                    address_parts.append(region['area2']['name'])
-                if 'area3' in region and region['area3']['name']:
-                    address_parts.append(region['area3']['name'])
-                    
-                return ' '.join(address_parts)
-            
-        logger.warning(f"Reverse geocoding failed for coordinates: {lat}, {lng}")
-        return None
+        return parse_reverse_geocode_response(response.json(), lat, lng)
         
     except requests.exceptions.RequestException as e:
         logger.error(f"Reverse geocoding API request failed: {str(e)}")
@@ -95,6 +112,30 @@ def reverse_geocode(lat, lng):
         logger.error(f"Reverse geocoding response parsing failed: {str(e)}")
         return None
 
+def static_map_params(lat, lng, width=400, height=400, zoom=15, markers=None):
+    """Static Map API 요청 파라미터 (동기/비동기 클라이언트 공용)"""
+    params = {
+        'center': f"{lng},{lat}",
+        'level': zoom,
+        'w': width,
+        'h': height,
+        'format': 'png'
+    }
+    
+    # 마커 추가
+    if markers:
+        marker_strings = []
+        for marker in markers:
+            marker_str = f"type:t|size:mid|pos:{marker['lng']} {marker['lat']}"
+            if 'color' in marker:
+                # NCP는 16진수 색상을 0xRRGGBB 형식으로 받음
+                marker_str += f"|color:{marker['color'].replace('#', '0x')}"
+            if 'label' in marker:
+                marker_str += f"|label:{marker['label']}"
+            marker_strings.append(marker_str)
+        params['markers'] = '|'.join(marker_strings)
+    return params
+
 def get_static_map_url(lat, lng, width=400, height=400, zoom=15, markers=None):
     """
     정적 지도 이미지 URL을 생성하는 함수
@@ -102,25 +143,7 @@ def get_static_map_url(lat, lng, width=400, height=400, zoom=15, markers=None):
     """
     try:
         url = NCP_MAPS_URLS['static_map']
-        params = {
-            'center': f"{lng},{lat}",
-            'level': zoom,
-            'w': width,
-            'h': height,
-            'format': 'png'
-        }
-        
-        # 마커 추가
-        if markers:
-            marker_strings = []
-            for marker in markers:
-                marker_str = f"type:t|size:mid|pos:{marker['lng']} {marker['lat']}"
-                if 'color' in marker:
-                    marker_str += f"|color:{marker['color']}"
-                if 'label' in marker:
-                    marker_str += f"|label:{marker['label']}"
-                marker_strings.append(marker_str)
-            params['markers'] = '|'.join(marker_strings)
+        params = static_map_params(lat, lng, width, height, zoom, markers)
         
         # URL 파라미터를 직접 구성
         param_str = '&'.join([f"{k}={v}" for k, v in params.items()])
@@ -132,6 +155,27 @@ def get_static_map_url(lat, lng, width=400, height=400, zoom=15, markers=None):
         logger.error(f"Static map URL generation failed: {str(e)}")
         return None
 
+def fetch_static_map(lat, lng, width=400, height=400, zoom=15, markers=None, **extra_params):
+    """
+    정적 지도 PNG 이미지를 가져오는 함수 (실패 시 None)
+    네이버 클라우드 플랫폼 Static Map API 사용
+    """
+    try:
+        params = static_map_params(lat, lng, width, height, zoom, markers)
+        params.update(extra_params)
+        
+        with track_upstream('ncp', 'static_map'):
+            response = _session.get(NCP_MAPS_URLS['static_map'], params=params, timeout=API_TIMEOUT)
+            response.raise_for_status()
+        return response.content
+        
+    except requests.exceptions.HTTPError as e:
+        logger.error(f"정적 지도 생성 실패: {e.response.status_code}")
+        return None
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Static map API request failed: {str(e)}")
+        return None
+
 def test_ncp_maps_connection():
     """
     네이버 클라우드 플랫폼 Maps API 연결 테스트
@@ -3,13 +3,18 @@
 
 import os
 import gc
+import sys
+import tempfile
 import threading
 import time
 
 # 메모리 최적화 설정
-MAX_CACHE_SIZE = 100 * 1024 * 1024  # 100MB로 증가 (전체 메모리의 약 20%)
+MAX_CACHE_SIZE = int(os.getenv('MAX_CACHE_SIZE_MB', '100')) * 1024 * 1024  # 100MB (전체 메모리의 약 20%)
 CACHE_CLEANUP_INTERVAL = 3600  # 1시간마다 캐시 정리
-GC_COLLECT_INTERVAL = 1200  # 20분마다 가비지 컬렉션
+
+# 가비지 컬렉션 세대별 임계값 (gc_policy.py)
+# 요청마다 임시 객체가 많이 생기므로 0세대 임계값을 높여 요청 스레드의 GC 횟수를 줄임 (기본값 700, 10, 10)
+GC_THRESHOLDS = tuple(int(v) for v in os.getenv('GC_THRESHOLDS', '50000,20,20').split(','))
 
 # API 호출 최적화 설정
 API_TIMEOUT = 15  # API 타임아웃 (초) - 15초로 증가
@@ -20,29 +25,120 @@ RETRY_ATTEMPTS = 2  # 재시도 횟수
 GEOCODING_BATCH_SIZE = 20  # 20으로 증가
 SHEETS_BATCH_SIZE = 200  # 200으로 증가
 
+# 백그라운드 갱신 설정 (요청 처리 경로에서 외부 API 호출 제거)
+SHEETS_REFRESH_ENABLED = os.getenv('SHEETS_REFRESH_ENABLED', '1') != '0'
+SHEETS_REFRESH_INTERVAL = int(os.getenv('SHEETS_REFRESH_INTERVAL', '600'))  # 10분마다 시트 갱신
+SHEETS_CLIENT_POOL_SIZE = int(os.getenv('SHEETS_CLIENT_POOL_SIZE', '4'))  # 동시에 사용할 수 있는 Sheets 클라이언트 수
+
+# 재시작/재배포 후에도 남아야 하는 데이터 디렉터리 (Render에서는 Persistent Disk 마운트 경로로 설정)
+DATA_DIR = os.getenv('DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+# 웜 스타트 스냅샷 파일 (재시작 직후 디스크에서 바로 응답, 갱신 리더 잠금 파일도 같은 디렉터리에 생성)
+# 배포마다 비워지는 임시 디렉터리가 아닌 DATA_DIR에 저장
+SNAPSHOT_PATH = os.getenv('SNAPSHOT_PATH', os.path.join(DATA_DIR, 'property_snapshot.json.gz'))
+# 갱신은 잠금 파일을 얻은 워커 하나만 실행하고, 나머지 워커는 이 주기로 디스크 스냅샷 변경을 확인해 다시 읽음
+SNAPSHOT_POLL_INTERVAL = float(os.getenv('SNAPSHOT_POLL_INTERVAL', '5'))
+
+# 정적 지도 이미지 디스크 캐시 (같은 마커/중심/줌/크기는 한 번만 렌더링)
+STATIC_MAP_CACHE_DIR = os.getenv('STATIC_MAP_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'static_map_cache'))
+STATIC_MAP_CACHE_MAX_BYTES = int(os.getenv('STATIC_MAP_CACHE_MAX_BYTES', str(50 * 1024 * 1024)))  # 50MB
+GEOCODE_FAILURE_TTL = int(os.getenv('GEOCODE_FAILURE_TTL', '3600'))  # 스케줄러가 지오코딩에 실패한 주소는 1시간 동안 재시도하지 않음
+
+# 로컬 지도 합성 (NCP 정적 지도 실패/한도 초과 시 대체)
+NCP_STATIC_MAP_COOLDOWN = int(os.getenv('NCP_STATIC_MAP_COOLDOWN', '300'))  # 실패 후 5분간 NCP 호출 생략
+# 베이스 타일 서버 URL 템플릿 (예: https://tiles.example.com/{z}/{x}/{y}.png) - 기본값 없음
+# 공개 OSM 타일 서버는 서비스 백엔드의 대량 사용을 허용하지 않으므로, 자체/계약 타일 서버를 설정해야 합니다.
+# 설정하지 않으면 배경색 위에 마커만 그립니다.
+LOCAL_MAP_TILE_URL = os.getenv('LOCAL_MAP_TILE_URL', '')
+LOCAL_MAP_TILE_ATTRIBUTION = os.getenv('LOCAL_MAP_TILE_ATTRIBUTION', '')  # 타일 제공자가 요구하는 저작권 표기 (예: © OpenStreetMap contributors)
+LOCAL_MAP_TILE_USER_AGENT = os.getenv('LOCAL_MAP_TILE_USER_AGENT', 'property-map-renderer/1.0')
+LOCAL_MAP_TILE_CACHE_DIR = os.getenv('LOCAL_MAP_TILE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'map_tile_cache'))
+LOCAL_MAP_TILE_CACHE_MAX_BYTES = int(os.getenv('LOCAL_MAP_TILE_CACHE_MAX_BYTES', str(100 * 1024 * 1024)))  # 100MB
+LOCAL_RENDER_PROCESSES = int(os.getenv('LOCAL_RENDER_PROCESSES', '1'))  # 0이면 요청 스레드에서 직접 합성
+
+# 요청 프로파일링 (profiling.py) - 기본 비활성화
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', '0'))  # 예: 0.01이면 요청 1%를 프로파일링
+PROFILE_TOKEN = os.getenv('PROFILE_TOKEN', '')  # 설정 시 X-Profile 헤더에 이 값을 담은 요청도 프로파일링
+PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', '0.005'))  # 스택 샘플링 간격 (초)
+PROFILE_DIR = os.getenv('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'profiles'))
+PROFILE_FLUSH_INTERVAL = float(os.getenv('PROFILE_FLUSH_INTERVAL', '30'))  # 프로파일 파일 저장 주기 (초)
+
+def estimate_size(obj, _seen=None):
+    """객체가 차지하는 대략적인 메모리 크기 (바이트, 컨테이너는 내부 항목까지 포함)"""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += estimate_size(key, _seen) + estimate_size(value, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += estimate_size(item, _seen)
+    return size
+
 class PerformanceManager:
     """성능 관리자 - 메모리 및 CPU 사용량 최적화"""
     
     def __init__(self):
         self.cache_size = 0
         self.last_cleanup = time.time()
-        self.start_memory_monitor()
+        self.evictions = 0
+        self._caches = {}
+        self._budget_lock = threading.Lock()
+        # 모니터 스레드는 import 시점이 아니라 서버 시작 시(워커 fork 후) start_memory_monitor()로 시작
+        self._monitor_pid = None
+    
+    def register_cache(self, name, cache):
+        """
+        캐시 등록 - 전체 캐시 용량 합계로 예산(MAX_CACHE_SIZE)을 관리
+        cache는 byte_size(), oldest_access(), evict_oldest() 메서드를 제공해야 함
+        (oldest_access()가 None이면 제거할 수 있는 항목이 없는 캐시)
+        """
+        self._caches[name] = cache
+    
+    def cache_sizes(self):
+        """등록된 캐시별 대략적인 크기 (바이트)"""
+        return {name: cache.byte_size() for name, cache in list(self._caches.items())}
+    
+    def enforce_budget(self):
+        """전체 캐시 크기가 예산을 넘으면 모든 캐시 중 가장 오래 사용하지 않은 항목부터 제거"""
+        with self._budget_lock:
+            total = sum(self.cache_sizes().values())
+            while total > MAX_CACHE_SIZE:
+                candidates = [
+                    (cache.oldest_access(), cache) for cache in list(self._caches.values())
+                ]
+                candidates = [(accessed, cache) for accessed, cache in candidates if accessed is not None]
+                if not candidates:
+                    break  # 제거할 수 있는 항목 없음 (스냅샷 등 고정 데이터만 남음)
+                _, cache = min(candidates, key=lambda c: c[0])
+                freed = cache.evict_oldest()
+                self.evictions += 1
+                total -= freed
+            self.cache_size = total
+        return total
     
     def start_memory_monitor(self):
-        """메모리 모니터링 백그라운드 스레드 시작"""
+        """
+        캐시 예산 확인 백그라운드 스레드 시작 (GC는 gc_policy의 임계값에 맡기고 강제 실행하지 않음)
+        프로세스마다 한 번만 시작 (fork된 워커에는 부모의 스레드가 없으므로 워커에서 다시 호출)
+        """
+        if self._monitor_pid == os.getpid():
+            return
+        self._monitor_pid = os.getpid()
+
         def memory_monitor():
             while True:
                 try:
-                    # 메모리 정리
-                    if time.time() - self.last_cleanup > CACHE_CLEANUP_INTERVAL:
-                        self.cleanup_memory()
-                        self.last_cleanup = time.time()
-                    
-                    # 가비지 컬렉션
-                    gc.collect()
-                    
                     # 대기
-                    time.sleep(GC_COLLECT_INTERVAL)
+                    time.sleep(CACHE_CLEANUP_INTERVAL)
+                    
+                    # 메모리 정리
+                    self.cleanup_memory()
+                    self.last_cleanup = time.time()
                     
                 except Exception as e:
                     # 프로덕션에서는 오류 로깅 최소화
@@ -50,22 +146,16 @@ class PerformanceManager:
                         print(f"메모리 모니터 오류: {e}")
                     time.sleep(60)  # 오류 시 1분 대기
         
-        thread = threading.Thread(target=memory_monitor, daemon=True)
+        thread = threading.Thread(target=memory_monitor, name='memory-monitor', daemon=True)
         thread.start()
     
     def cleanup_memory(self):
         """메모리 정리"""
         try:
-            # 가비지 컬렉션 강제 실행
-            collected = gc.collect()
-            if not os.getenv('RENDER'):
-                print(f"메모리 정리 완료: {collected}개 객체 정리")
-            
             # 캐시 크기 확인 및 필요시 정리
-            if self.cache_size > MAX_CACHE_SIZE:
-                if not os.getenv('RENDER'):
-                    print("캐시 크기 초과, 정리 중...")
-                # 캐시 정리 로직은 각 모듈에서 구현
+            total = self.enforce_budget()
+            if not os.getenv('RENDER'):
+                print(f"캐시 크기: {total / 1024 / 1024:.1f}MB (예산 {MAX_CACHE_SIZE / 1024 / 1024:.0f}MB)")
                 
         except Exception as e:
             if not os.getenv('RENDER'):
@@ -99,8 +189,9 @@ def optimize_for_render():
     # 버퍼링 비활성화 (메모리 절약)
     os.environ['PYTHONUNBUFFERED'] = '1'
     
-    # 가비지 컬렉션 임계값 조정 (더 자주 실행)
-    gc.set_threshold(700, 10, 10)
+    # 가비지 컬렉션 임계값 조정 및 일시정지 시간 측정
+    from gc_policy import apply_gc_policy
+    apply_gc_policy()
 
 def get_memory_usage():
     """현재 메모리 사용량 반환 (MB)"""
@@ -119,6 +210,11 @@ def log_performance_stats():
     try:
         memory_mb = get_memory_usage()
         print(f"메모리 사용량: {memory_mb:.1f}MB")
-        print(f"캐시 크기: {performance_manager.cache_size / 1024 / 1024:.1f}MB")
+        sizes = performance_manager.cache_sizes()
+        print(f"캐시 크기: {sum(sizes.values()) / 1024 / 1024:.1f}MB")
+        for name, size in sizes.items():
+            print(f"  - {name}: {size / 1024 / 1024:.2f}MB")
+        print(f"GC 임계값: {gc.get_threshold()}, 실행 횟수: {[s['collections'] for s in gc.get_stats()]}, "
+              f"고정 객체: {gc.get_freeze_count()}개")
     except Exception as e:
         print(f"성능 통계 로깅 오류: {e}") 
\ No newline at end of file
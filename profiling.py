@@ -0,0 +1,218 @@
+"""
+요청 단위 프로파일링 (선택 사항, 기본 비활성화)
+PROFILE_SAMPLE_RATE 비율의 요청, 또는 X-Profile 헤더에 PROFILE_TOKEN을 담은 요청만 프로파일링합니다.
+
+- 단계별 시간: 캐시 조회, Sheets 호출, 파싱, 직렬화, gzip 압축 (profile_stage로 표시한 구간)
+  응답의 Server-Timing 헤더와 PROFILE_DIR/profile-<pid>-stages.json 에 기록
+- 스택 샘플링: 별도 스레드가 sys._current_frames()로 프로파일 중인 요청 스레드의 스택을 주기적으로 수집하여
+  PROFILE_DIR/profile-<pid>.folded 에 "라우트;단계;프레임;... 횟수" 형식으로 누적
+  (flamegraph.pl, speedscope 등으로 바로 렌더링 가능)
+- 파일은 요청 처리 경로가 아닌 백그라운드 스레드에서 PROFILE_FLUSH_INTERVAL마다, 그리고 종료 시 저장
+"""
+
+import atexit
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from performance_config import (PROFILE_DIR, PROFILE_FLUSH_INTERVAL, PROFILE_SAMPLE_INTERVAL,
+                                PROFILE_SAMPLE_RATE, PROFILE_TOKEN)
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile'
+MAX_STACK_DEPTH = 64
+MAX_FOLDED_STACKS = 20000  # 서로 다른 스택 수 상한 (넘으면 새 스택은 "라우트;단계;[기타]"로 합산)
+
+_active = {}  # 요청 스레드 id -> RequestProfile
+_folded = Counter()  # 접힌 스택 -> 샘플 수
+_stage_totals = {}  # 라우트 -> {단계: [횟수, 누적 시간]}
+_lock = threading.Lock()
+_write_lock = threading.Lock()  # 파일 저장은 한 번에 하나만
+_wake = threading.Event()
+_sampler = None
+_flusher = None
+_dirty = False  # 마지막 저장 이후 새로 누적된 값이 있는지
+
+
+class RequestProfile:
+    """프로파일 중인 요청 하나의 단계별 시간"""
+
+    def __init__(self, route):
+        self.route = route
+        self.stages = []  # 현재 진행 중인 단계 (중첩 가능)
+        self.timings = []  # [(단계, 소요 시간), ...]
+
+
+def is_enabled():
+    return PROFILE_SAMPLE_RATE > 0 or bool(PROFILE_TOKEN)
+
+
+@contextmanager
+def profile_stage(name):
+    """프로파일 중인 요청 스레드에서만 구간 시간을 기록 (그 외에는 아무 일도 하지 않음)"""
+    profile = _active.get(threading.get_ident())
+    if profile is None:
+        yield
+        return
+    profile.stages.append(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.timings.append((name, time.perf_counter() - started))
+        profile.stages.pop()
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _sample_loop():
+    global _dirty
+    me = threading.get_ident()
+    while True:
+        if not _active:
+            _wake.clear()
+            _wake.wait()
+        time.sleep(PROFILE_SAMPLE_INTERVAL)
+        frames = sys._current_frames()
+        samples = []
+        for thread_id, profile in list(_active.items()):
+            frame = frames.get(thread_id)
+            if frame is None or thread_id == me:
+                continue
+            stack = []
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            stack.reverse()
+            prefix = [profile.route] + (profile.stages[-1:] or ['-'])
+            samples.append((';'.join(prefix), ';'.join(prefix + stack)))
+        if samples:
+            with _lock:
+                for prefix, stack in samples:
+                    if stack not in _folded and len(_folded) >= MAX_FOLDED_STACKS:
+                        stack = f"{prefix};[기타]"
+                    _folded[stack] += 1
+                _dirty = True
+
+
+def _flush_loop():
+    while True:
+        time.sleep(PROFILE_FLUSH_INTERVAL)
+        write_profiles(only_if_changed=True)
+
+
+def _ensure_sampler():
+    global _sampler, _flusher
+    if _sampler is None:
+        with _lock:
+            if _sampler is None:
+                _sampler = threading.Thread(target=_sample_loop, name='profile-sampler', daemon=True)
+                _sampler.start()
+                _flusher = threading.Thread(target=_flush_loop, name='profile-flush', daemon=True)
+                _flusher.start()
+
+
+def start_profile(route):
+    """현재 스레드의 요청 프로파일링 시작"""
+    profile = RequestProfile(route)
+    _active[threading.get_ident()] = profile
+    _ensure_sampler()
+    _wake.set()
+    return profile
+
+
+def finish_profile():
+    """현재 스레드의 요청 프로파일링 종료 후 단계별 시간을 누적 (프로파일 중이 아니면 None)"""
+    global _dirty
+    profile = _active.pop(threading.get_ident(), None)
+    if profile is None:
+        return None
+    with _lock:
+        _dirty = True
+        totals = _stage_totals.setdefault(profile.route, {})
+        for name, duration in profile.timings:
+            entry = totals.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += duration
+    return profile
+
+
+def _write_atomic(path, text):
+    # 같은 폴더의 고유한 임시 파일에 쓴 뒤 교체 (읽는 쪽은 항상 완성된 파일만 봄)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_profiles(directory=PROFILE_DIR, only_if_changed=False):
+    """누적된 스택 샘플과 단계별 시간을 파일로 저장 (워커 프로세스별 파일)"""
+    global _dirty
+    with _lock:
+        if only_if_changed and not _dirty:
+            return
+        _dirty = False
+        folded = '\n'.join(f"{stack} {count}" for stack, count in _folded.items())
+        stages = {
+            route: {name: {'count': count, 'total_ms': round(total * 1000, 3)}
+                    for name, (count, total) in totals.items()}
+            for route, totals in _stage_totals.items()
+        }
+    try:
+        os.makedirs(directory, exist_ok=True)
+        pid = os.getpid()
+        with _write_lock:
+            _write_atomic(os.path.join(directory, f"profile-{pid}.folded"), folded + '\n')
+            _write_atomic(os.path.join(directory, f"profile-{pid}-stages.json"),
+                          json.dumps(stages, ensure_ascii=False, indent=2))
+    except OSError as e:
+        logger.warning(f"프로파일 저장 실패: {str(e)}")
+
+
+def init_profiling(app):
+    """Flask 앱에 프로파일링 훅 등록 (설정이 없으면 아무것도 등록하지 않음)"""
+    if not is_enabled():
+        return
+
+    from flask import request
+
+    # 마지막 저장 이후 누적된 값은 종료 시 저장
+    atexit.register(write_profiles, only_if_changed=True)
+
+    @app.before_request
+    def maybe_start_profile():
+        requested = PROFILE_TOKEN and request.headers.get(PROFILE_HEADER) == PROFILE_TOKEN
+        if requested or random.random() < PROFILE_SAMPLE_RATE:
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            start_profile(route)
+
+    @app.after_request
+    def finish_request_profile(response):
+        profile = finish_profile()
+        if profile is not None:
+            response.headers['Server-Timing'] = ', '.join(
+                f"{name};dur={duration * 1000:.2f}" for name, duration in profile.timings)
+        return response
+
+    @app.teardown_request
+    def discard_profile(exc):
+        # 처리되지 않은 예외로 after_request가 호출되지 않은 경우 정리
+        _active.pop(threading.get_ident(), None)
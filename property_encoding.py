@@ -0,0 +1,120 @@
+"""
+매물 API 응답 형식
+기본 형식은 매물 딕셔너리 배열이고, 요청 시 열(column) 단위의 압축 형식(columnar)으로 응답합니다.
+
+columnar 형식:
+    {
+        "format": "columnar",
+        "count": 매물 수,
+        "sheet_type": "강남월세",                  # 모든 매물이 같은 시트면 한 번만
+        "link_prefix": "https://...articleNo=",   # hyperlink는 link_prefix + id 로 클라이언트에서 생성
+        "strings": ["서울 강남구 ...", "공클", ...], # 반복되는 문자열 사전
+        "columns": {
+            "id": [...], "deposit": [...], "monthly_rent": [...],  # 값 그대로
+            "reg_date": [...], "location": [...], "status": [...]   # strings 사전의 인덱스
+        }
+    }
+시트 이름이나 링크가 위 규칙과 다른 매물이 섞여 있으면 sheet_type / hyperlink 열을 함께 보냅니다.
+
+요약 보기(view=summary)는 지도 마커에 필요한 id, 주소, 상태, 가격과 스냅샷의 좌표(lat, lng)만 보내며
+나머지 필드는 /api/properties/<sheet_type>/<id> (여러 개는 /details?ids=) 로 필요할 때 조회합니다.
+columnar 형식에서 좌표는 주소마다 한 번만 "coordinates": [[주소의 strings 인덱스, lat, lng], ...] 로 보냅니다.
+
+본문은 encode_json()으로 직렬화합니다. 한글을 유니코드 이스케이프(\\uXXXX)하지 않고 UTF-8 그대로 보내므로
+주소/상태 문자열이 대부분인 응답이 훨씬 작아집니다.
+"""
+
+import json
+
+from config import PROPERTY_LINK_PREFIX
+
+COLUMNAR_FORMAT = 'columnar'
+COLUMNAR_MEDIA_TYPE = 'application/vnd.properties.columnar+json'
+
+SUMMARY_VIEW = 'summary'
+
+FULL_FIELDS = ('id', 'reg_date', 'location', 'status', 'deposit', 'monthly_rent')
+SUMMARY_FIELDS = ('id', 'location', 'status', 'deposit', 'monthly_rent')
+SUMMARY_COLUMNS = SUMMARY_FIELDS + ('lat', 'lng')
+DICTIONARY_COLUMNS = ('reg_date', 'location', 'status')  # 반복이 많아 strings 사전 인덱스로 보내는 열
+
+
+def encode_json(payload):
+    """응답 본문 JSON 바이트 (UTF-8 그대로, 공백 없음) - 서버 응답과 bench_ingest.py가 같은 함수 사용"""
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def requested_format(request):
+    """?format=columnar 또는 Accept 헤더로 요청한 응답 형식 (기본 'rows')"""
+    if request.args.get('format') == COLUMNAR_FORMAT:
+        return COLUMNAR_FORMAT
+    if COLUMNAR_MEDIA_TYPE in request.headers.get('Accept', ''):
+        return COLUMNAR_FORMAT
+    return 'rows'
+
+
+def requested_view(request):
+    """?view=summary 로 요청한 보기 (기본 'full')"""
+    return SUMMARY_VIEW if request.args.get('view') == SUMMARY_VIEW else 'full'
+
+
+def summarize(properties, sheet_type, geocode):
+    """
+    지도 마커용 요약 목록 (geocode: 주소 → {'lat', 'lng', ...} 또는 None 을 반환하는 함수)
+    좌표를 모르는 주소는 lat/lng가 None이며 클라이언트가 따로 지오코딩합니다.
+    """
+    summaries = []
+    for p in properties:
+        summary = {name: p.get(name, '') for name in SUMMARY_FIELDS}
+        coordinates = geocode(summary['location'])
+        summary['lat'] = coordinates['lat'] if coordinates else None
+        summary['lng'] = coordinates['lng'] if coordinates else None
+        summary['sheet_type'] = p.get('sheet_type', sheet_type)
+        summaries.append(summary)
+    return summaries
+
+
+def to_columnar(properties, fields=FULL_FIELDS):
+    """매물(또는 요약) 딕셔너리 목록 → columnar 형식 딕셔너리"""
+    strings = []
+    string_ids = {}
+
+    def intern(value):
+        index = string_ids.get(value)
+        if index is None:
+            index = string_ids[value] = len(strings)
+            strings.append(value)
+        return index
+
+    columns = {}
+    for name in fields:
+        if name in ('lat', 'lng'):
+            continue  # 아래에서 주소별로 한 번만
+        if name in DICTIONARY_COLUMNS:
+            columns[name] = [intern(p.get(name, '')) for p in properties]
+        else:
+            columns[name] = [p.get(name, '') for p in properties]
+
+    result = {'format': COLUMNAR_FORMAT, 'count': len(properties), 'link_prefix': PROPERTY_LINK_PREFIX}
+
+    sheet_types = {p.get('sheet_type', '') for p in properties}
+    if len(sheet_types) == 1:
+        result['sheet_type'] = sheet_types.pop()
+    else:
+        columns['sheet_type'] = [intern(p.get('sheet_type', '')) for p in properties]
+
+    # 요약에는 hyperlink 필드가 없으므로 항상 link_prefix + id 로 생성
+    if any('hyperlink' in p and p['hyperlink'] != f"{PROPERTY_LINK_PREFIX}{p.get('id', '')}" for p in properties):
+        columns['hyperlink'] = [p.get('hyperlink', '') for p in properties]
+
+    if 'lat' in fields:
+        coordinates = {}
+        for p in properties:
+            location_id = intern(p.get('location', ''))
+            if location_id not in coordinates and p.get('lat') is not None:
+                coordinates[location_id] = [location_id, p['lat'], p['lng']]
+        result['coordinates'] = list(coordinates.values())
+
+    result['strings'] = strings
+    result['columns'] = columns
+    return result
@@ -0,0 +1,441 @@
+"""
+백그라운드 갱신 스케줄러
+시트 데이터와 지오코딩 결과를 주기적으로 갱신해 스냅샷으로 발행합니다.
+요청 처리 경로에서는 발행된 스냅샷만 읽으므로 Google Sheets / NCP 호출을 기다리지 않습니다.
+
+gunicorn 워커가 여러 개여도 갱신은 스냅샷 잠금 파일(flock)을 얻은 워커 하나(리더)만 실행하고,
+나머지 워커는 리더가 디스크에 저장한 스냅샷이 바뀌면 다시 읽어 발행합니다.
+리더 워커가 종료되면 잠금이 풀리므로 다른 워커가 이어받습니다.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows - 프로세스마다 각자 갱신
+    fcntl = None
+
+from config import SHEET_RANGES
+from memory_cache import PinnedSize
+from ncp_maps_async import geocode_addresses
+from performance_config import (
+    GEOCODE_FAILURE_TTL,
+    SHEETS_CLIENT_POOL_SIZE,
+    SHEETS_REFRESH_ENABLED,
+    SHEETS_REFRESH_INTERVAL,
+    SNAPSHOT_PATH,
+    SNAPSHOT_POLL_INTERVAL,
+    estimate_size,
+)
+from sheets_service import fetch_property_data, sheets_pool
+
+logger = logging.getLogger(__name__)
+
+
+def _content_version(data):
+    """데이터 내용 기반 버전 문자열 (내용이 같으면 버전도 같음)"""
+    encoded = json.dumps(data, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()[:12]
+
+
+def _locations_to_geocode(properties, geocodes, failed_geocodes, now=None):
+    """좌표가 없고 최근(GEOCODE_FAILURE_TTL 이내) 실패 기록도 없는 주소 집합"""
+    now = time.time() if now is None else now
+    return {
+        prop['location'] for rows in properties.values() for prop in rows
+        if prop['location'] not in geocodes
+        and now - failed_geocodes.get(prop['location'], 0) >= GEOCODE_FAILURE_TTL
+    }
+
+
+class PropertySnapshot:
+    """한 번 발행된 뒤에는 변경되지 않는 매물/지오코딩 스냅샷"""
+
+    def __init__(self, properties, geocodes, created_at=None, failed_geocodes=None):
+        self.properties = properties  # {sheet_type: [매물, ...]}
+        self.geocodes = geocodes  # {주소: {'lat', 'lng', 'formatted_address'}}
+        # {주소: 마지막 지오코딩 실패 시각} - 재시작해도 실패한 주소 때문에 곧바로 전체 갱신하지 않도록 함께 저장
+        self.failed_geocodes = failed_geocodes or {}
+        self.created_at = created_at if created_at is not None else time.time()
+        self.sheet_versions = {
+            sheet_type: _content_version(rows) for sheet_type, rows in properties.items()
+        }
+        self.version = _content_version(self.sheet_versions)
+        # 시트별로 매물 주소에 해당하는 좌표만 모은 버전 (좌표가 들어가는 요약/지도 캐시 키에 사용)
+        self.geocode_versions = {
+            sheet_type: _content_version({
+                prop['location']: geocodes.get(prop['location']) or geocodes.get(prop['location'].strip())
+                for prop in rows if prop.get('location')
+            })
+            for sheet_type, rows in properties.items()
+        }
+        # 매물 상세 조회용 id 색인 {sheet_type: {id: 매물}} (매물 객체는 properties와 공유)
+        self.by_id = {
+            sheet_type: {prop['id']: prop for prop in rows} for sheet_type, rows in properties.items()
+        }
+        # 불변 데이터이므로 크기는 생성 시 한 번만 계산 (색인은 딕셔너리 자체 크기만)
+        self.byte_size = (estimate_size(properties) + estimate_size(geocodes)
+                          + sum(sys.getsizeof(index) for index in self.by_id.values()))
+
+    def map_version(self, sheet_type):
+        """매물과 그 좌표가 모두 같을 때만 같은 버전 (좌표를 포함하는 응답의 캐시 키/ETag용)"""
+        return f"{self.sheet_versions[sheet_type]}-{self.geocode_versions[sheet_type]}"
+
+    def find(self, sheet_type, property_ids):
+        """id 목록 순서대로 찾은 매물 목록 (없는 id는 제외)"""
+        index = self.by_id.get(sheet_type, {})
+        return [index[property_id] for property_id in property_ids if property_id in index]
+
+    def age(self):
+        """스냅샷 생성 후 경과 시간 (초)"""
+        return time.time() - self.created_at
+
+    def to_dict(self):
+        return {
+            'created_at': self.created_at,
+            'properties': self.properties,
+            'geocodes': self.geocodes,
+            'failed_geocodes': self.failed_geocodes,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['properties'], data['geocodes'], data.get('created_at'), data.get('failed_geocodes'))
+
+
+# 현재 발행된 스냅샷 - 참조 교체만으로 원자적으로 발행
+_snapshot = None
+_publish_lock = threading.Lock()
+# 스냅샷은 제거할 수 없으므로 캐시 예산 합계에만 반영
+_snapshot_size = PinnedSize('snapshot')
+
+
+def get_snapshot():
+    """현재 발행된 스냅샷 반환 (없으면 None)"""
+    return _snapshot
+
+
+def publish_snapshot(snapshot):
+    """새 스냅샷을 원자적으로 발행"""
+    global _snapshot
+    with _publish_lock:
+        _snapshot = snapshot
+    _snapshot_size.update(snapshot.byte_size if snapshot is not None else 0)
+
+
+def save_snapshot(snapshot, path=SNAPSHOT_PATH):
+    """스냅샷을 압축 JSON 파일로 저장 (임시 파일 기록 후 교체하여 원자적으로 저장)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        payload = json.dumps(snapshot.to_dict(), ensure_ascii=False, separators=(',', ':'))
+        with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+            f.write(payload.encode('utf-8'))
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        logger.warning(f"스냅샷 저장 실패: {str(e)}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """디스크에 저장된 스냅샷을 읽어 반환 (없거나 손상되었으면 None)"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with gzip.open(path, 'rb') as f:
+            return PropertySnapshot.from_dict(json.loads(f.read().decode('utf-8')))
+    except Exception as e:
+        logger.warning(f"스냅샷 로드 실패 (무시하고 새로 가져옵니다): {str(e)}")
+        return None
+
+
+def load_warm_snapshot(path=SNAPSHOT_PATH):
+    """발행된 스냅샷이 없으면 디스크 스냅샷을 발행하여 재시작 직후부터 바로 응답"""
+    if get_snapshot() is not None:
+        return get_snapshot()
+    snapshot = load_snapshot(path)
+    if snapshot is not None:
+        publish_snapshot(snapshot)
+        if not os.environ.get("RENDER"):
+            logger.info(f"웜 스타트 스냅샷 로드 완료 (버전 {snapshot.version}, {snapshot.age():.0f}초 전 생성)")
+    return snapshot
+
+
+def get_snapshot_properties(sheet_type):
+    """스냅샷에 있는 시트 매물 목록 반환 (아직 없으면 None)"""
+    snapshot = _snapshot
+    if snapshot is None:
+        return None
+    return snapshot.properties.get(sheet_type)
+
+
+def get_snapshot_geocode(address):
+    """스냅샷에 있는 지오코딩 결과 반환 (없으면 None)"""
+    snapshot = _snapshot
+    if snapshot is None or not address:
+        return None
+    return snapshot.geocodes.get(address.strip())
+
+
+class RefreshScheduler:
+    """SHEET_RANGES 전체를 주기적으로 갱신하는 백그라운드 스케줄러"""
+
+    def __init__(self, interval=SHEETS_REFRESH_INTERVAL, sheet_types=None, snapshot_path=SNAPSHOT_PATH):
+        self.interval = interval
+        self.sheet_types = list(sheet_types or SHEET_RANGES)
+        self.snapshot_path = snapshot_path
+        self.last_run = None
+        self.run_count = 0
+        self.is_leader = False
+        self._wake = threading.Event()
+        self._run_lock = threading.Lock()
+        self._thread = None
+        self._lock_file = None
+        self._loaded_mtime = None
+        self._trigger_seen = None
+
+    @property
+    def _lock_path(self):
+        return f"{self.snapshot_path}.lock"
+
+    @property
+    def _trigger_path(self):
+        return f"{self.snapshot_path}.refresh"
+
+    def start(self):
+        """스케줄러 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._loop, name='sheets-refresh', daemon=True)
+        self._thread.start()
+
+    def trigger(self):
+        """다음 주기를 기다리지 않고 즉시 갱신 요청 (리더가 다른 워커면 트리거 파일로 알림)"""
+        if self.is_leader:
+            self._wake.set()
+            return
+        try:
+            with open(self._trigger_path, 'a'):
+                pass
+            os.utime(self._trigger_path)
+        except OSError as e:
+            logger.warning(f"갱신 요청 파일 기록 실패: {str(e)}")
+
+    def _try_become_leader(self):
+        """스냅샷 잠금 파일을 잠그는 데 성공한 프로세스만 리더가 됨 (잠금은 프로세스가 끝날 때까지 유지)"""
+        if self.is_leader:
+            return True
+        if fcntl is not None:
+            os.makedirs(os.path.dirname(self._lock_path) or '.', exist_ok=True)
+            lock_file = open(self._lock_path, 'a')
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return False
+            self._lock_file = lock_file
+        self.is_leader = True
+        if not os.environ.get("RENDER"):
+            logger.info(f"백그라운드 갱신 리더로 실행 (pid: {os.getpid()})")
+        return True
+
+    def _trigger_mtime(self):
+        try:
+            return os.stat(self._trigger_path).st_mtime_ns
+        except OSError:
+            return 0
+
+    def _follow(self):
+        """리더가 디스크에 저장한 스냅샷이 바뀌었으면 다시 읽어 발행"""
+        try:
+            mtime = os.stat(self.snapshot_path).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._loaded_mtime:
+            return
+        snapshot = load_snapshot(self.snapshot_path)
+        if snapshot is None:
+            return
+        self._loaded_mtime = mtime
+        current = get_snapshot()
+        if current is None or current.created_at != snapshot.created_at:
+            publish_snapshot(snapshot)
+
+    def _wait(self, timeout):
+        """timeout 동안 대기 (trigger() 또는 다른 워커의 갱신 요청 파일이 바뀌면 바로 반환)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if self._wake.wait(min(remaining, SNAPSHOT_POLL_INTERVAL)):
+                self._wake.clear()
+                return
+            trigger_mtime = self._trigger_mtime()
+            if trigger_mtime != self._trigger_seen:
+                self._trigger_seen = trigger_mtime
+                return
+
+    def _loop(self):
+        # 리더가 될 때까지는 리더가 저장한 스냅샷만 따라 읽음
+        while not self._try_become_leader():
+            try:
+                self._follow()
+            except Exception as e:
+                logger.error(f"스냅샷 다시 읽기 오류: {str(e)}")
+            self._wake.wait(SNAPSHOT_POLL_INTERVAL)
+            self._wake.clear()
+
+        # 이전 리더가 마지막으로 저장한 스냅샷부터 이어서 갱신
+        self._follow()
+        self._trigger_seen = self._trigger_mtime()
+        # 스냅샷이 충분히 최신이고 지오코딩할 주소도 없으면 첫 갱신을 남은 주기만큼 미룸
+        snapshot = get_snapshot()
+        if snapshot is not None and snapshot.age() < self.interval and not self._missing_geocodes(snapshot):
+            self._wait(self.interval - snapshot.age())
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"백그라운드 갱신 오류: {str(e)}")
+            self._wait(self.interval)
+
+    @staticmethod
+    def _missing_geocodes(snapshot):
+        return bool(_locations_to_geocode(snapshot.properties, snapshot.geocodes, snapshot.failed_geocodes))
+
+    @staticmethod
+    def _fetch_sheet(sheet_type):
+        """시트 하나를 가져와 (매물 목록, 오류 메시지, 소요 시간) 반환"""
+        started = time.perf_counter()
+        try:
+            rows, error = fetch_property_data(sheet_type), None
+        except Exception as e:
+            rows, error = None, str(e)
+        return rows, error, round(time.perf_counter() - started, 3)
+
+    def run_once(self, geocode=True):
+        """
+        모든 시트를 한 번 갱신하고 새 스냅샷을 발행
+        geocode=False 이면 시트만 갱신 (부팅 시 빠른 워밍업용)
+        """
+        with self._run_lock:
+            started_at = time.time()
+            previous = get_snapshot()
+            properties = dict(previous.properties) if previous else {}
+            geocodes = dict(previous.geocodes) if previous else {}
+            failed_geocodes = dict(previous.failed_geocodes) if previous else {}
+
+            sheet_timings = {}
+            errors = {}
+            # 시트별 요청은 Sheets 클라이언트 풀 크기만큼 동시에 실행
+            workers = max(1, min(len(self.sheet_types), SHEETS_CLIENT_POOL_SIZE))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sheets-fetch') as executor:
+                results = [(sheet_type, executor.submit(self._fetch_sheet, sheet_type))
+                           for sheet_type in self.sheet_types]
+                for sheet_type, future in results:
+                    rows, error, seconds = future.result()
+                    if error is None:
+                        properties[sheet_type] = rows
+                    else:
+                        # 실패한 시트는 이전 스냅샷 데이터를 유지
+                        errors[sheet_type] = error
+                        logger.error(f"[{sheet_type}] 시트 갱신 실패: {error}")
+                    sheet_timings[sheet_type] = seconds
+
+            # 새로 등장한 주소만 지오코딩 (실패한 주소는 GEOCODE_FAILURE_TTL이 지난 뒤 재시도)
+            geocode_started = time.perf_counter()
+            now = time.time()
+            new_locations = sorted(_locations_to_geocode(properties, geocodes, failed_geocodes, now)) if geocode else []
+            resolved = geocode_addresses(new_locations) if new_locations else {}
+            geocodes.update(resolved)
+            for location in new_locations:
+                if location in resolved:
+                    failed_geocodes.pop(location, None)
+                else:
+                    failed_geocodes[location] = now
+            # 시트에서 사라진 주소의 실패 기록은 정리
+            locations = {prop['location'] for rows in properties.values() for prop in rows}
+            failed_geocodes = {
+                location: failed_at for location, failed_at in failed_geocodes.items() if location in locations
+            }
+            geocoded = len(resolved)
+            geocode_seconds = round(time.perf_counter() - geocode_started, 3)
+
+            snapshot = PropertySnapshot(properties, geocodes, failed_geocodes=failed_geocodes)
+            publish_snapshot(snapshot)
+            # 재시작 직후와 다른 워커가 바로 읽을 수 있도록 디스크에도 저장
+            if save_snapshot(snapshot, self.snapshot_path):
+                try:
+                    self._loaded_mtime = os.stat(self.snapshot_path).st_mtime_ns
+                except OSError:
+                    pass
+
+            self.run_count += 1
+            self.last_run = {
+                'started_at': started_at,
+                'duration': round(time.time() - started_at, 3),
+                'sheets': sheet_timings,
+                'geocode': {
+                    'duration': geocode_seconds,
+                    'requested': len(new_locations),
+                    'resolved': geocoded,
+                    'failed': len(failed_geocodes),
+                },
+                'errors': errors,
+                'version': snapshot.version,
+            }
+
+            if not os.environ.get("RENDER"):
+                total = sum(len(rows) for rows in properties.values())
+                logger.info(f"백그라운드 갱신 완료: {total}개 매물, 신규 지오코딩 {geocoded}/{len(new_locations)}개 ({self.last_run['duration']}초)")
+
+            return snapshot
+
+    def status(self):
+        """스케줄러 상태 및 마지막 실행 시간 정보"""
+        snapshot = get_snapshot()
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'role': 'leader' if self.is_leader else 'follower',
+            'pid': os.getpid(),
+            'interval': self.interval,
+            'run_count': self.run_count,
+            'last_run': self.last_run,
+            'snapshot': {
+                'version': snapshot.version,
+                'age': round(snapshot.age(), 1),
+                'sheets': {sheet_type: len(rows) for sheet_type, rows in snapshot.properties.items()},
+                'geocodes': len(snapshot.geocodes),
+                'failed_geocodes': len(snapshot.failed_geocodes),
+            } if snapshot else None,
+            'sheets_clients': sheets_pool.stats(),
+        }
+
+
+# 전역 스케줄러 인스턴스
+scheduler = RefreshScheduler()
+
+
+def start_scheduler():
+    """
+    디스크 스냅샷을 먼저 발행한 뒤 설정에 따라 백그라운드 갱신 스케줄러를 시작
+    워커마다 호출되지만 실제 갱신은 잠금을 얻은 워커 하나만 실행합니다.
+    """
+    load_warm_snapshot()
+    if SHEETS_REFRESH_ENABLED:
+        scheduler.start()
+    return scheduler
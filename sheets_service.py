@@ -3,13 +3,16 @@ import logging
 import re
 import os
 import base64
+import threading
 import time
+from contextlib import contextmanager
 from functools import lru_cache, wraps
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from google.auth.transport.requests import Request
-from config import SPREADSHEET_ID, SHEET_RANGES
+from config import SPREADSHEET_ID, SHEET_RANGES, SHEETS_API_ENDPOINT, PROPERTY_LINK_PREFIX
 from google_auth_utils import load_google_credentials_from_env, load_dotenv_if_exists
+from memory_cache import SizedLRUCache
+from performance_config import SHEETS_CLIENT_POOL_SIZE
+from metrics import SINGLE_FLIGHT_COALESCED, SINGLE_FLIGHT_WAITERS, track_upstream
+from profiling import profile_stage
 
 # 성능 개선: 프로덕션에서는 WARNING 레벨로 설정
 logging.basicConfig(level=logging.WARNING if os.environ.get("RENDER") else logging.INFO)
@@ -20,59 +23,71 @@ _cache_timestamps = {}
 
 # 메모리 효율적인 캐시 관리
 _sheet_cache = {}
-_cache_lock = False
 
 def timed_cache(ttl_seconds):
-    """시간 기반 캐시 데코레이터 - 메모리 효율성 개선"""
+    """시간 기반 캐시 데코레이터 - 메모리 효율성 개선 (멀티스레드 안전)"""
     def decorator(func):
-        cache = {}
+        # 항목 수 대신 실제 크기로 관리 (전체 캐시 예산 초과 시 오래된 항목부터 제거)
+        cache = SizedLRUCache(f"timed_cache:{func.__name__}")
+        cache_lock = threading.Lock()
+        key_locks = {}  # 키 -> [잠금, 사용 중인 스레드 수] (가져오기가 끝나고 아무도 쓰지 않으면 삭제)
+        
+        def get_fresh(key):
+            entry = cache.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[1] < ttl_seconds:
+                return entry
+            # 만료된 항목은 바로 제거하여 캐시 예산을 차지하지 않게 함
+            cache.discard(key, entry)
+            return None
         
         @wraps(func)
         def wrapper(*args, **kwargs):
-            global _cache_lock
-            
             # 캐시 키 생성
             key = str(args) + str(sorted(kwargs.items()))
-            current_time = time.time()
             
             # 캐시된 데이터가 있고 TTL 내에 있으면 반환
-            if key in cache:
-                data, timestamp = cache[key]
-                if current_time - timestamp < ttl_seconds:
-                    # 성능 개선: 프로덕션에서는 캐시 히트 로깅 제거
-                    if not os.environ.get("RENDER"):
-                        logging.info(f"캐시에서 데이터 반환: {func.__name__} (남은 시간: {ttl_seconds - (current_time - timestamp):.1f}초)")
-                    return data
-                else:
-                    # TTL 만료된 캐시 삭제
-                    del cache[key]
+            entry = get_fresh(key)
+            if entry is not None:
+                # 성능 개선: 프로덕션에서는 캐시 히트 로깅 제거
+                if not os.environ.get("RENDER"):
+                    logging.info(f"캐시에서 데이터 반환: {func.__name__} (남은 시간: {ttl_seconds - (time.time() - entry[1]):.1f}초)")
+                return entry[0]
             
-            # 캐시 락 체크 (동시 요청 방지)
-            if _cache_lock:
-                time.sleep(0.5)  # 대기 시간 단축
-                # 대기 후 다시 캐시 확인
-                if key in cache:
-                    data, timestamp = cache[key]
-                    if current_time - timestamp < ttl_seconds:
-                        return data
+            # 동시 요청 방지: 같은 키는 한 스레드만 가져오고 나머지는 그 결과를 기다림
+            with cache_lock:
+                lock_entry = key_locks.setdefault(key, [threading.Lock(), 0])
+                lock_entry[1] += 1
+            key_lock = lock_entry[0]
             
-            # 새로 데이터 가져와서 캐시에 저장
-            _cache_lock = True
+            # 잠금을 바로 얻은 스레드(데이터를 가져오는 쪽)는 대기 수에서 제외
+            if not key_lock.acquire(blocking=False):
+                SINGLE_FLIGHT_WAITERS.inc(cache=func.__name__)
+                key_lock.acquire()
+                SINGLE_FLIGHT_WAITERS.dec(cache=func.__name__)
             try:
-                result = func(*args, **kwargs)
-                cache[key] = (result, current_time)
-                
-                # 메모리 관리: 캐시 크기 제한 (최대 5개 시트 데이터)
-                if len(cache) > 5:
-                    oldest_key = min(cache.keys(), key=lambda k: cache[k][1])
-                    del cache[oldest_key]
+                entry = get_fresh(key)
+                if entry is not None:
+                    SINGLE_FLIGHT_COALESCED.inc(cache=func.__name__)
+                    return entry[0]
                 
+                # 새로 데이터 가져와서 캐시에 저장
+                result = func(*args, **kwargs)
+                cache.set(key, (result, time.time()))
                 return result
             finally:
-                _cache_lock = False
+                key_lock.release()
+                with cache_lock:
+                    lock_entry[1] -= 1
+                    if lock_entry[1] == 0:
+                        del key_locks[key]
+        
+        def clear_cache():
+            cache.clear()
         
         # 캐시 클리어 함수 추가
-        wrapper.clear_cache = lambda: cache.clear()
+        wrapper.clear_cache = clear_cache
         return wrapper
     return decorator
 
@@ -109,17 +124,33 @@ def determine_status(r_value, s_value, t_value, sheet_type):
     # 상태 없음
     return None
 
-# 성능 개선: 서비스 객체 캐싱
-_sheets_service = None
+# Sheets 클라이언트 풀
+# googleapiclient 서비스 객체는 httplib2 전송 계층을 그대로 쓰므로 스레드 안전하지 않음
+# 인증 정보는 한 번만 로드하여 공유하고, 각 클라이언트는 자체 httplib2 keep-alive 연결을 가지며
+# checkout()으로 빌린 동안에는 한 스레드만 사용 → 서로 다른 시트를 동시에 가져올 수 있음
+_credentials = None
+_credentials_lock = threading.Lock()
+# 스크립트/디버그용 get_sheets_service()의 스레드별 클라이언트
+_thread_services = threading.local()
 
-def get_sheets_service():
-    """Google Sheets API 서비스 객체를 생성합니다."""
-    global _sheets_service
-    
-    # 이미 생성된 서비스가 있으면 재사용
-    if _sheets_service is not None:
-        return _sheets_service
-    
+def get_sheets_credentials():
+    """인증 정보를 한 번만 로드하여 모든 클라이언트가 공유합니다."""
+    global _credentials
+
+    if _credentials is not None:
+        return _credentials
+
+    with _credentials_lock:
+        if _credentials is None:
+            _credentials = _load_sheets_credentials()
+    return _credentials
+
+def _load_sheets_credentials():
+    """인증 정보를 로드합니다. (토큰은 첫 API 호출 시 자동으로 발급)"""
+    if SHEETS_API_ENDPOINT:
+        # 로컬 가짜 서버(fake_services.py)용 - 인증 없이 엔드포인트만 변경
+        from google.auth.credentials import AnonymousCredentials
+        return AnonymousCredentials()
     try:
         # GOOGLE_CREDENTIALS 환경 변수가 있는지 확인 (JSON 문자열)
         google_credentials = os.getenv('GOOGLE_CREDENTIALS')
@@ -171,108 +202,213 @@ def get_sheets_service():
                         raise ValueError(f"Invalid JSON in credentials file: {str(e)}")
         
         # 인증 정보로 credentials 생성
+        from google.oauth2 import service_account
         credentials = service_account.Credentials.from_service_account_info(
             credentials_info,
             scopes=['https://www.googleapis.com/auth/spreadsheets.readonly']
         )
         
-        # 즉시 토큰 새로고침 시도
-        request = Request()
-        try:
-            credentials.refresh(request)
-        except Exception as refresh_error:
-            pass  # 초기 새로고침 실패는 무시
-        
-        # 서비스 빌드 시 추가 옵션 설정
-        _sheets_service = build('sheets', 'v4', credentials=credentials, cache_discovery=False)
-        
-        return _sheets_service
+        return credentials
     except Exception as e:
-        logging.error(f"Failed to create sheets service: {str(e)}")
+        logging.error(f"Failed to load sheets credentials: {str(e)}")
         raise
 
-@timed_cache(CACHE_TTL)
-def get_property_data(sheet_type='강남월세'):
+def _build_sheets_service(credentials):
+    """공유 인증 정보와 새 HTTP 연결로 Sheets 서비스 객체를 빌드합니다."""
+    # Google API 라이브러리는 무거우므로 (약 0.1초) 서비스를 처음 만들 때 import
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient.discovery import build
+    from googleapiclient.http import build_http
+
+    # 클라이언트마다 별도의 httplib2.Http (연결 풀)를 사용하고 인증 정보만 공유
+    http = AuthorizedHttp(credentials, http=build_http())
+    client_options = {'api_endpoint': SHEETS_API_ENDPOINT} if SHEETS_API_ENDPOINT else None
+    return build('sheets', 'v4', http=http, cache_discovery=False, client_options=client_options)
+
+def _close_service(service):
     try:
-        service = get_sheets_service()
-        sheet = service.spreadsheets()
+        service.close()
+    except Exception as e:
+        logging.warning(f"Sheets 연결 정리 실패: {str(e)}")
+
+class SheetsClientPool:
+    """
+    Sheets 서비스 객체 풀 (스레드 안전)
+    필요할 때 최대 max_size개까지 만들고, 모두 사용 중이면 반납될 때까지 기다립니다.
+    """
 
-        range_name = SHEET_RANGES.get(sheet_type)
-        if not range_name:
-            logging.error(f"Invalid sheet type: {sheet_type}")
-            return []
+    def __init__(self, max_size=SHEETS_CLIENT_POOL_SIZE):
+        self.max_size = max(1, max_size)
+        self._idle = []  # 반납된 클라이언트 (마지막에 반납된 것부터 재사용 → 열린 연결 재사용)
+        self._created = 0
+        self._available = threading.Condition()
 
-        # 성능 개선: 배치 요청으로 데이터 가져오기
+    @contextmanager
+    def checkout(self):
+        """with sheets_pool.checkout() as service: ... (블록 안에서만 현재 스레드가 사용)"""
+        service = self._acquire()
+        healthy = False
         try:
-            result = sheet.values().get(
-                spreadsheetId=SPREADSHEET_ID,
-                range=range_name,
-                valueRenderOption='UNFORMATTED_VALUE'  # 성능 개선: 원시 값만 가져오기
-            ).execute()
-            
-            if result is None:
-                return []
-                
-        except Exception as api_error:
-            logging.error(f"Google Sheets API call failed: {str(api_error)}")
-            return []
+            yield service
+            healthy = True
+        except Exception as e:
+            # HTTP 오류 응답은 연결 상태와 무관하므로 재사용, 그 외(타임아웃 등)는 연결이 깨졌을 수 있어 폐기
+            from googleapiclient.errors import HttpError
+            healthy = isinstance(e, HttpError)
+            raise
+        finally:
+            self._release(service, healthy)
 
-        values = result.get('values', [])
-        
-        if not values:
-            return []
+    def _acquire(self):
+        with self._available:
+            while not self._idle and self._created >= self.max_size:
+                self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+        # 빌드는 잠금 밖에서 (인증 정보 로드 / discovery 문서 파싱)
+        try:
+            return _build_sheets_service(get_sheets_credentials())
+        except Exception:
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
 
-        properties = []
-        status_counts = {'갠매': 0, '온하': 0, '공클': 0}
-        excluded_count = 0
+    def _release(self, service, healthy):
+        with self._available:
+            if healthy:
+                self._idle.append(service)
+            else:
+                self._created -= 1
+            self._available.notify()
+        if not healthy:
+            _close_service(service)
 
-        # 성능 개선: 리스트 컴프리헨션과 필터링 최적화
-        for row in values:
-            try:
-                # 최소 필요 열 확인 (A열과 Q열)
-                if len(row) < 17:
-                    continue
-                    
-                property_id = str(row[0]).strip() if row[0] else ''
-                location = str(row[16]).strip() if len(row) > 16 and row[16] else ''
-                
-                if not property_id or not location:
-                    continue
+    def warm(self):
+        """인증 정보 로드 + 클라이언트 하나를 미리 생성"""
+        with self.checkout():
+            pass
 
-                # 상태 값 추출
-                r_value = str(row[17]).strip() if len(row) > 17 and row[17] else ''
-                s_value = str(row[18]).strip() if len(row) > 18 and row[18] else ''
-                t_value = str(row[19]).strip() if len(row) > 19 and row[19] else ''
+    def reset_connections(self):
+        """대기 중인 클라이언트의 keep-alive 연결을 닫습니다. (클라이언트 객체는 유지, 다음 요청 시 재연결)"""
+        with self._available:
+            for service in self._idle:
+                _close_service(service)
 
-                status = determine_status(r_value, s_value, t_value, sheet_type)
-                
-                if status is None:
-                    excluded_count += 1
-                    continue
-                
-                status_counts[status] += 1
-
-                # 성능 개선: 딕셔너리 생성 최적화
-                properties.append({
-                    'id': property_id,
-                    'reg_date': str(row[1]).strip() if len(row) > 1 and row[1] else '',
-                    'hyperlink': f"https://new.land.naver.com/houses?articleNo={property_id}",
-                    'location': location,
-                    'sheet_type': sheet_type,
-                    'status': status,
-                    'deposit': str(row[10]).strip() if len(row) > 10 and row[10] else '',
-                    'monthly_rent': str(row[11]).strip() if len(row) > 11 and row[11] else ''
-                })
-
-            except Exception as e:
-                continue  # 개별 행 오류는 무시
-
-        # 성능 개선: 프로덕션에서는 요약 로깅만
-        if not os.environ.get("RENDER"):
-            logging.info(f"[{sheet_type}] 총 {len(properties)}개 매물 (갠매: {status_counts['갠매']}, 온하: {status_counts['온하']}, 공클: {status_counts['공클']})")
+    def stats(self):
+        with self._available:
+            return {'max_size': self.max_size, 'created': self._created, 'idle': len(self._idle)}
+
+# 전역 클라이언트 풀
+sheets_pool = SheetsClientPool()
+
+def get_sheets_service():
+    """
+    현재 스레드 전용 Google Sheets API 서비스 객체 (일회성 스크립트/디버그용)
+    서버 코드는 sheets_pool.checkout()으로 풀의 클라이언트를 빌려 씁니다.
+    """
+    service = getattr(_thread_services, 'service', None)
+    if service is None:
+        service = _thread_services.service = _build_sheets_service(get_sheets_credentials())
+    return service
+
+def reset_sheets_connections():
+    """fork 이후 부모 프로세스와 공유된 keep-alive 연결을 정리합니다. (서비스 객체는 유지)"""
+    sheets_pool.reset_connections()
+    service = getattr(_thread_services, 'service', None)
+    if service is not None:
+        _close_service(service)
+
+def fetch_property_data(sheet_type='강남월세'):
+    """
+    캐시를 거치지 않고 시트에서 매물 데이터를 직접 가져옵니다.
+    API 호출 실패 시 예외를 그대로 전달하므로 백그라운드 갱신에서 이전 데이터를 유지할 수 있습니다.
+    """
+    range_name = SHEET_RANGES.get(sheet_type)
+    if not range_name:
+        logging.error(f"Invalid sheet type: {sheet_type}")
+        return []
+
+    # 성능 개선: 배치 요청으로 데이터 가져오기
+    with profile_stage('sheets_fetch'), sheets_pool.checkout() as service, track_upstream('sheets', 'values.get'):
+        result = service.spreadsheets().values().get(
+            spreadsheetId=SPREADSHEET_ID,
+            range=range_name,
+            valueRenderOption='UNFORMATTED_VALUE'  # 성능 개선: 원시 값만 가져오기
+        ).execute()
+
+    if result is None:
+        return []
+
+    values = result.get('values', [])
+    
+    if not values:
+        return []
+
+    with profile_stage('parse'):
+        return parse_property_rows(values, sheet_type)
+
+def parse_property_rows(values, sheet_type):
+    """
+    values().get 응답의 행 목록을 매물 딕셔너리 목록으로 변환합니다.
+    (A열 ID, B열 등록일, K열 보증금, L열 월세, Q열 위치, R/S/T열 상태)
+    """
+    properties = []
+    status_counts = {'갠매': 0, '온하': 0, '공클': 0}
+    excluded_count = 0
+
+    # 성능 개선: 리스트 컴프리헨션과 필터링 최적화
+    for row in values:
+        try:
+            # 최소 필요 열 확인 (A열과 Q열)
+            if len(row) < 17:
+                continue
+            
+            property_id = str(row[0]).strip() if row[0] else ''
+            location = str(row[16]).strip() if len(row) > 16 and row[16] else ''
         
-        return properties
+            if not property_id or not location:
+                continue
+
+            # 상태 값 추출
+            r_value = str(row[17]).strip() if len(row) > 17 and row[17] else ''
+            s_value = str(row[18]).strip() if len(row) > 18 and row[18] else ''
+            t_value = str(row[19]).strip() if len(row) > 19 and row[19] else ''
+
+            status = determine_status(r_value, s_value, t_value, sheet_type)
+        
+            if status is None:
+                excluded_count += 1
+                continue
+        
+            status_counts[status] += 1
+
+            # 성능 개선: 딕셔너리 생성 최적화
+            properties.append({
+                'id': property_id,
+                'reg_date': str(row[1]).strip() if len(row) > 1 and row[1] else '',
+                'hyperlink': f"{PROPERTY_LINK_PREFIX}{property_id}",
+                'location': location,
+                'sheet_type': sheet_type,
+                'status': status,
+                'deposit': str(row[10]).strip() if len(row) > 10 and row[10] else '',
+                'monthly_rent': str(row[11]).strip() if len(row) > 11 and row[11] else ''
+            })
 
+        except Exception as e:
+            continue  # 개별 행 오류는 무시
+
+    # 성능 개선: 프로덕션에서는 요약 로깅만
+    if not os.environ.get("RENDER"):
+        logging.info(f"[{sheet_type}] 총 {len(properties)}개 매물 (갠매: {status_counts['갠매']}, 온하: {status_counts['온하']}, 공클: {status_counts['공클']})")
+    
+    return properties
+
+@timed_cache(CACHE_TTL)
+def get_property_data(sheet_type='강남월세'):
+    try:
+        return fetch_property_data(sheet_type)
     except Exception as e:
         logging.error(f"Failed to fetch property data: {str(e)}")
         return []
@@ -280,9 +416,8 @@ def get_property_data(sheet_type='강남월세'):
 def test_sheets_connection():
     """Google Sheets API 연결을 테스트하는 함수"""
     try:
-        service = get_sheets_service()
-        
-        spreadsheet = service.spreadsheets().get(spreadsheetId=SPREADSHEET_ID).execute()
+        with sheets_pool.checkout() as service, track_upstream('sheets', 'spreadsheets.get'):
+            spreadsheet = service.spreadsheets().get(spreadsheetId=SPREADSHEET_ID).execute()
         
         if spreadsheet:
             logging.info("✅ Google Sheets API 연결 성공!")
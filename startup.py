@@ -0,0 +1,92 @@
+"""
+서버 시작 시 워밍업 로직
+gunicorn(preload_app=True)에서는 마스터 프로세스가 fork 전에 warm_up()을 실행하여
+인증 정보, Sheets 클라이언트, 매물 스냅샷을 준비하고 워커는 이를 copy-on-write로 물려받습니다.
+"""
+
+import logging
+import os
+import threading
+
+from ncp_maps_utils import test_ncp_maps_connection
+from scheduler import load_warm_snapshot, scheduler
+from sheets_service import reset_sheets_connections, sheets_pool, test_sheets_connection
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up(reset_connections=True):
+    """
+    스냅샷 준비 (디스크 스냅샷 우선, 없으면 인증/클라이언트 생성 후 시트만 즉시 가져옴)
+    디스크 스냅샷이 있으면 Google API 라이브러리 import와 클라이언트 생성을
+    워커의 백그라운드 갱신으로 미루어 시작 시간을 줄입니다.
+    """
+    is_production = os.environ.get("RENDER")
+
+    # 디스크 스냅샷이 있으면 인증 상태와 관계없이 바로 응답 가능
+    snapshot = load_warm_snapshot()
+    if snapshot is not None:
+        return snapshot
+
+    try:
+        # 인증 정보 로드 + discovery 클라이언트 생성
+        sheets_pool.warm()
+    except Exception as e:
+        logger.error(f"Sheets 클라이언트 준비 실패 (요청 시 다시 시도합니다): {str(e)}")
+        return snapshot
+
+    try:
+        # 지오코딩은 워커의 백그라운드 스케줄러에 맡기고 시트만 가져옴
+        snapshot = scheduler.run_once(geocode=False)
+        if not is_production:
+            total = sum(len(rows) for rows in snapshot.properties.values())
+            logger.info(f"✅ 데이터 사전 로딩 완료 - {total}개 매물")
+    except Exception as e:
+        logger.warning(f"데이터 사전 로딩 실패 (계속 진행): {str(e)}")
+
+    # 워밍업 중 열린 keep-alive 연결은 fork 후 공유되지 않도록 정리
+    if reset_connections:
+        reset_sheets_connections()
+    return snapshot
+
+
+def warm_up_async():
+    """
+    워밍업을 백그라운드 스레드에서 실행 (fork하지 않는 단일 프로세스 실행용)
+    서버는 바로 요청을 받고, 스냅샷이 준비되기 전 요청은 기존 캐시 경로로 처리됩니다.
+    gunicorn 마스터에서는 fork 중 스레드가 잠금을 잡고 있을 수 있으므로 warm_up()을 사용해야 합니다.
+    """
+    thread = threading.Thread(target=warm_up, kwargs={'reset_connections': False}, name='warm-up', daemon=True)
+    thread.start()
+    return thread
+
+
+def run_connection_tests():
+    """Google Sheets / NCP Maps 연결 테스트 및 성능 통계 출력"""
+    is_production = os.environ.get("RENDER")
+
+    try:
+        if not test_sheets_connection():
+            logger.error("Google Sheets API 연결 실패")
+    except Exception as e:
+        logger.error(f"Google Sheets API 연결 테스트 실패: {str(e)}")
+
+    try:
+        if not test_ncp_maps_connection():
+            logger.error("네이버 클라우드 플랫폼 Maps API 연결 실패")
+    except Exception as e:
+        logger.error(f"네이버 클라우드 플랫폼 Maps API 연결 테스트 실패: {str(e)}")
+
+    if not is_production:
+        try:
+            from performance_config import log_performance_stats
+            log_performance_stats()
+        except Exception as e:
+            logger.warning(f"성능 통계 출력 실패: {str(e)}")
+
+
+def run_connection_tests_async():
+    """연결 테스트를 백그라운드 스레드에서 실행 (서버 시작을 막지 않음)"""
+    thread = threading.Thread(target=run_connection_tests, name='connection-tests', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,153 @@
+// 매물 필터링/그룹화 Web Worker
+// 매물을 열(column) 단위 typed array로 보관하고, 필터 조건 메시지에 위치별 그룹(매물 인덱스)으로 응답
+// 메인 스레드는 allProperties의 인덱스만 받아 마커를 그리므로 필터 변경 중에도 UI가 멈추지 않음
+//
+// 메시지 형식
+//   → { type: 'load', version, properties }
+//   → { type: 'query', id, version, query: { status, search, depositStart, depositEnd, rentStart, rentEnd } }
+//   ← { type: 'groups', id, version, locations, statuses, offsets, indices }
+//      그룹 g의 매물 인덱스: indices[offsets[g] .. offsets[g + 1])
+
+const STATUS_NAMES = ['', '갠매', '공클', '온하'];
+const STATUS_CODES = { '갠매': 1, '공클': 2, '온하': 3 };
+const STATUS_PRIORITY = new Uint8Array([0, 3, 2, 1]); // 상태 코드별 마커 색상 우선순위 (map.js와 동일)
+
+let columns = null;
+
+function parseAmount(value) {
+    if (value === null || value === undefined || value === '') return 0;
+    return parseInt(String(value).replace(/[^0-9]/g, '')) || 0;
+}
+
+// 금액 문자열은 로드할 때 한 번만 숫자로 변환
+function buildColumns(properties, version) {
+    const count = properties.length;
+    const deposit = new Float64Array(count);
+    const rent = new Float64Array(count);
+    const status = new Uint8Array(count);
+    const locationIndex = new Int32Array(count);
+    const locations = [];
+    const locationIds = new Map();
+
+    for (let i = 0; i < count; i++) {
+        const property = properties[i];
+        deposit[i] = parseAmount(property.deposit);
+        rent[i] = parseAmount(property.monthly_rent);
+        status[i] = STATUS_CODES[property.status] || 0;
+
+        const location = property.location ? String(property.location).trim() : '';
+        if (!location) {
+            locationIndex[i] = -1;
+            continue;
+        }
+        let id = locationIds.get(location);
+        if (id === undefined) {
+            id = locations.length;
+            locations.push(location);
+            locationIds.set(location, id);
+        }
+        locationIndex[i] = id;
+    }
+
+    return {
+        version,
+        count,
+        deposit,
+        rent,
+        status,
+        locationIndex,
+        locations,
+        searchableLocations: locations.map(location => location.toLowerCase())
+    };
+}
+
+function queryGroups(data, query) {
+    const statusCode = STATUS_CODES[query.status] || -1; // 알 수 없는 상태는 일치하는 매물 없음
+    const search = (query.search || '').toLowerCase().trim();
+    const depositStart = query.depositStart || 0;
+    const depositEnd = query.depositEnd || 0;
+    const rentStart = query.rentStart || 0;
+    const rentEnd = query.rentEnd || 0;
+
+    // 지역 검색은 매물이 아닌 고유 위치 단위로 한 번만 비교
+    const locationCount = data.locations.length;
+    const groupOf = new Int32Array(locationCount).fill(-1);
+    if (search) {
+        for (let l = 0; l < locationCount; l++) {
+            if (!data.searchableLocations[l].includes(search)) groupOf[l] = -2;
+        }
+    }
+
+    const matched = new Int32Array(data.count);
+    const matchedGroup = new Int32Array(data.count);
+    const groupLocations = [];
+    const groupSizes = [];
+    const groupStatus = [];
+    let matchedCount = 0;
+
+    for (let i = 0; i < data.count; i++) {
+        if (data.status[i] !== statusCode) continue;
+        const l = data.locationIndex[i];
+        if (l < 0 || groupOf[l] === -2) continue;
+
+        const deposit = data.deposit[i];
+        if (depositStart > 0 && deposit < depositStart) continue;
+        if (depositEnd > 0 && deposit > depositEnd) continue;
+        const rent = data.rent[i];
+        if (rentStart > 0 && rent < rentStart) continue;
+        if (rentEnd > 0 && rent > rentEnd) continue;
+
+        // 위치가 처음 나온 순서대로 그룹 생성
+        let g = groupOf[l];
+        if (g === -1) {
+            g = groupLocations.length;
+            groupOf[l] = g;
+            groupLocations.push(data.locations[l]);
+            groupSizes.push(0);
+            groupStatus.push(0);
+        }
+        groupSizes[g]++;
+        if (STATUS_PRIORITY[data.status[i]] > STATUS_PRIORITY[groupStatus[g]]) {
+            groupStatus[g] = data.status[i];
+        }
+        matched[matchedCount] = i;
+        matchedGroup[matchedCount] = g;
+        matchedCount++;
+    }
+
+    // 그룹별로 연속된 인덱스 배열 구성 (그룹 안에서는 원래 순서 유지)
+    const groupCount = groupLocations.length;
+    const offsets = new Int32Array(groupCount + 1);
+    for (let g = 0; g < groupCount; g++) {
+        offsets[g + 1] = offsets[g] + groupSizes[g];
+    }
+    const cursor = offsets.slice(0, groupCount);
+    const indices = new Int32Array(matchedCount);
+    for (let m = 0; m < matchedCount; m++) {
+        indices[cursor[matchedGroup[m]]++] = matched[m];
+    }
+
+    return {
+        locations: groupLocations,
+        statuses: groupStatus.map(code => STATUS_NAMES[code]),
+        offsets,
+        indices
+    };
+}
+
+self.onmessage = (event) => {
+    const message = event.data;
+    if (message.type === 'load') {
+        columns = buildColumns(message.properties || [], message.version);
+    } else if (message.type === 'query') {
+        // 아직 로드되지 않았거나 다른 데이터 버전에 대한 조회면 빈 결과
+        const empty = !columns || columns.version !== message.version;
+        const result = empty
+            ? { locations: [], statuses: [], offsets: new Int32Array(1), indices: new Int32Array(0) }
+            : queryGroups(columns, message.query);
+        self.postMessage(
+            Object.assign({ type: 'groups', id: message.id, version: message.version }, result),
+            [result.offsets.buffer, result.indices.buffer]
+        );
+    }
+};
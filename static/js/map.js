@@ -1,6 +1,4 @@
 let map;
-let markers = [];
-let infoWindows = [];
 let allProperties = [];
 
 // 렌더 토큰: 매물 표시 세션을 구분하여 초기화 시 이전 세션을 무효화
@@ -72,13 +70,17 @@ async function loadProperties() {
             document.head.appendChild(style);
         }
         
-        const response = await fetch(`/api/properties/${sheetType}`);
+        // 성능 개선: 열 단위 압축 형식으로 받아 매물 객체로 복원 (키 이름/링크 주소 반복 제거)
+        // 마커에 필요한 요약(id, 주소, 상태, 가격, 좌표)만 받고 나머지는 InfoWindow를 열 때 조회
+        // (쿼리 문자열은 sw.js PROPERTIES_QUERY와 같아야 서비스 워커가 캐시함)
+        const response = await fetch(`/api/properties/${sheetType}?format=columnar&view=summary`);
         
         if (response.ok) {
-            const data = await response.json();
+            const data = decodeProperties(await response.json());
             
             if (Array.isArray(data)) {
                 allProperties = data;
+                propertyPipeline.load(allProperties);
                 if (!isProduction) console.log(`${sheetType}: ${allProperties.length}개 매물 로드됨`);
             } else {
                 console.error('API 응답이 배열이 아닙니다:', data);
@@ -112,50 +114,200 @@ async function loadProperties() {
     }
 }
 
+// 매물 API 응답 → 매물 객체 배열 (기본 배열 형식과 columnar 형식 모두 처리, property_encoding.py 참고)
+// 요약 보기(view=summary)로 받은 매물에는 reg_date가 없고 대신 lat/lng가 있음
+function decodeProperties(data) {
+    if (!data || data.format !== 'columnar') {
+        return data;
+    }
+    const { strings, columns } = data;
+    // 요약 보기: 주소(strings 인덱스)별 좌표
+    const coordinatesByLocation = new Map((data.coordinates || []).map(([index, lat, lng]) => [index, [lat, lng]]));
+    const properties = new Array(data.count);
+    for (let i = 0; i < data.count; i++) {
+        const id = columns.id[i];
+        const property = {
+            id,
+            hyperlink: columns.hyperlink ? columns.hyperlink[i] : `${data.link_prefix}${id}`,
+            location: strings[columns.location[i]],
+            sheet_type: columns.sheet_type ? strings[columns.sheet_type[i]] : data.sheet_type,
+            status: strings[columns.status[i]],
+            deposit: columns.deposit[i],
+            monthly_rent: columns.monthly_rent[i]
+        };
+        if (columns.reg_date) property.reg_date = strings[columns.reg_date[i]];
+        const coordinates = coordinatesByLocation.get(columns.location[i]);
+        if (coordinates) {
+            property.lat = coordinates[0];
+            property.lng = coordinates[1];
+        }
+        properties[i] = property;
+    }
+    return properties;
+}
+
+// 요약으로 받은 매물의 나머지 필드(등록일 등)를 필요할 때만 조회하여 매물 객체에 채움
+const PROPERTY_DETAIL_BATCH = 200; // main.py의 MAX_DETAIL_IDS와 동일
+
+const propertyDetails = {
+    loading: new Map(), // `${시트}|${id}` → Promise
+
+    needsDetails(property) {
+        return property.reg_date === undefined;
+    },
+
+    // 상세가 없는 매물만 시트별로 묶어 /details?ids= 로 조회 (이미 조회 중인 매물은 그 요청을 기다림)
+    // 결과: 새로 채운 매물이 있으면 true
+    ensure(properties) {
+        const waits = [];
+        const missing = new Map(); // 시트 → 매물 목록
+        for (const property of properties) {
+            if (!this.needsDetails(property)) continue;
+            const key = `${property.sheet_type}|${property.id}`;
+            if (this.loading.has(key)) {
+                waits.push(this.loading.get(key));
+            } else {
+                if (!missing.has(property.sheet_type)) missing.set(property.sheet_type, []);
+                missing.get(property.sheet_type).push(property);
+            }
+        }
+        missing.forEach((sheetProperties, sheetType) => {
+            for (let i = 0; i < sheetProperties.length; i += PROPERTY_DETAIL_BATCH) {
+                const batch = sheetProperties.slice(i, i + PROPERTY_DETAIL_BATCH);
+                const request = this.fetchBatch(sheetType, batch);
+                batch.forEach(property => this.loading.set(`${sheetType}|${property.id}`, request));
+                waits.push(request);
+            }
+        });
+        return Promise.all(waits).then(results => results.some(Boolean));
+    },
+
+    async fetchBatch(sheetType, batch) {
+        try {
+            const ids = batch.map(property => encodeURIComponent(property.id)).join(',');
+            const response = await fetch(`/api/properties/${sheetType}/details?ids=${ids}`);
+            if (!response.ok) return false;
+            const data = await response.json();
+            const details = new Map(data.properties.map(detail => [detail.id, detail]));
+            batch.forEach(property => {
+                const detail = details.get(property.id);
+                // 없는 매물은 빈 값으로 표시하여 다시 조회하지 않음
+                Object.assign(property, detail || { reg_date: '' });
+            });
+            return true;
+        } catch (error) {
+            console.error('매물 상세 조회 중 오류 발생:', error);
+            return false;
+        } finally {
+            batch.forEach(property => this.loading.delete(`${sheetType}|${property.id}`));
+        }
+    }
+};
+
 // 지오코딩 캐시 관리
+// 지오코딩 캐시 관리
+// 성능 개선: localStorage는 처음 한 번만 읽어 메모리 Map으로 사용하고, 변경 사항은 모아서 비동기로 저장
 const GEOCODING_CACHE_KEY = 'geocoding_cache';
 const CACHE_EXPIRY_HOURS = 48; // 48시간으로 증가
+const CACHE_EXPIRY_MS = CACHE_EXPIRY_HOURS * 60 * 60 * 1000;
+const GEOCODING_CACHE_MAX_ENTRIES = 5000; // 초과 시 오래된 항목부터 제거 (localStorage 용량 보호)
+const GEOCODING_CACHE_FLUSH_DELAY = 1000; // 마지막 변경 후 저장까지 대기 시간 (ms)
 
-function getGeocodingCache() {
-    try {
-        const cached = localStorage.getItem(GEOCODING_CACHE_KEY);
-        if (!cached) return {};
-        
-        const data = JSON.parse(cached);
-        const now = Date.now();
-        
-        // 만료된 항목 제거
-        Object.keys(data).forEach(key => {
-            if (now - data[key].timestamp > CACHE_EXPIRY_HOURS * 60 * 60 * 1000) {
-                delete data[key];
+const geocodeStore = {
+    entries: null, // Map<주소 키, { result, timestamp }> - 오래된 순서로 유지
+    flushTimer: null,
+    dirty: false,
+
+    key(address) {
+        return address.trim().toLowerCase();
+    },
+
+    load() {
+        if (this.entries) return this.entries;
+        this.entries = new Map();
+        try {
+            const cached = localStorage.getItem(GEOCODING_CACHE_KEY);
+            if (cached) {
+                const data = JSON.parse(cached);
+                const now = Date.now();
+                // 저장 시각 순으로 넣어 Map 순서 = 오래된 순서가 되도록 함
+                Object.keys(data)
+                    .filter(key => data[key] && now - data[key].timestamp <= CACHE_EXPIRY_MS)
+                    .sort((a, b) => data[a].timestamp - data[b].timestamp)
+                    .forEach(key => this.entries.set(key, data[key]));
             }
-        });
-        
-        return data;
-    } catch (error) {
-        return {};
-    }
-}
+        } catch (error) {
+            // 손상된 캐시는 무시하고 새로 시작
+        }
+        return this.entries;
+    },
 
-function setGeocodingCache(cache) {
-    try {
-        localStorage.setItem(GEOCODING_CACHE_KEY, JSON.stringify(cache));
-    } catch (error) {
-        // 로컬 스토리지 오류 무시
+    get(address) {
+        const entries = this.load();
+        const cacheKey = this.key(address);
+        const entry = entries.get(cacheKey);
+        if (!entry) return null;
+        // 항목별 만료 확인
+        if (Date.now() - entry.timestamp > CACHE_EXPIRY_MS) {
+            entries.delete(cacheKey);
+            this.scheduleFlush();
+            return null;
+        }
+        return entry.result;
+    },
+
+    set(address, result) {
+        const entries = this.load();
+        const cacheKey = this.key(address);
+        entries.delete(cacheKey); // 다시 넣어서 가장 최근 항목으로 이동
+        entries.set(cacheKey, { result: result, timestamp: Date.now() });
+        while (entries.size > GEOCODING_CACHE_MAX_ENTRIES) {
+            entries.delete(entries.keys().next().value);
+        }
+        this.scheduleFlush();
+    },
+
+    scheduleFlush() {
+        this.dirty = true;
+        if (this.flushTimer) return;
+        this.flushTimer = setTimeout(() => {
+            this.flushTimer = null;
+            // 브라우저가 한가할 때 직렬화 (지원하지 않으면 바로 실행)
+            if (window.requestIdleCallback) {
+                window.requestIdleCallback(() => this.flush(), { timeout: 2000 });
+            } else {
+                this.flush();
+            }
+        }, GEOCODING_CACHE_FLUSH_DELAY);
+    },
+
+    flush() {
+        if (!this.dirty || !this.entries) return;
+        this.dirty = false;
+        try {
+            localStorage.setItem(GEOCODING_CACHE_KEY, JSON.stringify(Object.fromEntries(this.entries)));
+        } catch (error) {
+            // 로컬 스토리지 오류 무시 (용량 초과 등)
+        }
     }
-}
+};
+
+// 페이지를 떠나기 전에 남은 변경 사항 저장
+window.addEventListener('pagehide', () => geocodeStore.flush());
+document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') geocodeStore.flush();
+});
 
 // 배치 지오코딩 함수 - 성능 개선
 async function batchGeocode(addresses) {
-    const cache = getGeocodingCache();
     const results = {};
     const uncachedAddresses = [];
     
     // 캐시된 결과 먼저 수집
     addresses.forEach(address => {
-        const cacheKey = address.trim().toLowerCase();
-        if (cache[cacheKey]) {
-            results[address] = cache[cacheKey].result;
+        const cached = geocodeStore.get(address);
+        if (cached) {
+            results[address] = cached;
         } else {
             uncachedAddresses.push(address);
         }
@@ -172,19 +324,8 @@ async function batchGeocode(addresses) {
             batch.forEach((address, index) => {
                 if (batchResults[index]) {
                     results[address] = batchResults[index];
-                    
-                    // 즉시 캐시에 저장
-                    const cacheKey = address.trim().toLowerCase();
-                    cache[cacheKey] = {
-                        result: batchResults[index],
-                        timestamp: Date.now()
-                    };
                 }
             });
-            
-            // 배치 처리 후 캐시 업데이트
-            setGeocodingCache(cache);
-            
         } catch (error) {
             // 개별 오류는 무시
         }
@@ -202,11 +343,9 @@ async function geocodeAddress(address) {
     if (!address) return null;
     
     // 캐시에서 먼저 확인
-    const cache = getGeocodingCache();
-    const cacheKey = address.trim().toLowerCase();
-    
-    if (cache[cacheKey]) {
-        return cache[cacheKey].result;
+    const cached = geocodeStore.get(address);
+    if (cached) {
+        return cached;
     }
     
     try {
@@ -220,12 +359,8 @@ async function geocodeAddress(address) {
                 formatted_address: data.result.formatted_address
             };
             
-            // 캐시에 저장
-            cache[cacheKey] = {
-                result: result,
-                timestamp: Date.now()
-            };
-            setGeocodingCache(cache);
+            // 캐시에 저장 (localStorage 기록은 모아서 나중에)
+            geocodeStore.set(address, result);
             
             return result;
         } else {
@@ -241,31 +376,512 @@ function parseAmount(str) {
     return parseInt(str.replace(/[^0-9]/g, '')) || 0;
 }
 
+// 성능 개선: 필터링/위치별 그룹화/상태 판정은 Web Worker(filter_worker.js)에서 처리
+// 메인 스레드는 위치별 매물 인덱스만 받아 allProperties에서 꺼내 씀
+// Worker를 쓸 수 없는 환경에서는 같은 결과를 메인 스레드에서 계산
+const FILTER_WORKER_URL = '/static/js/filter_worker.js';
+
+const propertyPipeline = {
+    worker: null,
+    failed: false,
+    version: 0, // allProperties가 바뀔 때마다 증가 → 이전 데이터에 대한 응답 무시
+    nextId: 0,
+    pending: new Map(), // 조회 id → { resolve, query }
+
+    start() {
+        if (this.worker || this.failed) return this.worker;
+        if (typeof Worker === 'undefined') {
+            this.failed = true;
+            return null;
+        }
+        try {
+            this.worker = new Worker(FILTER_WORKER_URL);
+            this.worker.onmessage = (event) => this.receive(event.data);
+            this.worker.onerror = (error) => this.fail(error);
+        } catch (error) {
+            this.fail(error);
+        }
+        return this.worker;
+    },
+
+    fail(error) {
+        console.warn('필터 Worker를 사용할 수 없어 메인 스레드에서 필터링합니다:', error && error.message);
+        if (this.worker) this.worker.terminate();
+        this.worker = null;
+        this.failed = true;
+        // 응답을 기다리던 조회는 메인 스레드에서 처리
+        this.pending.forEach(({ resolve, query }) => resolve(groupPropertiesOnMainThread(allProperties, query)));
+        this.pending.clear();
+    },
+
+    load(properties) {
+        this.version += 1;
+        const worker = this.start();
+        if (worker) worker.postMessage({ type: 'load', version: this.version, properties });
+    },
+
+    // 결과: Map<위치, { status, properties }> (데이터가 바뀌어 쓸모없어진 조회는 null)
+    query(query) {
+        const version = this.version;
+        if (!this.start()) {
+            return Promise.resolve(groupPropertiesOnMainThread(allProperties, query));
+        }
+        const id = ++this.nextId;
+        return new Promise(resolve => {
+            this.pending.set(id, { resolve, query });
+            this.worker.postMessage({ type: 'query', id, version, query });
+        }).then(groups => (version === this.version ? groups : null));
+    },
+
+    receive(message) {
+        const request = this.pending.get(message.id);
+        if (!request) return;
+        this.pending.delete(message.id);
+        if (message.version !== this.version || allProperties.length === 0) {
+            request.resolve(null);
+            return;
+        }
+        const groups = new Map();
+        const { locations, statuses, offsets, indices } = message;
+        for (let g = 0; g < locations.length; g++) {
+            const properties = new Array(offsets[g + 1] - offsets[g]);
+            for (let k = offsets[g]; k < offsets[g + 1]; k++) {
+                properties[k - offsets[g]] = allProperties[indices[k]];
+            }
+            groups.set(locations[g], { status: statuses[g], properties });
+        }
+        request.resolve(groups);
+    }
+};
+
+// Worker와 같은 필터 조건/그룹화 (Worker를 쓸 수 없을 때만 사용)
+function groupPropertiesOnMainThread(properties, query) {
+    const searchText = query.search;
+    const groups = new Map();
+    properties.forEach(property => {
+        if (property.status !== query.status || !property.location) {
+            return;
+        }
+        if (searchText && !property.location.toLowerCase().includes(searchText)) {
+            return;
+        }
+        const propertyDeposit = parseAmount(property.deposit);
+        if (query.depositStart > 0 && propertyDeposit < query.depositStart) return;
+        if (query.depositEnd > 0 && propertyDeposit > query.depositEnd) return;
+        const propertyMonthlyRent = parseAmount(property.monthly_rent);
+        if (query.rentStart > 0 && propertyMonthlyRent < query.rentStart) return;
+        if (query.rentEnd > 0 && propertyMonthlyRent > query.rentEnd) return;
+
+        const locationKey = property.location.trim();
+        let group = groups.get(locationKey);
+        if (!group) {
+            group = { status: '', properties: [] };
+            groups.set(locationKey, group);
+        }
+        group.properties.push(property);
+        if ((STATUS_PRIORITY[property.status] || 0) > (STATUS_PRIORITY[group.status] || 0)) {
+            group.status = property.status;
+        }
+    });
+    return groups;
+}
+
+// 상태별 마커 색상 (우선순위가 가장 높은 상태의 색으로 표시)
+const STATUS_PRIORITY = { '갠매': 3, '공클': 2, '온하': 1 };
+const STATUS_COLORS = { '갠매': '#3182F6', '공클': '#10B981', '온하': '#F59E0B' };
+
+function createMarkerIcon(markerColor, displayText) {
+    return {
+        content: `
+            <div style="
+                background: ${markerColor};
+                color: white;
+                padding: 8px 12px;
+                border-radius: 20px;
+                font-weight: 600;
+                font-size: 12px;
+                box-shadow: 0 2px 8px rgba(0,0,0,0.3);
+                white-space: nowrap;
+                border: 2px solid white;
+            ">
+                ${displayText}
+            </div>
+        `,
+        anchor: new naver.maps.Point(0, 0)
+    };
+}
+
+// 성능 개선: 위치별로 지도에 있는 마커를 기억해 두고 필터 변경 시 바뀐 마커만 추가/제거/갱신
+// InfoWindow와 그 HTML은 마커를 처음 클릭할 때 만들고 재사용
+const markerManager = {
+    entries: new Map(), // 위치 → { marker, infoWindow, location, lat, lng, properties, styleKey, propertiesKey, contentKey }
+
+    get size() {
+        return this.entries.size;
+    },
+
+    // groups: Map<위치, { lat, lng, status, properties }> (status: 우선순위가 가장 높은 상태)
+    update(groups) {
+        // 더 이상 표시하지 않는 위치의 마커 제거
+        for (const [location, entry] of this.entries) {
+            if (!groups.has(location)) {
+                if (entry.infoWindow) entry.infoWindow.close();
+                entry.marker.setMap(null);
+                this.entries.delete(location);
+            }
+        }
+
+        let added = 0;
+        let restyled = 0;
+        let moved = 0;
+        for (const [location, group] of groups) {
+            const propertiesAtLocation = group.properties;
+            const propertyCount = propertiesAtLocation.length;
+            const displayText = propertyCount > 1 ? `${location} (${propertyCount})` : location;
+            const markerColor = STATUS_COLORS[group.status] || '#8B95A1';
+            const styleKey = `${markerColor}|${displayText}`;
+            const propertiesKey = propertiesAtLocation.map(p => p.id).join(',');
+
+            const entry = this.entries.get(location);
+            if (entry) {
+                // 같은 위치: 좌표/표시 내용이 바뀐 경우에만 갱신 (주소를 다시 지오코딩하면 좌표가 바뀔 수 있음)
+                if (entry.lat !== group.lat || entry.lng !== group.lng) {
+                    entry.marker.setPosition(new naver.maps.LatLng(group.lat, group.lng));
+                    entry.lat = group.lat;
+                    entry.lng = group.lng;
+                    // 열려 있는 InfoWindow는 새 위치에 다시 염
+                    if (entry.infoWindow && entry.infoWindow.getMap() !== null) {
+                        entry.infoWindow.open(map, entry.marker);
+                    }
+                    moved++;
+                }
+                if (entry.styleKey !== styleKey) {
+                    entry.marker.setIcon(createMarkerIcon(markerColor, displayText));
+                    entry.styleKey = styleKey;
+                    restyled++;
+                }
+                if (entry.propertiesKey !== propertiesKey) {
+                    entry.properties = propertiesAtLocation;
+                    entry.propertiesKey = propertiesKey;
+                    // 열려 있는 InfoWindow만 바로 갱신, 나머지는 다음 클릭 때 갱신
+                    if (entry.infoWindow && entry.infoWindow.getMap() !== null) {
+                        this.refreshContent(entry);
+                    }
+                }
+                continue;
+            }
+
+            const marker = new naver.maps.Marker({
+                position: new naver.maps.LatLng(group.lat, group.lng),
+                icon: createMarkerIcon(markerColor, displayText)
+            });
+            const newEntry = {
+                marker,
+                infoWindow: null,
+                location,
+                lat: group.lat,
+                lng: group.lng,
+                properties: propertiesAtLocation,
+                styleKey,
+                propertiesKey,
+                contentKey: null
+            };
+
+            // 마커 클릭 이벤트
+            naver.maps.Event.addListener(marker, 'click', () => this.toggleInfoWindow(newEntry));
+
+            marker.setMap(map);
+            this.entries.set(location, newEntry);
+            added++;
+        }
+        return { added, restyled, moved };
+    },
+
+    // InfoWindow 내용 생성 - 성능 개선: 처음 열 때, 또는 매물 구성이 바뀐 뒤 다시 열 때만 생성
+    refreshContent(entry) {
+        if (entry.contentKey === entry.propertiesKey) return;
+        this.loadDetails(entry);
+        const content = createInfoWindowContent(entry.location, entry.properties);
+        if (entry.infoWindow) {
+            entry.infoWindow.setContent(content);
+        } else {
+            entry.infoWindow = new naver.maps.InfoWindow({
+                content: content,
+                backgroundColor: 'transparent',
+                borderColor: 'transparent',
+                borderWidth: 0,
+                anchorSize: new naver.maps.Size(0, 0),
+                pixelOffset: new naver.maps.Point(0, -10)
+            });
+        }
+        entry.contentKey = entry.propertiesKey;
+    },
+
+    // 요약으로 받은 매물이면 상세를 조회한 뒤, 아직 열려 있는 InfoWindow만 다시 그림
+    loadDetails(entry) {
+        if (!entry.properties.some(property => propertyDetails.needsDetails(property))) return;
+        const properties = entry.properties;
+        propertyDetails.ensure(properties).then(loaded => {
+            if (!loaded) return;
+            propertyListView.invalidate();
+            if (entry.properties !== properties || !entry.infoWindow || entry.infoWindow.getMap() === null) {
+                return;
+            }
+            entry.contentKey = null;
+            this.refreshContent(entry);
+        });
+    },
+
+    toggleInfoWindow(entry) {
+        const isCurrentlyOpen = entry.infoWindow !== null && entry.infoWindow.getMap() !== null;
+        this.closeInfoWindows();
+        if (!isCurrentlyOpen) {
+            this.refreshContent(entry);
+            entry.infoWindow.open(map, entry.marker);
+        }
+        // 목록에서도 같은 위치 선택/해제
+        propertyListView.select(isCurrentlyOpen ? null : entry.location, true);
+    },
+
+    // 목록에서 선택한 위치로 지도 이동 후 InfoWindow 열기
+    openLocation(location) {
+        const entry = this.entries.get(location);
+        if (!entry) return;
+        this.closeInfoWindows();
+        this.refreshContent(entry);
+        map.panTo(entry.marker.getPosition());
+        entry.infoWindow.open(map, entry.marker);
+    },
+
+    closeInfoWindows() {
+        this.entries.forEach(entry => {
+            if (entry.infoWindow) entry.infoWindow.close();
+        });
+    },
+
+    clear() {
+        this.entries.forEach(entry => {
+            if (entry.infoWindow) entry.infoWindow.close();
+            entry.marker.setMap(null);
+        });
+        this.entries.clear();
+    }
+};
+
+// 성능 개선: 매물 목록(#propertyList) 가상화
+// 보이는 행 + 위아래 여유 행만 DOM으로 만들고, 스크롤 시 같은 행 노드를 재사용하여 내용만 교체
+const PROPERTY_ROW_HEIGHT = 128; // 행 높이 고정 (px) → 스크롤 위치로 바로 행 번호 계산
+const PROPERTY_ROW_BUFFER = 6; // 보이는 영역 위아래로 미리 그려 둘 행 수
+
+const propertyListView = {
+    container: null,
+    spacer: null,
+    rows: [], // 재사용하는 행 노드 풀
+    items: [], // 표시 순서대로 정렬된 매물 (위치별로 연속)
+    locationRows: new Map(), // 위치 → 첫 행 번호
+    selectedLocation: null,
+    frame: null,
+
+    init() {
+        if (this.container) return this.container;
+        const container = document.getElementById('propertyList');
+        if (!container) return null;
+        this.container = container;
+        container.classList.add('virtual-list');
+        container.innerHTML = '';
+        this.spacer = document.createElement('div');
+        this.spacer.className = 'virtual-list-spacer';
+        container.appendChild(this.spacer);
+        container.addEventListener('scroll', () => this.scheduleRender(), { passive: true });
+        // 행마다 리스너를 달지 않고 컨테이너에서 한 번에 처리
+        container.addEventListener('click', (event) => {
+            const row = event.target.closest('.virtual-row');
+            if (!row || row.dataset.index === '') return;
+            const property = this.items[Number(row.dataset.index)];
+            if (!property) return;
+            const location = property.location.trim();
+            this.select(location, false);
+            markerManager.openLocation(location);
+        });
+        return container;
+    },
+
+    // groups: Map<위치, { properties, ... }> (마커와 같은 순서/구성)
+    setItems(groups) {
+        if (!this.init()) return;
+        this.items = [];
+        this.locationRows.clear();
+        groups.forEach((group, location) => {
+            this.locationRows.set(location, this.items.length);
+            for (const property of group.properties) this.items.push(property);
+        });
+        if (!this.locationRows.has(this.selectedLocation)) this.selectedLocation = null;
+        this.hideMessage();
+        this.spacer.style.height = `${this.items.length * PROPERTY_ROW_HEIGHT}px`;
+        // 같은 인덱스라도 다른 매물이므로 보이는 행을 모두 다시 채움
+        this.invalidate();
+    },
+
+    showMessage(text) {
+        this.clear();
+        if (!this.container) return;
+        let message = this.container.querySelector('.empty-list');
+        if (!message) {
+            message = document.createElement('div');
+            message.className = 'empty-list';
+            this.container.appendChild(message);
+        }
+        message.textContent = text;
+    },
+
+    hideMessage() {
+        const message = this.container.querySelector('.empty-list');
+        if (message) message.remove();
+    },
+
+    clear() {
+        if (!this.init()) return;
+        this.items = [];
+        this.locationRows.clear();
+        this.selectedLocation = null;
+        this.spacer.style.height = '0px';
+        this.hideMessage();
+        this.invalidate();
+    },
+
+    // 위치 선택 (scroll=true면 해당 위치의 첫 행이 보이도록 스크롤)
+    select(location, scroll) {
+        this.selectedLocation = location;
+        if (!this.container) return;
+        if (scroll && location !== null && this.locationRows.has(location)) {
+            const top = this.locationRows.get(location) * PROPERTY_ROW_HEIGHT;
+            const viewTop = this.container.scrollTop;
+            if (top < viewTop || top + PROPERTY_ROW_HEIGHT > viewTop + this.container.clientHeight) {
+                this.container.scrollTop = top;
+            }
+        }
+        this.render();
+    },
+
+    // 매물 목록이나 내용이 바뀌었을 때 (필터 변경, 상세 조회 등) 보이는 행을 모두 다시 채움
+    invalidate() {
+        this.rows.forEach(row => { row.dataset.index = ''; });
+        this.render();
+    },
+
+    scheduleRender() {
+        if (this.frame !== null) return;
+        this.frame = requestAnimationFrame(() => {
+            this.frame = null;
+            this.render();
+        });
+    },
+
+    createRow() {
+        const row = document.createElement('div');
+        row.className = 'toss-property-item virtual-row';
+        row.style.height = `${PROPERTY_ROW_HEIGHT}px`;
+        row.innerHTML = `
+            <div class="toss-property-header">
+                <h4 class="toss-property-title"></h4>
+                <span class="toss-property-status"></span>
+            </div>
+            <div class="toss-property-details">
+                <div class="toss-property-price">
+                    <span class="toss-price-label">보증금</span>
+                    <span class="toss-price-value" data-field="deposit"></span>
+                </div>
+                <div class="toss-property-price">
+                    <span class="toss-price-label">월세</span>
+                    <span class="toss-price-value" data-field="monthly_rent"></span>
+                </div>
+            </div>
+            <p class="toss-property-date"></p>
+        `;
+        row.fields = {
+            title: row.querySelector('.toss-property-title'),
+            status: row.querySelector('.toss-property-status'),
+            deposit: row.querySelector('[data-field="deposit"]'),
+            rent: row.querySelector('[data-field="monthly_rent"]'),
+            date: row.querySelector('.toss-property-date')
+        };
+        row.dataset.index = '';
+        this.container.appendChild(row);
+        return row;
+    },
+
+    fillRow(row, index) {
+        const property = this.items[index];
+        row.dataset.index = String(index);
+        row.style.transform = `translateY(${index * PROPERTY_ROW_HEIGHT}px)`;
+        row.fields.title.textContent = property.location;
+        row.fields.status.textContent = property.status || '상태없음';
+        row.fields.status.className = `toss-property-status ${property.status === '공클' ? 'status-available' : 'status-other'}`;
+        row.fields.deposit.textContent = property.deposit || '정보없음';
+        row.fields.rent.textContent = property.monthly_rent || '정보없음';
+        row.fields.date.textContent = `등록일: ${formatRegDate(property)}`;
+    },
+
+    render() {
+        if (!this.container) return;
+        const viewHeight = this.container.clientHeight || PROPERTY_ROW_HEIGHT * 8;
+        const first = Math.max(0, Math.floor(this.container.scrollTop / PROPERTY_ROW_HEIGHT) - PROPERTY_ROW_BUFFER);
+        const last = Math.min(this.items.length,
+            Math.ceil((this.container.scrollTop + viewHeight) / PROPERTY_ROW_HEIGHT) + PROPERTY_ROW_BUFFER);
+        const needed = Math.max(0, last - first);
+
+        while (this.rows.length < needed) this.rows.push(this.createRow());
+
+        // 이미 같은 행을 그리고 있는 노드는 그대로 두고, 나머지 노드만 새 행으로 교체
+        const visible = new Map();
+        const free = [];
+        for (const row of this.rows) {
+            const index = row.dataset.index === '' ? -1 : Number(row.dataset.index);
+            if (index >= first && index < last && !visible.has(index)) {
+                visible.set(index, row);
+            } else {
+                free.push(row);
+            }
+        }
+        for (let index = first; index < last; index++) {
+            if (!visible.has(index)) {
+                const row = free.pop();
+                this.fillRow(row, index);
+                visible.set(index, row);
+            }
+        }
+        for (const row of free) {
+            row.dataset.index = '';
+            row.style.display = 'none';
+        }
+
+        // 화면에 보이는 행의 매물 상세만 조회
+        const pending = [];
+        for (let index = first; index < last; index++) {
+            if (propertyDetails.needsDetails(this.items[index])) pending.push(this.items[index]);
+        }
+        if (pending.length > 0) {
+            propertyDetails.ensure(pending).then(loaded => {
+                if (loaded) this.invalidate();
+            });
+        }
+        visible.forEach((row, index) => {
+            row.style.display = '';
+            row.classList.toggle('selected',
+                this.selectedLocation !== null && this.items[index].location.trim() === this.selectedLocation);
+        });
+    }
+};
+
 function clearMap() {
     // 렌더 토큰 증가 → 기존 displayProperties 루프 무효화
     renderToken += 1;
     
-    // 기존 마커들 제거
-    markers.forEach(marker => {
-        if (marker) {
-            marker.setMap(null);
-        }
-    });
-    markers = [];
-    
-    // 기존 InfoWindow들 닫기
-    infoWindows.forEach(infoWindow => {
-        if (infoWindow) {
-            infoWindow.close();
-        }
-    });
-    infoWindows = [];
+    // 기존 마커와 InfoWindow 제거
+    markerManager.clear();
     
     // 매물 목록 UI도 초기화
-    const propertyList = document.getElementById('propertyList');
-    if (propertyList) {
-        propertyList.innerHTML = '';
-    }
+    propertyListView.clear();
 }
 
 function resetSearchFilters() {
@@ -440,7 +1056,7 @@ function resetFilters() {
     console.log('=== 전체 필터 초기화 완료 ===');
 }
 
-function filterProperties() {
+async function filterProperties() {
     if (allProperties.length === 0) {
         return;
     }
@@ -481,165 +1097,87 @@ function filterProperties() {
     const monthlyRentStart = parseInt(monthlyRentStartEl?.value || 0) || 0;
     const monthlyRentEnd = parseInt(monthlyRentEndEl?.value || 0) || 0;
 
-    // 성능 개선: 필터링 최적화
-    const filteredProperties = allProperties.filter(property => {
-        // 상태 필터
-        if (property.status !== selectedStatus) {
-            return false;
-        }
-
-        // 지역 검색 필터
-        if (searchText && property.location && !property.location.toLowerCase().includes(searchText)) {
-            return false;
-        }
-
-        // 보증금 필터
-        const propertyDeposit = parseAmount(property.deposit);
-        if (totalDepositStart > 0 && propertyDeposit < totalDepositStart) {
-            return false;
-        }
-        if (totalDepositEnd > 0 && propertyDeposit > totalDepositEnd) {
-            return false;
-        }
-
-        // 월세 필터
-        const propertyMonthlyRent = parseAmount(property.monthly_rent);
-        if (monthlyRentStart > 0 && propertyMonthlyRent < monthlyRentStart) {
-            return false;
-        }
-        if (monthlyRentEnd > 0 && propertyMonthlyRent > monthlyRentEnd) {
-            return false;
-        }
-        return true;
+    // 성능 개선: 필터링과 위치별 그룹화는 Worker에서 처리하고 결과 그룹만 받음
+    const groups = await propertyPipeline.query({
+        status: selectedStatus,
+        search: searchText,
+        depositStart: totalDepositStart,
+        depositEnd: totalDepositEnd,
+        rentStart: monthlyRentStart,
+        rentEnd: monthlyRentEnd
     });
+    if (!groups) {
+        return; // 그 사이 매물 데이터가 바뀜
+    }
 
     const isProduction = window.location.hostname !== 'localhost';
-    if (!isProduction) console.log(`필터링 완료: ${filteredProperties.length}개 매물`);
+    if (!isProduction) {
+        let count = 0;
+        groups.forEach(group => { count += group.properties.length; });
+        console.log(`필터링 완료: ${count}개 매물`);
+    }
     
-    displayProperties(filteredProperties);
+    await displayProperties(groups);
 }
 
-async function displayProperties(properties) {
-    // 기존 마커들 제거
-    clearMap();
-
+// groupedProperties: Map<위치, { status, properties }> (propertyPipeline.query 결과)
+async function displayProperties(groupedProperties) {
+    // 마커는 지우지 않고 이전 표시 작업만 무효화 (바뀐 마커만 갱신)
+    renderToken += 1;
     const myToken = renderToken;
 
-    if (properties.length === 0) {
-        const propertyList = document.getElementById('propertyList');
-        if (propertyList) {
-            propertyList.innerHTML = '<div class="empty-list">조건에 맞는 매물이 없습니다.</div>';
-        }
+    if (groupedProperties.size === 0) {
+        markerManager.update(new Map());
+        propertyListView.showMessage('조건에 맞는 매물이 없습니다.');
         return;
     }
     
-    // 주소별로 매물들을 그룹화
-    const groupedProperties = {};
-    properties.forEach(property => {
-        if (!property.location) {
-            return;
-        }
-        
-        const locationKey = property.location.trim();
-        if (!groupedProperties[locationKey]) {
-            groupedProperties[locationKey] = [];
+    // 서버 스냅샷에 좌표가 있는 주소는 그대로 쓰고, 나머지만 배치로 지오코딩
+    const uniqueLocations = Array.from(groupedProperties.keys());
+    const geocodeResults = {};
+    const unresolved = [];
+    for (const location of uniqueLocations) {
+        const first = groupedProperties.get(location).properties[0];
+        if (first.lat && first.lng) {
+            geocodeResults[location] = { lat: first.lat, lng: first.lng };
+        } else {
+            unresolved.push(location);
         }
-        groupedProperties[locationKey].push(property);
-    });
-    
-    // 모든 주소를 배치로 지오코딩
-    const uniqueLocations = Object.keys(groupedProperties);
-    const geocodeResults = await batchGeocode(uniqueLocations);
+    }
+    if (unresolved.length > 0) {
+        Object.assign(geocodeResults, await batchGeocode(unresolved));
+    }
     
     // 초기화 확인
     if (myToken !== renderToken) {
         return;
     }
     
-    // 성능 개선: 마커 생성을 배치로 처리
-    const markerBatch = [];
-    
-    // 그룹화된 매물들을 지도에 마커로 표시
+    // 좌표가 있는 위치만 마커로 표시
+    const groups = new Map();
     for (const location of uniqueLocations) {
-        const propertiesAtLocation = groupedProperties[location];
         const geocodeResult = geocodeResults[location];
-        
         if (geocodeResult && geocodeResult.lat && geocodeResult.lng) {
-            const position = new naver.maps.LatLng(geocodeResult.lat, geocodeResult.lng);
-            
-            // 매물 개수에 따른 마커 표시
-            const propertyCount = propertiesAtLocation.length;
-            const displayText = propertyCount > 1 ? `${location} (${propertyCount})` : location;
-            
-            // 상태별 마커 색상 결정
-            const statusPriority = { '갠매': 3, '공클': 2, '온하': 1 };
-            const statusColors = { '갠매': '#3182F6', '공클': '#10B981', '온하': '#F59E0B' };
-            
-            const highestStatus = propertiesAtLocation.reduce((prev, current) => {
-                const prevPriority = statusPriority[prev.status] || 0;
-                const currentPriority = statusPriority[current.status] || 0;
-                return currentPriority > prevPriority ? current : prev;
+            const group = groupedProperties.get(location);
+            groups.set(location, {
+                lat: geocodeResult.lat,
+                lng: geocodeResult.lng,
+                status: group.status,
+                properties: group.properties
             });
-            
-            const markerColor = statusColors[highestStatus.status] || '#8B95A1';
-            
-            // 성능 개선: 마커를 일단 지도에 추가하지 않고 배치에 저장
-            const marker = new naver.maps.Marker({
-                position: position,
-                icon: {
-                    content: `
-                        <div style="
-                            background: ${markerColor};
-                            color: white;
-                            padding: 8px 12px;
-                            border-radius: 20px;
-                            font-weight: 600;
-                            font-size: 12px;
-                            box-shadow: 0 2px 8px rgba(0,0,0,0.3);
-                            white-space: nowrap;
-                            border: 2px solid white;
-                        ">
-                            ${displayText}
-                        </div>
-                    `,
-                    anchor: new naver.maps.Point(0, 0)
-                }
-            });
-
-            // InfoWindow 내용 생성 - 성능 개선: 템플릿 문자열 최적화
-            const infoContent = createInfoWindowContent(location, propertiesAtLocation);
-
-            const infoWindow = new naver.maps.InfoWindow({
-                content: infoContent,
-                backgroundColor: 'transparent',
-                borderColor: 'transparent',
-                borderWidth: 0,
-                anchorSize: new naver.maps.Size(0, 0),
-                pixelOffset: new naver.maps.Point(0, -10)
-            });
-
-            // 마커 클릭 이벤트
-            naver.maps.Event.addListener(marker, 'click', function() {
-                const isCurrentlyOpen = infoWindow.getMap() !== null;
-                infoWindows.forEach(iw => iw.close());
-                if (!isCurrentlyOpen) {
-                    infoWindow.open(map, marker);
-                }
-            });
-
-            markerBatch.push(marker);
-            markers.push(marker);
-            infoWindows.push(infoWindow);
         }
     }
     
-    // 성능 개선: 모든 마커를 한 번에 지도에 추가
-    markerBatch.forEach(marker => {
-        marker.setMap(map);
-    });
+    const { added, restyled, moved } = markerManager.update(groups);
+    propertyListView.setItems(groups);
     
     const isProduction = window.location.hostname !== 'localhost';
-    if (!isProduction) console.log(`지도 표시 완료: ${markers.length}개 마커`);
+    if (!isProduction) console.log(`지도 표시 완료: ${markerManager.size}개 마커 (추가 ${added}, 갱신 ${restyled}, 이동 ${moved})`);
+}
+
+function formatRegDate(property) {
+    if (propertyDetails.needsDetails(property)) return '불러오는 중...';
+    return property.reg_date || '정보없음';
 }
 
 // 성능 개선: InfoWindow 내용 생성을 별도 함수로 분리
@@ -676,7 +1214,7 @@ function createInfoWindowContent(location, properties) {
                 
                 <div style="margin-bottom: 8px;">
                     <div style="font-weight: 600; font-size: 14px; color: #1F2937; margin-bottom: 4px;">
-                        등록일: ${property.reg_date || '정보없음'}
+                        등록일: ${formatRegDate(property)}
                     </div>
                 </div>
                 
@@ -896,6 +1434,46 @@ function setupEventListeners() {
     console.log('모든 이벤트 리스너 등록 완료');
 }
 
+// 서비스 워커 등록 - 앱 셸과 매물 목록을 캐시하여 재방문 시 네트워크를 기다리지 않고 바로 표시
+let serviceWorkerRegistered = false;
+
+function registerServiceWorker() {
+    // initializeApp이 load/DOMContentLoaded에서 두 번 호출되므로 한 번만 등록
+    if (serviceWorkerRegistered || !('serviceWorker' in navigator)) return;
+    serviceWorkerRegistered = true;
+    navigator.serviceWorker.register('/sw.js').catch(error => {
+        console.warn('서비스 워커 등록 실패:', error);
+    });
+    // 캐시된 매물 목록으로 그린 뒤 서버 스냅샷이 바뀐 것이 확인되면 현재 시트만 다시 불러옴
+    navigator.serviceWorker.addEventListener('message', (event) => {
+        const message = event.data || {};
+        if (message.type !== 'properties-updated') return;
+        const sheetTypeElement = document.querySelector('input[name="sheetType"]:checked');
+        if (!sheetTypeElement || allProperties.length === 0) return;
+        const path = new URL(message.url).pathname;
+        if (decodeURIComponent(path) === `/api/properties/${sheetTypeElement.value}`) {
+            refreshProperties(sheetTypeElement.value);
+        }
+    });
+}
+
+// 지도를 지우지 않고 새 매물 목록으로 교체 (바뀐 마커만 갱신)
+async function refreshProperties(sheetType) {
+    try {
+        // loadProperties와 같은 형식 (sw.js PROPERTIES_QUERY)
+        const response = await fetch(`/api/properties/${sheetType}?format=columnar&view=summary`);
+        if (!response.ok) return;
+        const data = decodeProperties(await response.json());
+        const current = document.querySelector('input[name="sheetType"]:checked');
+        if (!Array.isArray(data) || !current || current.value !== sheetType) return;
+        allProperties = data;
+        propertyPipeline.load(allProperties);
+        await filterProperties();
+    } catch (error) {
+        console.error('매물 갱신 중 오류 발생:', error);
+    }
+}
+
 // 초기화 함수
 async function initializeApp() {
     console.log('=== 웹사이트 초기화 시작 ===');
@@ -911,6 +1489,8 @@ async function initializeApp() {
         // 이벤트 리스너 설정
         setupEventListeners();
         
+        registerServiceWorker();
+        
         // 초기 상태 메시지
         console.log('🎯 사용 방법:');
         console.log('1. 매물 유형을 선택하세요 (강남월세, 강남전세, 송파월세, 송파전세)');
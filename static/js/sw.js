@@ -0,0 +1,117 @@
+// 서비스 워커 - main.py의 /sw.js 라우트가 맨 앞에 SHELL_VERSION / SHELL_URLS 를 붙여서 제공
+// (정적 파일 경로로 직접 등록하면 동작하지 않음)
+//
+// - 앱 셸(index 템플릿이 있으면 /, map.js, filter_worker.js, style.css): 버전별 캐시에 미리 저장, 캐시 우선 + 백그라운드 갱신
+//   파일 내용이 바뀌면 SHELL_VERSION이 바뀌어 새 캐시로 교체
+// - 매물 목록(/api/properties/<시트>?format=columnar&view=summary, map.js가 요청하는 형식만): stale-while-revalidate
+//   캐시된 응답으로 바로 그리고, 서버에 ETag로 재검증하여 스냅샷 버전(X-Snapshot-Version)이 바뀌었으면
+//   캐시를 교체하고 페이지에 'properties-updated' 메시지 전송
+//   시트마다 항목 하나만 유지 (새 버전이 오면 같은 URL 항목을 덮어씀, 다른 형식/이전 캐시는 activate 시 삭제)
+// - 그 외 요청(지오코딩, 매물 상세 등)은 그대로 네트워크로
+
+const SHELL_CACHE = `shell-${SHELL_VERSION}`;
+const PROPERTIES_CACHE = 'properties-v2';
+const PROPERTIES_PATH = /^\/api\/properties\/[^/]+$/;
+const PROPERTIES_QUERY = '?format=columnar&view=summary'; // map.js loadProperties / refreshProperties가 요청하는 형식과 같아야 함
+
+function isCachedPropertiesUrl(url) {
+    return PROPERTIES_PATH.test(url.pathname) && url.search === PROPERTIES_QUERY;
+}
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(
+        caches.open(SHELL_CACHE)
+            // 하나가 실패해도 나머지는 저장 (실패한 파일은 처음 요청할 때 캐시됨)
+            .then(cache => Promise.all(SHELL_URLS.map(url => cache.add(url).catch(error => {
+                console.warn(`앱 셸 캐시 실패: ${url}`, error);
+            }))))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', (event) => {
+    // 이전 버전의 앱 셸 / 매물 캐시 삭제 + 현재 매물 캐시에서 map.js가 쓰지 않는 형식 삭제
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys
+                .filter(key => (key.startsWith('shell-') && key !== SHELL_CACHE)
+                    || (key.startsWith('properties-') && key !== PROPERTIES_CACHE))
+                .map(key => caches.delete(key))))
+            .then(() => pruneProperties())
+            .then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) return;
+
+    if (isCachedPropertiesUrl(url)) {
+        event.respondWith(staleWhileRevalidateProperties(event));
+    } else if (SHELL_URLS.includes(url.pathname)) {
+        event.respondWith(shellFirst(event, url.pathname));
+    }
+});
+
+// 앱 셸: 캐시에 있으면 바로 응답하고 백그라운드에서 갱신 (오프라인이면 캐시만 사용)
+async function shellFirst(event, cacheKey) {
+    const cache = await caches.open(SHELL_CACHE);
+    const cached = await cache.match(cacheKey);
+    const network = fetch(event.request).then(response => {
+        if (response.ok) cache.put(cacheKey, response.clone());
+        return response;
+    });
+    if (cached) {
+        event.waitUntil(network.catch(() => undefined));
+        return cached;
+    }
+    return network;
+}
+
+async function pruneProperties() {
+    const cache = await caches.open(PROPERTIES_CACHE);
+    const requests = await cache.keys();
+    await Promise.all(requests
+        .filter(request => !isCachedPropertiesUrl(new URL(request.url)))
+        .map(request => cache.delete(request)));
+}
+
+async function staleWhileRevalidateProperties(event) {
+    const cache = await caches.open(PROPERTIES_CACHE);
+    const cached = await cache.match(event.request);
+    const revalidation = revalidateProperties(event.request, cache, cached);
+    if (cached) {
+        event.waitUntil(revalidation.catch(() => undefined));
+        return cached;
+    }
+    return revalidation;
+}
+
+async function revalidateProperties(request, cache, cached) {
+    const headers = new Headers(request.headers);
+    const etag = cached && cached.headers.get('ETag');
+    if (etag) headers.set('If-None-Match', etag);
+    // 브라우저 HTTP 캐시를 거치지 않고 항상 서버에 재검증
+    const response = await fetch(request.url, { headers, cache: 'no-store', credentials: 'same-origin' });
+
+    if (response.status === 304 && cached) {
+        return cached;
+    }
+    if (!response.ok) {
+        return cached || response;
+    }
+    const version = response.headers.get('X-Snapshot-Version');
+    // 응답 헤더에 스냅샷 버전이 없으면(스냅샷 발행 전) 캐시에 저장하지 않음
+    if (version) {
+        // 이전 버전 항목은 요청 헤더(Vary)와 관계없이 모두 지우고 새 버전 하나만 저장
+        await cache.delete(request, { ignoreVary: true });
+        await cache.put(request, response.clone());
+        if (cached && cached.headers.get('X-Snapshot-Version') !== version) {
+            const clients = await self.clients.matchAll({ type: 'window' });
+            clients.forEach(client => client.postMessage({ type: 'properties-updated', url: request.url, version }));
+        }
+    }
+    return response;
+}
@@ -1,92 +1,147 @@
-import requests
+import hashlib
+import html
+import json
 import logging
-from config import NCP_MAPS_URLS, NCP_HEADERS
-from ncp_maps_utils import geocode_address
+import threading
+import time
+from disk_cache import DiskLRUCache
+from local_map_renderer import marker_color, render_local_map
+from memory_cache import SizedLRUCache
+from ncp_maps_utils import fetch_static_map
+from ncp_maps_async import geocode_addresses
+from performance_config import NCP_STATIC_MAP_COOLDOWN, STATIC_MAP_CACHE_DIR, STATIC_MAP_CACHE_MAX_BYTES
 
 logger = logging.getLogger(__name__)
 
-def generate_static_map_with_markers(properties, width=800, height=600, zoom=13):
+# 기본 서울 중심 좌표
+DEFAULT_CENTER = (37.5665, 126.9780)
+MAX_MARKERS = 20  # 최대 20개 마커
+
+_image_cache = None
+_image_cache_lock = threading.Lock()
+# 마지막 NCP 정적 지도 실패 시각 (쿨다운 동안은 로컬 합성만 사용)
+_ncp_failed_at = 0
+
+def get_static_map_cache():
+    """정적 지도 PNG 디스크 캐시 (처음 사용할 때 생성)"""
+    global _image_cache
+    if _image_cache is None:
+        with _image_cache_lock:
+            if _image_cache is None:
+                _image_cache = DiskLRUCache(STATIC_MAP_CACHE_DIR, STATIC_MAP_CACHE_MAX_BYTES, suffix='.png')
+    return _image_cache
+
+def resolve_coordinates(locations, geocodes=None):
     """
-    매물 정보를 바탕으로 정적 지도 이미지 URL을 생성합니다.
+    주소별 좌표 - 스냅샷의 지오코딩 결과(geocodes)가 있으면 그것만 사용
+    스냅샷에 없는 주소(아직 지오코딩 전이거나 실패해 failed_geocodes에 있는 주소)는 요청 경로에서
+    호출하지 않고 건너뜁니다. 지오코딩은 백그라운드 스케줄러가 맡습니다.
+    스냅샷이 아직 없을 때(geocodes=None)만 한 번에 동시 지오코딩합니다.
     """
-    if not properties:
-        # 기본 서울 중심 지도
-        center_lat, center_lng = 37.5665, 126.9780
-    else:
-        # 첫 번째 매물을 중심으로 설정
-        first_property = properties[0]
-        geocode_result = geocode_address(first_property.get('location', '서울특별시'))
+    locations = [location for location in dict.fromkeys(locations) if location]
+    if geocodes is None:
+        return geocode_addresses(locations) if locations else {}
+    return {location: geocodes[location] for location in locations if location in geocodes}
+
+def prepare_static_map(properties, width=800, height=600, zoom=13, center=None, geocodes=None):
+    """
+    정적 지도 렌더링에 필요한 중심/마커를 계산하고 캐시 키를 만듭니다.
+    같은 (마커 집합, 중심, 줌, 크기)는 같은 키가 됩니다.
+    """
+    marker_properties = properties[:MAX_MARKERS]
+    coordinates = resolve_coordinates([p.get('location') for p in marker_properties], geocodes)
+
+    markers = []
+    for i, property_data in enumerate(marker_properties):
+        geocode_result = coordinates.get(property_data.get('location'))
         if geocode_result:
-            center_lat, center_lng = geocode_result['lat'], geocode_result['lng']
-        else:
-            center_lat, center_lng = 37.5665, 126.9780
-
-    try:
-        url = NCP_MAPS_URLS['static_map']
-        params = {
-            'center': f"{center_lng},{center_lat}",
-            'level': zoom,
-            'w': width,
-            'h': height,
-            'format': 'png',
-            'scale': 2  # 고해상도
-        }
-        
-        # 매물 마커 추가
-        if properties:
-            markers = []
-            for i, property_data in enumerate(properties[:20]):  # 최대 20개 마커
-                location = property_data.get('location')
-                if location:
-                    geocode_result = geocode_address(location)
-                    if geocode_result:
-                        lat, lng = geocode_result['lat'], geocode_result['lng']
-                        status = property_data.get('status', '일반')
-                        
-                        # 갠매는 파란색, 일반은 회색
-                        color = 'blue' if status == '갠매' else 'gray'
-                        marker = f"type:t|size:mid|pos:{lng} {lat}|color:{color}|label:{i+1}"
-                        markers.append(marker)
-            
-            if markers:
-                params['markers'] = '|'.join(markers)
-        
-        # URL 파라미터를 직접 구성
-        param_str = '&'.join([f"{k}={v}" for k, v in params.items()])
-        full_url = f"{url}?{param_str}"
-        
-        # API 호출 테스트
-        response = requests.get(url, headers=NCP_HEADERS, params=params)
-        if response.status_code == 200:
+            status = property_data.get('status', '일반')
+            markers.append({
+                'lat': geocode_result['lat'],
+                'lng': geocode_result['lng'],
+                'color': marker_color(status),
+                'label': i + 1,
+                'status': status
+            })
+
+    if center is None:
+        # 첫 번째 매물을 중심으로 설정
+        first_result = coordinates.get(properties[0].get('location')) if properties else None
+        center = (first_result['lat'], first_result['lng']) if first_result else DEFAULT_CENTER
+
+    key_source = json.dumps({
+        'center': [round(center[0], 6), round(center[1], 6)],
+        'zoom': zoom,
+        'size': [width, height],
+        'markers': markers
+    }, sort_keys=True)
+
+    return {
+        'center': center,
+        'zoom': zoom,
+        'width': width,
+        'height': height,
+        'markers': markers,
+        'key': hashlib.sha1(key_source.encode('utf-8')).hexdigest()
+    }
+
+def render_static_map(spec):
+    """
+    준비된 지도 사양으로 (PNG 바이트, ETag)를 반환 (실패 시 None)
+    디스크 캐시 → NCP Static Map → 로컬 합성 순서로 시도하며,
+    로컬 합성 결과는 NCP가 복구되면 교체되도록 별도 키로 저장합니다.
+    """
+    global _ncp_failed_at
+    cache = get_static_map_cache()
+    png = cache.get(spec['key'])
+    if png is not None:
+        return png, spec['key']
+
+    if time.time() - _ncp_failed_at >= NCP_STATIC_MAP_COOLDOWN:
+        lat, lng = spec['center']
+        png = fetch_static_map(lat, lng, spec['width'], spec['height'], spec['zoom'], spec['markers'],
+                               scale=2)  # 고해상도
+        if png is not None:
+            cache.set(spec['key'], png)
             logger.info("정적 지도 생성 성공")
-            return full_url
-        else:
-            logger.error(f"정적 지도 생성 실패: {response.status_code}")
+            return png, spec['key']
+        _ncp_failed_at = time.time()
+
+    # NCP 실패/한도 초과 시 로컬 합성으로 대체
+    local_key = f"{spec['key']}-local"
+    png = cache.get(local_key)
+    if png is None:
+        png = render_local_map(spec)
+        if png is None:
             return None
-            
-    except Exception as e:
-        logger.error(f"정적 지도 생성 중 오류: {str(e)}")
-        return None
+        cache.set(local_key, png)
+    return png, local_key
 
-def create_simple_map_html(properties):
+def build_map_locations(properties, geocodes=None):
+    """대체 지도에 표시할 위치 목록 (스냅샷 좌표 재사용, 없는 주소만 지오코딩)"""
+    coordinates = resolve_coordinates([prop.get('location') for prop in properties], geocodes)
+    locations = []
+    for prop in properties:
+        geocode_result = coordinates.get(prop.get('location'))
+        if geocode_result:
+            locations.append({
+                'lat': geocode_result['lat'],
+                'lng': geocode_result['lng'],
+                'title': prop['location'],
+                'status': prop.get('status', '일반'),
+                'color': marker_color(prop.get('status')),
+                'deposit': prop.get('deposit', ''),
+                'monthly_rent': prop.get('monthly_rent', '')
+            })
+    return locations
+
+def create_simple_map_html(properties, geocodes=None):
     """
     네이버 지도 API 대신 사용할 수 있는 간단한 HTML 지도를 생성합니다.
     """
-    # 매물 위치 정보 수집
-    locations = []
-    for prop in properties:
-        location = prop.get('location')
-        if location:
-            geocode_result = geocode_address(location)
-            if geocode_result:
-                locations.append({
-                    'lat': geocode_result['lat'],
-                    'lng': geocode_result['lng'],
-                    'title': location,
-                    'status': prop.get('status', '일반'),
-                    'deposit': prop.get('deposit', ''),
-                    'monthly_rent': prop.get('monthly_rent', '')
-                })
+    locations = build_map_locations(properties, geocodes)
+    # JS에서 그대로 사용할 수 있는 JSON (</script> 조기 종료 방지)
+    locations_json = json.dumps(locations, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
     
     # Leaflet.js를 사용한 대체 지도 HTML
     map_html = f"""
@@ -100,34 +155,70 @@ def create_simple_map_html(properties):
             attribution: '© OpenStreetMap contributors'
         }}).addTo(map);
         
-        var locations = {locations};
+        var locations = {locations_json};
+        
+        function escapeHtml(value) {{
+            return String(value).replace(/[&<>"']/g, function(c) {{
+                return {{'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}}[c];
+            }});
+        }}
         
-        locations.forEach(function(loc) {{
-            var color = loc.status === '갠매' ? 'blue' : 'gray';
+        var markers = locations.map(function(loc) {{
             var marker = L.circleMarker([loc.lat, loc.lng], {{
-                color: color,
-                fillColor: color,
+                color: loc.color,
+                fillColor: loc.color,
                 fillOpacity: 0.7,
                 radius: 8
             }}).addTo(map);
             
             marker.bindPopup(`
                 <div>
-                    <h5>${{loc.title}}</h5>
-                    <p>상태: ${{loc.status}}</p>
-                    <p>보증금: ${{loc.deposit}}</p>
-                    <p>월세: ${{loc.monthly_rent}}</p>
+                    <h5>${{escapeHtml(loc.title)}}</h5>
+                    <p>상태: ${{escapeHtml(loc.status)}}</p>
+                    <p>보증금: ${{escapeHtml(loc.deposit)}}</p>
+                    <p>월세: ${{escapeHtml(loc.monthly_rent)}}</p>
                 </div>
             `);
+            return marker;
         }});
         
-        if (locations.length > 0) {{
-            var group = new L.featureGroup(locations.map(loc => 
-                L.circleMarker([loc.lat, loc.lng])
-            ));
-            map.fitBounds(group.getBounds().pad(0.1));
+        if (markers.length > 0) {{
+            map.fitBounds(L.featureGroup(markers).getBounds().pad(0.1));
         }}
     </script>
     """
     
-    return map_html 
\ No newline at end of file
+    return map_html
+
+def create_simple_map_page(properties, geocodes=None, title='매물 지도'):
+    """대체 지도 HTML 조각을 완전한 HTML 문서로 감쌉니다."""
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <title>{html.escape(title)}</title>
+    <style>html, body {{ margin: 0; padding: 0; }}</style>
+</head>
+<body>
+{create_simple_map_html(properties, geocodes)}
+</body>
+</html>"""
+
+# 스냅샷 버전별로 렌더링된 대체 지도 페이지 (시트당 최신 버전 하나만 유지)
+_map_page_cache = SizedLRUCache('map_pages')
+
+def get_cached_map_page(sheet_type, version, properties, geocodes=None):
+    """
+    스냅샷 버전이 같으면 이전에 만든 대체 지도 페이지를 재사용합니다.
+    version이 None이면 (스냅샷 없음) 캐시하지 않습니다.
+    """
+    if version is not None:
+        cached = _map_page_cache.get(sheet_type)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+    page = create_simple_map_page(properties, geocodes, title=f"{sheet_type} 매물 지도")
+    if version is not None:
+        _map_page_cache.set(sheet_type, (version, page))
+    return page